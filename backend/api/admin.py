@@ -1,3 +1,36 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import AnalysisJob, ArticleFingerprint, DomainFetchStrategy, FlightLock, MediaOutlet
+
+
+@admin.register(MediaOutlet)
+class MediaOutletAdmin(admin.ModelAdmin):
+    list_display = ('name', 'domain', 'rank', 'score', 'category', 'updated_at')
+    list_filter = ('category',)
+    search_fields = ('name', 'normalized_name', 'domain')
+    readonly_fields = ('normalized_name', 'updated_at')
+
+
+@admin.register(AnalysisJob)
+class AnalysisJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'url', 'attempts', 'worker', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    search_fields = ('url',)
+
+
+@admin.register(DomainFetchStrategy)
+class DomainFetchStrategyAdmin(admin.ModelAdmin):
+    list_display = ('domain', 'static_success', 'browser_success', 'static_attempts', 'static_skipped', 'updated_at')
+    search_fields = ('domain',)
+
+
+@admin.register(ArticleFingerprint)
+class ArticleFingerprintAdmin(admin.ModelAdmin):
+    list_display = ('canonical_url', 'title', 'created_at')
+    search_fields = ('canonical_url', 'title')
+    exclude = ('results',)
+
+
+@admin.register(FlightLock)
+class FlightLockAdmin(admin.ModelAdmin):
+    list_display = ('key', 'owner', 'expires_at')
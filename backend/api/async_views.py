@@ -0,0 +1,459 @@
+"""
+비동기(ASGI) 분석 엔드포인트: POST /api/analyze/async/
+
+/api/analyze/ 와 요청/응답 형식은 같고, 네트워크 대기를 모두 이벤트 루프에서 처리한다.
+- 기사/네이버 요청: httpx.AsyncClient (연결 재사용)
+- 브라우저 렌더링: playwright.async_api (이벤트 루프당 Chromium 1개, 동시 페이지 수 제한)
+- GPT 호출: AsyncOpenAI
+- 로컬 모델, 휴리스틱 같은 CPU 작업만 스레드 풀에서 실행
+
+ASGI 서버에서만 경로가 등록된다 (myproject/asgi.py 가 SERVER_INTERFACE=asgi 로 설정).
+WSGI 에서는 요청마다 async_to_sync 가 새 루프를 만들어 루프별 리소스(브라우저/HTTP 클라이언트)가 쌓이기 때문.
+    gunicorn myproject.asgi:application -k uvicorn.workers.UvicornWorker --bind 0.0.0.0:8000
+루프별 리소스는 ASGI lifespan 종료 시 close_loop_resources() 로 닫는다.
+"""
+import asyncio
+import os
+import time
+import weakref
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from openai import AsyncOpenAI
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError, async_playwright
+from rest_framework.throttling import AnonRateThrottle
+
+from . import metrics, views
+from .browser_pool import CONTENT_READY_JS, LAUNCH_ARGS, blocked_resource_types, should_block
+from .cache import analysis_cache, llm_cache
+from .deadline import DeadlineExceeded, make_deadline, raise_if_expired, timeout_for
+from .embeddings import embedding_cross_check
+from .fetch_strategy import plan_fetch, record_fetch
+from .near_duplicates import find_near_duplicate, remember_article
+from .pipeline import run_stages_async
+from .singleflight import analysis_flight, search_flight
+
+
+# --- 이벤트 루프별 공유 리소스 ---
+# httpx/OpenAI/Playwright 객체는 만든 이벤트 루프에서만 쓸 수 있으므로 루프마다 따로 둔다.
+# (uvicorn 워커는 루프가 하나라 사실상 프로세스당 1세트)
+_loop_resources = weakref.WeakKeyDictionary()
+
+
+def _loop_local(name, factory):
+    resources = _loop_resources.setdefault(asyncio.get_running_loop(), {})
+    if name not in resources:
+        resources[name] = factory()
+    return resources[name]
+
+
+async def close_loop_resources():
+    """현재 이벤트 루프의 httpx/OpenAI 클라이언트와 브라우저 풀을 닫는다 (ASGI lifespan 종료 시)"""
+    resources = _loop_resources.pop(asyncio.get_running_loop(), {})
+    closers = {"http": "aclose", "openai": "close", "browser": "close"}
+    for name, method in closers.items():
+        if name in resources:
+            try:
+                await getattr(resources[name], method)()
+            except Exception as e:
+                print(f"⚠️ 비동기 리소스 종료 실패 ({name}): {e}")
+
+
+def get_http_client():
+    return _loop_local("http", lambda: httpx.AsyncClient(
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    ))
+
+
+def get_async_openai_client():
+    """AsyncOpenAI 클라이언트 (API 키가 없으면 None)"""
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        return None
+    return _loop_local("openai", lambda: AsyncOpenAI(
+        api_key=api_key, base_url=getattr(settings, 'OPENAI_BASE_URL', '') or None,
+    ))
+
+
+class AsyncBrowserPool:
+    """
+    async Playwright 용 브라우저 풀 (browser_pool.BrowserPool 의 비동기 버전)
+    Chromium 하나를 공유하고 작업마다 새 context 를 만든다.
+    max_pages 를 넘긴 브라우저는 새 브라우저로 교체하고, 진행 중인 페이지가 끝나면 닫는다.
+    """
+
+    def __init__(self, size=2, max_pages=50):
+        self.semaphore = asyncio.Semaphore(max(1, size))
+        self.max_pages = max(1, max_pages)
+        self.lock = asyncio.Lock()
+        self.playwright = None
+        self.browser = None
+        self.pages_served = 0
+        self.active = {}      # browser -> 사용 중인 페이지 수
+        self.retired = set()  # 교체되어 닫힐 예정인 브라우저
+
+    async def run(self, fn, context_options=None, timeout=None):
+        """새 context/page 에서 await fn(page) 결과를 반환"""
+        async with self.semaphore:
+            browser = await self._acquire()
+            try:
+                context = await browser.new_context(**(context_options or {}))
+                try:
+                    return await asyncio.wait_for(fn(await context.new_page()), timeout)
+                finally:
+                    try: await context.close()
+                    except Exception: pass
+            finally:
+                await self._release(browser)
+
+    async def _acquire(self):
+        async with self.lock:
+            if self.playwright is None:
+                self.playwright = await async_playwright().start()
+            if self.browser is not None and (not self.browser.is_connected() or self.pages_served >= self.max_pages):
+                self.retired.add(self.browser)
+                await self._close_if_idle(self.browser)
+                self.browser = None
+            if self.browser is None:
+                self.browser = await self.playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+                self.pages_served = 0
+            self.pages_served += 1
+            self.active[self.browser] = self.active.get(self.browser, 0) + 1
+            return self.browser
+
+    async def _release(self, browser):
+        async with self.lock:
+            self.active[browser] -= 1
+            await self._close_if_idle(browser)
+
+    async def close(self):
+        """모든 브라우저와 Playwright 드라이버 종료"""
+        async with self.lock:
+            for browser in {self.browser, *self.retired} - {None}:
+                try: await browser.close()
+                except Exception: pass
+            self.browser = None
+            self.retired.clear()
+            self.active.clear()
+            if self.playwright is not None:
+                try: await self.playwright.stop()
+                except Exception: pass
+                self.playwright = None
+
+    async def _close_if_idle(self, browser):
+        if browser in self.retired and self.active.get(browser, 0) <= 0:
+            self.retired.discard(browser)
+            self.active.pop(browser, None)
+            try: await browser.close()
+            except Exception: pass
+
+
+def get_async_browser_pool():
+    return _loop_local("browser", lambda: AsyncBrowserPool(
+        size=int(getattr(settings, 'PLAYWRIGHT_POOL_SIZE', 2)),
+        max_pages=int(getattr(settings, 'PLAYWRIGHT_MAX_PAGES_PER_BROWSER', 50)),
+    ))
+
+
+# --- 비동기 I/O 단계 (파싱/프롬프트는 views 의 동기 버전과 공유) ---
+async def get_gpt_prediction_async(title, text, deadline=None):
+    client = get_async_openai_client()
+    if not client:
+        return {"error": "API 키 설정 오류", "prediction": "Error", "score": 0}
+    request = views.build_gpt_request(title, text)
+    cache_key = views.llm_cache_key("gpt", views.GPT_PROMPT_VERSION, request)
+    cached = await sync_to_async(views.get_cached_llm_result)(cache_key)
+    if cached:
+        return cached
+    try:
+        response = await client.chat.completions.create(**request, timeout=views.llm_timeout(deadline))
+        result = views.parse_gpt_result(response.choices[0].message.content)
+        await sync_to_async(llm_cache.set)(cache_key, result)
+        return result
+    except Exception as e:
+        raise_if_expired(deadline, e)
+        print(f"GPT Error: {e}")
+        return {"error": str(e), "prediction": "Error", "score": 0}
+
+
+async def get_related_articles_async(keyword, deadline=None):
+    if not keyword: return []
+
+    async def search():
+        try:
+            response = await get_http_client().get(
+                views.naver_search_url(keyword), headers=views.NAVER_HEADERS, timeout=timeout_for(deadline, 5)
+            )
+            return await asyncio.to_thread(views.parse_naver_results, response.text)
+        except Exception as e:
+            print(f"관련 기사 검색 실패: {e}")
+            return []
+
+    articles, _ = await search_flight.do_async(f"naver:{keyword}", search, deadline=deadline)
+    return articles
+
+
+async def block_resources_async(page):
+    """browser_pool.block_resources 의 비동기 버전"""
+    counts = {"blocked": 0, "allowed": 0}
+    if not getattr(settings, 'PLAYWRIGHT_BLOCK_RESOURCES', True):
+        return counts
+    blocked_types = blocked_resource_types()
+
+    async def handle(route):
+        request = route.request
+        if should_block(request.resource_type, request.url, blocked_types):
+            counts["blocked"] += 1
+            await route.abort()
+        else:
+            counts["allowed"] += 1
+            await route.continue_()
+
+    await page.route("**/*", handle)
+    return counts
+
+
+async def wait_for_content_async(page, selectors, min_text_length=0, timeout_ms=None):
+    """browser_pool.wait_for_content 의 비동기 버전"""
+    if timeout_ms is None:
+        timeout_ms = getattr(settings, 'PLAYWRIGHT_READY_TIMEOUT_MS', 3000)
+    try:
+        await page.wait_for_function(
+            CONTENT_READY_JS, arg=[list(selectors), min_text_length], timeout=timeout_ms,
+        )
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+async def get_google_news_async(keyword, deadline=None):
+    if not keyword: return []
+
+    async def scrape(page):
+        await block_resources_async(page)
+        await page.goto(
+            views.google_news_url(keyword), wait_until='domcontentloaded', timeout=timeout_for(deadline, 10) * 1000
+        )
+        await wait_for_content_async(page, views.GOOGLE_RESULT_SELECTORS, timeout_ms=views.ready_timeout_ms(deadline))
+        return await page.content()
+
+    async def search():
+        try:
+            html = await get_async_browser_pool().run(
+                scrape, context_options=views.GOOGLE_CONTEXT_OPTIONS, timeout=timeout_for(deadline, 30)
+            )
+            return await asyncio.to_thread(views.parse_google_results, html)
+        except Exception as e:
+            raise_if_expired(deadline, e)
+            print(f"⚠️ 구글 검색 건너뜀 (사유: {e})")
+            return []
+
+    articles, _ = await search_flight.do_async(f"google:{keyword}", search, deadline=deadline)
+    return articles
+
+
+async def cross_check_async(title, text, related_articles, deadline=None):
+    """views.cross_check_with_related_articles 의 비동기 버전 (임베딩 계산은 스레드에서)"""
+    if not related_articles:
+        return views.DEFAULT_CROSS_CHECK
+    mode = views.get_cross_check_mode()
+    result = None
+    if mode != "gpt":
+        result = await asyncio.to_thread(embedding_cross_check, title, text, related_articles)
+    if result is None:
+        result = await cross_check_gpt_async(title, text, related_articles, deadline)
+    elif mode == "hybrid" and views.needs_gpt_tiebreak(result, deadline):
+        try:
+            result = views.merge_tiebreak(result, await cross_check_gpt_async(title, text, related_articles, deadline))
+        except DeadlineExceeded:
+            pass
+    metrics.inc("cross_check_total", method=result.get("method", "gpt"))
+    return result
+
+
+async def cross_check_gpt_async(title, text, related_articles, deadline=None):
+    client = get_async_openai_client()
+    if not client:
+        return {"score": 70, "consistency": "검증불가", "reason": "관련 기사가 없거나 API 오류"}
+    request = views.build_cross_check_request(title, text, related_articles)
+    cache_key = views.llm_cache_key("cross_check", views.CROSS_CHECK_PROMPT_VERSION, request)
+    cached = await sync_to_async(views.get_cached_llm_result)(cache_key)
+    if cached:
+        return cached
+    try:
+        response = await client.chat.completions.create(**request, timeout=views.llm_timeout(deadline))
+        result = views.parse_cross_check_result(response.choices[0].message.content)
+        await sync_to_async(llm_cache.set)(cache_key, result)
+        return result
+    except Exception as e:
+        raise_if_expired(deadline, e)
+        print(f"크로스체크 오류: {e}")
+        return {"score": 70, "consistency": "검증실패", "reason": f"오류 발생: {str(e)}"}
+
+
+async def fetch_article_async(url_to_check, deadline=None):
+    """views.fetch_article 의 비동기 버전 (requests 대신 httpx, 브라우저는 async Playwright)"""
+    domain = views.get_domain_from_url(url_to_check)
+    title, text_content, publisher_name, publish_date = "", "", domain, None
+    plan = await sync_to_async(plan_fetch)(domain)
+    static_ok, static_ms, browser_ok = None, 0.0, None
+
+    if plan["try_static"]:
+        static_started = time.perf_counter()
+        try:
+            response = await get_http_client().get(
+                url_to_check, headers={'User-Agent': views.DESKTOP_USER_AGENT}, timeout=timeout_for(deadline, 5)
+            )
+            if response.status_code == 200:
+                title, text_content, publisher_name, publish_date = await asyncio.to_thread(
+                    views.parse_article_html, response.text, url_to_check, domain
+                )
+        except Exception as e:
+            print(f"Requests 접속 에러 (무시하고 Playwright로 이동): {e}")
+        static_ok = not views.needs_browser(title, text_content)
+        static_ms = (time.perf_counter() - static_started) * 1000
+        metrics.record_fetch_duration("static", static_ms, static_ok)
+
+    if views.needs_browser(title, text_content):
+        if deadline is not None and deadline.expired():
+            await sync_to_async(record_fetch)(domain, static_ok, static_ms, browser_ok=None)
+            raise views.ArticleFetchError("처리 시간 예산을 모두 써서 브라우저 수집을 하지 못함", status=504)
+
+        async def render(page):
+            await block_resources_async(page)
+            await page.goto(url_to_check, wait_until='domcontentloaded', timeout=timeout_for(deadline, 60) * 1000)
+            await wait_for_content_async(
+                page, views.get_extractor(domain).body_selectors, min_text_length=50,
+                timeout_ms=views.ready_timeout_ms(deadline),
+            )
+            return await page.content()
+
+        browser_started = time.perf_counter()
+        try:
+            html = await get_async_browser_pool().run(
+                render, context_options={"user_agent": views.MOBILE_USER_AGENT}, timeout=timeout_for(deadline, 75)
+            )
+            title, text_content, publisher_name, publish_date = await asyncio.to_thread(
+                views.parse_article_html, html, url_to_check, domain
+            )
+            browser_ok = not views.needs_browser(title, text_content)
+            metrics.record_fetch_duration("browser", (time.perf_counter() - browser_started) * 1000, browser_ok)
+        except Exception as e:
+            print(f"Playwright Error: {e}")
+            metrics.record_fetch_duration("browser", (time.perf_counter() - browser_started) * 1000, False)
+            await sync_to_async(record_fetch)(domain, static_ok, static_ms, browser_ok=False)
+            if deadline is not None and deadline.expired():
+                raise views.ArticleFetchError(f"처리 시간 예산 초과 (기사 수집): {str(e)}", status=504)
+            raise views.ArticleFetchError(f"크롤링 최종 실패: {str(e)}", status=500)
+
+    await sync_to_async(record_fetch)(domain, static_ok, static_ms, browser_ok)
+
+    if views.needs_browser(title, text_content):
+        raise views.ArticleFetchError("본문 추출 실패 (봇 차단이 강력하거나 HTML 구조가 특이함)", status=400)
+
+    return {
+        "title": title,
+        "text": text_content,
+        "publisher_name": publisher_name,
+        "publish_date": publish_date,
+        "fetch_path": "static" if static_ok else "browser",
+        "fetch_strategy": plan["strategy"],
+    }
+
+
+def build_async_stages(url_to_check, article, deadline=None):
+    """동기 파이프라인과 같은 단계 그래프에 I/O 단계의 비동기 구현을 붙인다"""
+    title, text_content = article["title"], article["text"]
+    async_funcs = {
+        "gpt": lambda: get_gpt_prediction_async(title, text_content, deadline),
+        "naver_search": lambda keywords: get_related_articles_async(keywords, deadline),
+        "google_search": lambda keywords: get_google_news_async(keywords, deadline),
+        "gpt_search": lambda gpt, keywords: get_related_articles_async(views.gpt_only_keywords(gpt, keywords), deadline),
+        "cross_check": lambda related_articles: cross_check_async(title, text_content, related_articles, deadline),
+    }
+    stages = views.build_analysis_stages(url_to_check, article, deadline)
+    for stage in stages:
+        stage.afunc = async_funcs.get(stage.name)
+    return stages
+
+
+async def analyze_url_async(url_to_check, reuse_near_duplicates=True, deadline=None):
+    """views.analyze_url 의 비동기 버전"""
+    deadline = deadline or make_deadline()
+    started = time.perf_counter()
+    try:
+        article = await fetch_article_async(url_to_check, deadline)
+    except views.ArticleFetchError:
+        metrics.record_fetch_failure()
+        raise
+    extraction_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    near_duplicate = await sync_to_async(find_near_duplicate)(
+        article["title"], article["text"], reuse=reuse_near_duplicates
+    )
+    run = await run_stages_async(
+        build_async_stages(url_to_check, article, deadline), seeded=near_duplicate.seeded, deadline=deadline
+    )
+    await sync_to_async(remember_article)(
+        near_duplicate, views.canonicalize_url(url_to_check), article["title"], run
+    )
+    timings = {
+        "extraction": extraction_ms,
+        **run.timings,
+        "total": round((time.perf_counter() - started) * 1000, 1),
+    }
+    metrics.record_analysis(run, timings, article, near_duplicate, mode="async")
+    response_data = views.build_response_data(
+        url_to_check, article, run.results, timings, near_duplicate.stats(), skipped=run.skipped, deadline=deadline
+    )
+    print(f"✅ [async] 분석 완료 - 최종 점수: {response_data['final_analysis']['final_score']} ({timings['total']:.0f}ms)")
+    return response_data
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncAnalyzeView(View):
+    """AnalyzeView 의 ASGI 버전 (DRF APIView 는 async 를 지원하지 않아 Django View 사용)"""
+    throttle_classes = [AnonRateThrottle]
+
+    async def post(self, request, *args, **kwargs):
+        # 같은 익명 요청 제한을 적용 (throttle 은 캐시/세션을 건드리므로 스레드에서 실행)
+        for throttle in [cls() for cls in self.throttle_classes]:
+            if not await sync_to_async(throttle.allow_request)(request, self):
+                wait = throttle.wait()
+                return JsonResponse(
+                    {"detail": f"Request was throttled. Expected available in {int(wait or 0)} seconds."},
+                    status=429,
+                )
+
+        url_to_check, force_refresh = views.read_analyze_request(request)
+        if not url_to_check:
+            return JsonResponse({"success": False, "error": {"message": "잘못된 요청"}}, status=400)
+
+        deadline = make_deadline(views.read_deadline_seconds(request))
+        cache_key = views.canonicalize_url(url_to_check)
+        if not force_refresh:
+            cached_data = await sync_to_async(views.get_cached_analysis)(cache_key)
+            if cached_data:
+                return JsonResponse({"success": True, "data": cached_data}, status=200)
+
+        async def analyze():
+            try:
+                response_data = await analyze_url_async(
+                    url_to_check, reuse_near_duplicates=not force_refresh, deadline=deadline
+                )
+            except views.ArticleFetchError as e:
+                return [e.status, {"success": False, "error": {"message": e.message}}]
+            if not response_data["skipped_stages"]:
+                await sync_to_async(analysis_cache.set)(cache_key, response_data)
+            return [200, {"success": True, "data": response_data}]
+
+        # 같은 기사의 분석이 이미 진행 중이면 그 결과를 받는다 (동기 뷰/다른 워커와도 공유)
+        flight_key = views.analysis_flight_key(cache_key, force_refresh)
+        (status, payload), shared = await analysis_flight.do_async(flight_key, analyze, deadline=deadline)
+        return JsonResponse(views.mark_coalesced(payload) if shared else payload, status=status)
@@ -0,0 +1,218 @@
+"""
+벤치마크용 로컬 대체 서버 (기사 페이지 + OpenAI 호환 API + 네이버/구글 검색 결과)
+
+실제 언론사/네이버/구글/OpenAI 를 부르지 않고 분석 파이프라인 전체를 반복 측정하기 위한
+HTTP 서버. 저장해 둔 기사 HTML(api/fixtures/html/index.json)을 변형별로 돌려준다.
+
+    GET  /articles/<변형>/<파일>       plain: 저장된 HTML 그대로
+                                       slow : slow_delay_ms 만큼 늦게 응답
+                                       huge : 본문 뒤에 문단을 덧붙여 huge_kb 크기로
+                                       js   : 빈 껍데기 + 스크립트가 본문을 채움 (Playwright 필요)
+    GET  /naver/search.naver?query=..  네이버 뉴스 검색 결과 형식 (parse_naver_results 가 읽는 구조)
+    GET  /google/search?q=..           구글 뉴스 탭 형식 (parse_google_results 가 읽는 구조)
+    POST /openai/v1/chat/completions   GPT 판정 / 크로스체크 응답 (llm_delay_ms 만큼 늦게)
+
+    with BenchServer(fixtures_dir) as server:
+        settings.OPENAI_BASE_URL = server.url("/openai/v1")
+"""
+import html as html_lib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .extractors import extract_article
+
+VARIANTS = ("plain", "slow", "huge", "js")
+
+FILLER_PARAGRAPH = (
+    "<p>이 문단은 벤치마크용으로 덧붙인 관련 기사 목록과 댓글 영역을 흉내 낸 것입니다. "
+    "실제 언론사 페이지에는 본문보다 훨씬 긴 메뉴, 추천 기사, 광고 영역이 붙어 있습니다.</p>\n"
+)
+
+JS_SHELL = """<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+<h1 id="headline"></h1>
+<article id="article-body"></article>
+<script>
+  const data = {payload};
+  setTimeout(() => {{
+    document.getElementById("headline").textContent = data.title;
+    document.getElementById("article-body").textContent = data.text;
+  }}, 200);
+</script>
+</body></html>
+"""
+
+
+class BenchServer:
+    """127.0.0.1 의 빈 포트에서 스레드로 실행되는 대체 서버 (with 문으로 시작/종료)"""
+
+    def __init__(self, fixtures_dir, port=0, slow_delay_ms=2000, huge_kb=2048, llm_delay_ms=300, search_delay_ms=100):
+        self.slow_delay_ms = slow_delay_ms
+        self.huge_kb = huge_kb
+        self.llm_delay_ms = llm_delay_ms
+        self.search_delay_ms = search_delay_ms
+        self.counts = {}  # 경로 종류 -> 요청 수
+        self._counts_lock = threading.Lock()
+        self.pages = self._load_pages(fixtures_dir)
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @staticmethod
+    def _load_pages(fixtures_dir):
+        """파일 이름 -> {"html", "title", "text"} (js 변형에 넣을 제목/본문을 미리 추출)"""
+        with open(os.path.join(fixtures_dir, 'index.json'), encoding='utf-8') as f:
+            index = json.load(f)
+        pages = {}
+        for entry in index:
+            with open(os.path.join(fixtures_dir, entry['file']), encoding='utf-8') as f:
+                html = f.read()
+            title, text, _, _ = extract_article(html, entry['url'], urlparse(entry['url']).netloc)
+            pages[entry['file']] = {"html": html, "title": title, "text": text}
+        return pages
+
+    # --- 시작/종료 ---
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="bench-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def port(self):
+        return self._httpd.server_address[1]
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    def article_urls(self, variant):
+        return [self.url(f"/articles/{variant}/{name}") for name in self.pages]
+
+    def _count(self, kind):
+        with self._counts_lock:
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+
+    # --- 응답 본문 ---
+    def render_article(self, variant, name):
+        page = self.pages[name]
+        if variant == "huge":
+            filler = FILLER_PARAGRAPH * (self.huge_kb * 1024 // len(FILLER_PARAGRAPH.encode()) + 1)
+            return page["html"].replace("</body>", f"<section class=\"related\">{filler}</section></body>", 1)
+        if variant == "js":
+            payload = json.dumps({"title": page["title"], "text": page["text"]}, ensure_ascii=False)
+            return JS_SHELL.format(title=html_lib.escape(page["title"]), payload=payload.replace("</", "<\\/"))
+        return page["html"]
+
+    def render_naver(self, query):
+        items = "".join(
+            f"""<div class="news_wrap api_ani_send">
+  <a class="info press">벤치언론{i}</a>
+  <a class="news_tit" href="{self.url(f'/related/naver/{i}')}">{html_lib.escape(query)} 관련 보도 {i}</a>
+  <img class="thumb" data-lazysrc="{self.url(f'/thumb/{i}.jpg')}">
+  <div class="news_dsc"><a class="api_txt_lines dsc_txt_wrap">{html_lib.escape(query)} 에 대한 {i}번째 관련 보도 요약입니다.</a></div>
+</div>"""
+            for i in range(5)
+        )
+        return f"<html><body><div class=\"group_news\">{items}</div></body></html>"
+
+    def render_google(self, query):
+        items = "".join(
+            f"""<div class="SoaBEf"><a href="{self.url(f'/related/google/{i}')}">
+  <div role="heading">{html_lib.escape(query)} 해외 보도 {i}</div>
+  <div class="MgUUmf"><span>Bench News {i}</span></div>
+  <div class="GI74Re">{html_lib.escape(query)} 해외 보도 {i} 요약</div></a></div>"""
+            for i in range(5)
+        )
+        return f"<html><body><div id=\"rso\">{items}</div></body></html>"
+
+    @staticmethod
+    def render_chat_completion(request):
+        """시스템 프롬프트가 있으면 GPT 판정, 없으면 크로스체크 형식으로 답한다"""
+        messages = request.get("messages", [])
+        if messages and messages[0].get("role") == "system":
+            content = {
+                "prediction": "True", "score": 82,
+                "reason": "벤치마크용 고정 응답입니다. 실제 판단이 아닙니다.",
+                "keywords": "벤치마크 기사 검증",
+            }
+        else:
+            content = {"consistency_score": 75, "consistency_level": "보통", "reason": "벤치마크용 고정 응답"}
+        return {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-4o-mini"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": json.dumps(content, ensure_ascii=False)},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass  # 요청마다 stderr 에 찍지 않는다
+
+            def _send(self, status, body, content_type="text/html; charset=utf-8"):
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query)
+                parts = parsed.path.strip("/").split("/")
+
+                if len(parts) == 3 and parts[0] == "articles" and parts[1] in VARIANTS and parts[2] in server.pages:
+                    server._count(f"article_{parts[1]}")
+                    if parts[1] == "slow":
+                        time.sleep(server.slow_delay_ms / 1000)
+                    return self._send(200, server.render_article(parts[1], parts[2]))
+                if parsed.path == "/naver/search.naver":
+                    server._count("naver")
+                    time.sleep(server.search_delay_ms / 1000)
+                    return self._send(200, server.render_naver(query.get("query", [""])[0]))
+                if parsed.path == "/google/search":
+                    server._count("google")
+                    time.sleep(server.search_delay_ms / 1000)
+                    return self._send(200, server.render_google(query.get("q", [""])[0]))
+                return self._send(404, "not found", "text/plain; charset=utf-8")
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if urlparse(self.path).path != "/openai/v1/chat/completions":
+                    return self._send(404, "not found", "text/plain; charset=utf-8")
+                server._count("openai")
+                time.sleep(server.llm_delay_ms / 1000)
+                try:
+                    request = json.loads(body or b"{}")
+                except ValueError:
+                    return self._send(400, '{"error": {"message": "invalid json"}}', "application/json")
+                return self._send(200, json.dumps(server.render_chat_completion(request), ensure_ascii=False),
+                                  "application/json")
+
+        return Handler
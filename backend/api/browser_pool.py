@@ -0,0 +1,316 @@
+"""
+Playwright 브라우저 풀 (워커 프로세스당 1개)
+
+요청마다 sync_playwright() + chromium.launch() 를 하면 분석 한 번에 브라우저를
+최대 두 번 새로 띄우게 된다. 여기서는 미리 띄워 둔 Chromium 을 재사용하고,
+작업마다 새 context/page 를 만들어 격리한다.
+
+- Playwright sync API 는 자신을 시작한 스레드에서만 쓸 수 있으므로
+  슬롯(스레드)마다 Playwright + 브라우저를 하나씩 소유하고, 호출자는 작업 함수를 큐로 넘긴다.
+- 슬롯 수 = 동시에 열 수 있는 페이지 수 (PLAYWRIGHT_POOL_SIZE)
+- 브라우저 하나가 PLAYWRIGHT_MAX_PAGES_PER_BROWSER 페이지를 처리했거나
+  자식 프로세스 RSS 합계가 PLAYWRIGHT_MAX_RSS_MB 를 넘으면 재시작(recycle)
+- 브라우저가 죽으면(disconnected) 다음 작업에서 다시 띄운다.
+
+페이지 작업 도우미 (작업 함수 fn(page) 안에서 사용)
+- block_resources(page): 이미지/폰트/미디어/스타일시트와 광고·분석 호스트 요청을 차단
+- wait_for_content(page, selectors): 고정 대기 대신 본문 선택자가 나타나는 즉시 반환 (상한 있음)
+"""
+import atexit
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from urllib.parse import urlparse
+
+from django.conf import settings
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError, sync_playwright
+
+LAUNCH_ARGS = ["--disable-blink-features=AutomationControlled"]
+
+# 본문 추출에 필요 없는 광고/분석 스크립트 호스트 (하위 도메인 포함)
+BLOCKED_HOSTS = (
+    'doubleclick.net', 'googlesyndication.com', 'googleadservices.com', 'google-analytics.com',
+    'googletagmanager.com', 'googletagservices.com', 'adservice.google.com', 'facebook.net',
+    'connect.facebook.net', 'scorecardresearch.com', 'criteo.com', 'criteo.net', 'taboola.com',
+    'outbrain.com', 'amazon-adsystem.com', 'adnxs.com', 'hotjar.com', 'dable.io', 'mobon.net',
+    'tenping.kr', 'realclick.co.kr', 'wcs.naver.net', 'veta.naver.com', 'adfit.kakao.com',
+)
+
+# 요소의 글자 수가 기준 이상인 선택자가 하나라도 있으면 true (page.wait_for_function 용)
+CONTENT_READY_JS = """([selectors, minLength]) => selectors.some(s => {
+    const el = document.querySelector(s);
+    return el !== null && el.textContent.trim().length >= minLength;
+})"""
+
+
+def blocked_resource_types():
+    value = getattr(settings, 'PLAYWRIGHT_BLOCKED_RESOURCE_TYPES', 'image,media,font,stylesheet')
+    return frozenset(t.strip() for t in value.split(',') if t.strip())
+
+
+def should_block(resource_type, url, blocked_types):
+    """차단할 요청인지 (리소스 종류 또는 광고/분석 호스트)"""
+    if resource_type in blocked_types:
+        return True
+    host = (urlparse(url).hostname or '').lower()
+    return any(host == h or host.endswith('.' + h) for h in BLOCKED_HOSTS)
+
+
+def block_resources(page):
+    """
+    PLAYWRIGHT_BLOCK_RESOURCES 가 켜져 있으면 불필요한 요청을 route 로 차단
+    Returns: {"blocked": N, "allowed": N} (페이지 작업이 끝난 뒤 로그용)
+    """
+    counts = {"blocked": 0, "allowed": 0}
+    if not getattr(settings, 'PLAYWRIGHT_BLOCK_RESOURCES', True):
+        return counts
+    blocked_types = blocked_resource_types()
+
+    def handle(route):
+        request = route.request
+        if should_block(request.resource_type, request.url, blocked_types):
+            counts["blocked"] += 1
+            route.abort()
+        else:
+            counts["allowed"] += 1
+            route.continue_()
+
+    page.route("**/*", handle)
+    return counts
+
+
+def wait_for_content(page, selectors, min_text_length=0, timeout_ms=None):
+    """
+    선택자 중 하나가 (min_text_length 글자 이상 채워져) 나타날 때까지 대기
+    상한(PLAYWRIGHT_READY_TIMEOUT_MS)을 넘기면 그대로 진행한다.
+    Returns: 제때 나타났으면 True
+    """
+    if timeout_ms is None:
+        timeout_ms = getattr(settings, 'PLAYWRIGHT_READY_TIMEOUT_MS', 3000)
+    try:
+        page.wait_for_function(CONTENT_READY_JS, arg=[list(selectors), min_text_length], timeout=timeout_ms)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+def _process_tree_rss_mb(root_pid):
+    """root_pid 프로세스와 모든 자손의 RSS 합계(MB), Linux 외에는 None"""
+    try:
+        children = {}
+        for name in os.listdir('/proc'):
+            if not name.isdigit():
+                continue
+            try:
+                with open(f'/proc/{name}/stat') as f:
+                    # 2번째 필드(comm)에 공백이 있을 수 있어 마지막 ')' 뒤부터 파싱
+                    ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+                children.setdefault(ppid, []).append(int(name))
+            except (OSError, IndexError, ValueError):
+                continue
+
+        page_size = os.sysconf('SC_PAGE_SIZE')
+        total = 0
+        stack = [root_pid]
+        while stack:
+            pid = stack.pop()
+            stack.extend(children.get(pid, []))
+            try:
+                with open(f'/proc/{pid}/statm') as f:
+                    total += int(f.read().split()[1]) * page_size
+            except (OSError, IndexError, ValueError):
+                continue
+        return total / (1024 * 1024)
+    except (OSError, AttributeError, ValueError):
+        return None
+
+
+def _browser_pid(browser):
+    """
+    Chromium 브라우저 프로세스 PID (CDP SystemInfo.getProcessInfo, 알 수 없으면 None)
+    renderer/GPU 프로세스는 이 프로세스의 자손이므로, 슬롯별 메모리는 이 PID 의 트리로 잰다.
+    """
+    try:
+        session = browser.new_browser_cdp_session()
+        try:
+            info = session.send("SystemInfo.getProcessInfo")
+        finally:
+            session.detach()
+        for process in info.get("processInfo", []):
+            if process.get("type") == "browser":
+                return int(process["id"])
+    except Exception as e:
+        print(f"⚠️ 브라우저 PID 확인 실패 (RSS 기준 재시작 안 함): {e}")
+    return None
+
+
+class _BrowserSlot(threading.Thread):
+    """Playwright 인스턴스 하나와 Chromium 하나를 소유하는 작업 스레드"""
+
+    def __init__(self, pool, index):
+        super().__init__(name=f"browser-slot-{index}", daemon=True)
+        self.pool = pool
+        self.browser = None
+        self.browser_pid = None
+        self.pages_served = 0
+        self.launch_count = 0
+
+    def run(self):
+        while not self.pool.closed:
+            try:
+                with sync_playwright() as p:
+                    self._serve(p)
+            except Exception as e:
+                # 드라이버 자체가 죽은 경우: 잠시 후 Playwright 부터 다시 시작
+                print(f"⚠️ 브라우저 슬롯 {self.name} 재시작 (사유: {e})")
+                self.browser = None
+                time.sleep(1)
+
+    def _serve(self, p):
+        if self.pool.prewarm:
+            try:
+                self._ensure_browser(p)
+            except Exception as e:
+                print(f"⚠️ {self.name}: 브라우저 미리 실행 실패 (첫 작업에서 재시도): {e}")
+
+        while not self.pool.closed:
+            job = self.pool.jobs.get()
+            if job is None:
+                break
+            fn, context_options, future = job
+            if not future.set_running_or_notify_cancel():
+                continue  # 호출자가 대기 중 포기한 작업
+
+            browser = None
+            try:
+                browser = self._ensure_browser(p)
+                context = browser.new_context(**context_options)
+                try:
+                    result = fn(context.new_page())
+                finally:
+                    try: context.close()
+                    except Exception: pass
+                future.set_result(result)
+            except Exception as e:
+                future.set_exception(e)
+                if browser is None:
+                    # 브라우저 실행 자체가 실패 -> Playwright 드라이버부터 다시 시작
+                    return
+            finally:
+                self.pages_served += 1
+                self._maybe_recycle()
+
+        self._close_browser()
+
+    def _ensure_browser(self, p):
+        if self.browser is None or not self.browser.is_connected():
+            if self.browser is not None:
+                print(f"⚠️ {self.name}: 브라우저 연결 끊김, 다시 실행합니다")
+            self._close_browser()
+            started = time.monotonic()
+            self.browser = p.chromium.launch(headless=True, args=LAUNCH_ARGS)
+            self.browser_pid = _browser_pid(self.browser) if self.pool.max_rss_mb else None
+            self.pages_served = 0
+            self.launch_count += 1
+            print(f"🌐 {self.name}: Chromium 실행 ({time.monotonic() - started:.2f}초)")
+        return self.browser
+
+    def _maybe_recycle(self):
+        reason = None
+        if self.pages_served >= self.pool.max_pages:
+            reason = f"{self.pages_served}페이지 처리"
+        elif self.pool.max_rss_mb and self.browser_pid:
+            # 이 슬롯의 Chromium 만 잰다 (워커 전체를 재면 한 슬롯이 넘을 때 모든 슬롯이 함께 재시작됨)
+            rss = _process_tree_rss_mb(self.browser_pid)
+            if rss is not None and rss > self.pool.max_rss_mb:
+                reason = f"RSS {rss:.0f}MB > {self.pool.max_rss_mb}MB"
+        if reason:
+            print(f"♻️ {self.name}: 브라우저 재시작 ({reason})")
+            self._close_browser()
+
+    def _close_browser(self):
+        if self.browser is not None:
+            try: self.browser.close()
+            except Exception: pass
+        self.browser = None
+        self.browser_pid = None
+
+
+class BrowserPool:
+    """
+    사용법:
+        html = get_browser_pool().run(lambda page: (page.goto(url), page.content())[1])
+    fn(page) 는 슬롯 스레드에서 실행되며, 반환값이 그대로 호출자에게 전달된다.
+    """
+
+    def __init__(self, size=2, max_pages=50, max_rss_mb=0, prewarm=True):
+        self.size = max(1, size)
+        self.max_pages = max(1, max_pages)
+        self.max_rss_mb = max_rss_mb
+        self.prewarm = prewarm
+        self.closed = False
+        self.jobs = queue.Queue()
+        self.slots = [_BrowserSlot(self, i) for i in range(self.size)]
+        for slot in self.slots:
+            slot.start()
+
+    def run(self, fn, context_options=None, timeout=None):
+        """새 context/page 에서 fn(page) 실행 후 결과 반환 (timeout 초과 시 TimeoutError)"""
+        if self.closed:
+            raise RuntimeError("브라우저 풀이 종료되었습니다")
+        future = Future()
+        self.jobs.put((fn, context_options or {}, future))
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def stats(self):
+        return {
+            "size": self.size,
+            "queued": self.jobs.qsize(),
+            "launches": sum(s.launch_count for s in self.slots),
+            "pages_served": [s.pages_served for s in self.slots],
+        }
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for _ in self.slots:
+            self.jobs.put(None)
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    """워커 프로세스별 브라우저 풀을 지연 초기화하여 반환 (fork 후에는 새로 생성)"""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = BrowserPool(
+                size=int(getattr(settings, 'PLAYWRIGHT_POOL_SIZE', 2)),
+                max_pages=int(getattr(settings, 'PLAYWRIGHT_MAX_PAGES_PER_BROWSER', 50)),
+                max_rss_mb=int(getattr(settings, 'PLAYWRIGHT_MAX_RSS_MB', 0)),
+                prewarm=bool(getattr(settings, 'PLAYWRIGHT_POOL_PREWARM', True)),
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def close_browser_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.close()
+        _pool = None
+
+
+atexit.register(close_browser_pool)
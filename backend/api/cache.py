@@ -0,0 +1,144 @@
+"""
+워커 간 공유 캐시 (DB 기반, TTL + 크기 제한 LRU)
+
+gunicorn 워커마다 메모리 캐시를 두면 같은 URL도 워커 수만큼 다시 분석하게 되므로
+Django DB(CacheEntry 테이블)에 저장해 모든 워커가 같은 캐시를 보도록 한다.
+테이블이 없거나(migrate 전) DB 오류가 나면 캐시 미스로 취급하고 분석은 그대로 진행한다.
+
+SQLite 는 쓰기 잠금이 DB 전체에 하나라서, 조회(hit)마다 쓰기를 하면 워커들이 그 잠금에 줄을 선다.
+- 조회 시각(accessed_at)은 CACHE_TOUCH_INTERVAL 초보다 오래됐을 때만 갱신 (LRU 순서는 그 정도 오차로 충분)
+- 만료/개수 초과 정리는 저장할 때마다가 아니라 프로세스에서 CACHE_EVICT_EVERY 번 저장할 때마다 한 번
+"""
+import hashlib
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, transaction
+from django.utils import timezone
+
+from .models import CacheEntry
+
+
+def make_cache_key(*parts):
+    """여러 값을 이어 붙여 고정 길이(sha256) 키로 변환"""
+    raw = "\x1f".join(str(p) for p in parts)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SharedLRUCache:
+    """
+    namespace 하나에 해당하는 캐시
+    - ttl: 저장 후 이 시간(초)이 지나면 만료
+    - max_entries: 초과 시 가장 오래 조회되지 않은 항목부터 삭제 (LRU)
+    설정값은 settings 이름으로 받아 호출 시점에 읽는다 (override_settings 대응).
+    """
+
+    def __init__(self, namespace, ttl_setting, max_entries_setting, default_ttl=3600, default_max_entries=1000):
+        self.namespace = namespace
+        self.ttl_setting = ttl_setting
+        self.max_entries_setting = max_entries_setting
+        self.default_ttl = default_ttl
+        self.default_max_entries = default_max_entries
+        self._sets_since_evict = 0
+        self._evict_lock = threading.Lock()
+
+    @property
+    def ttl(self):
+        return int(getattr(settings, self.ttl_setting, self.default_ttl))
+
+    @property
+    def max_entries(self):
+        return int(getattr(settings, self.max_entries_setting, self.default_max_entries))
+
+    def get(self, key):
+        """(value, age_seconds) 반환, 없거나 만료되면 None"""
+        if self.ttl <= 0:
+            return None
+        hashed = make_cache_key(key)
+        now = timezone.now()
+        try:
+            entry = CacheEntry.objects.filter(namespace=self.namespace, key=hashed).first()
+            if entry is None:
+                return None
+            age = (now - entry.created_at).total_seconds()
+            if age > self.ttl:
+                entry.delete()
+                return None
+            # LRU: 조회 시각 갱신 (최근에 갱신했으면 쓰기를 생략)
+            touch_interval = getattr(settings, 'CACHE_TOUCH_INTERVAL', 60)
+            if (now - entry.accessed_at).total_seconds() >= touch_interval:
+                CacheEntry.objects.filter(pk=entry.pk).update(accessed_at=now)
+            return entry.value, age
+        except DatabaseError as e:
+            print(f"⚠️ 캐시 조회 실패 ({self.namespace}): {e}")
+            return None
+
+    def set(self, key, value):
+        if self.ttl <= 0:
+            return
+        hashed = make_cache_key(key)
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                updated = CacheEntry.objects.filter(namespace=self.namespace, key=hashed).update(
+                    value=value, created_at=now, accessed_at=now
+                )
+                if not updated:
+                    CacheEntry.objects.create(
+                        namespace=self.namespace, key=hashed, value=value,
+                        created_at=now, accessed_at=now
+                    )
+            if self._should_evict():
+                self._evict(now)
+        except IntegrityError:
+            # 다른 워커가 동시에 같은 키를 저장함 -> 그쪽 결과를 사용
+            pass
+        except DatabaseError as e:
+            print(f"⚠️ 캐시 저장 실패 ({self.namespace}): {e}")
+
+    def delete(self, key):
+        try:
+            CacheEntry.objects.filter(namespace=self.namespace, key=make_cache_key(key)).delete()
+        except DatabaseError as e:
+            print(f"⚠️ 캐시 삭제 실패 ({self.namespace}): {e}")
+
+    def _should_evict(self):
+        """이 프로세스에서 CACHE_EVICT_EVERY 번 저장할 때마다 True (1 이하면 매번)"""
+        every = int(getattr(settings, 'CACHE_EVICT_EVERY', 50))
+        with self._evict_lock:
+            self._sets_since_evict += 1
+            if self._sets_since_evict < every:
+                return False
+            self._sets_since_evict = 0
+            return True
+
+    def _evict(self, now):
+        """만료 항목 삭제 후, 최대 개수를 넘으면 accessed_at 이 오래된 순으로 삭제"""
+        entries = CacheEntry.objects.filter(namespace=self.namespace)
+        entries.filter(created_at__lt=now - timedelta(seconds=self.ttl)).delete()
+
+        overflow = entries.count() - self.max_entries
+        if overflow > 0:
+            stale_ids = list(entries.order_by('accessed_at').values_list('pk', flat=True)[:overflow])
+            CacheEntry.objects.filter(pk__in=stale_ids).delete()
+
+
+# 분석 결과 캐시 (정규화된 URL 기준)
+analysis_cache = SharedLRUCache(
+    "analysis",
+    ttl_setting="ANALYSIS_CACHE_TTL",
+    max_entries_setting="ANALYSIS_CACHE_MAX_ENTRIES",
+    default_ttl=6 * 3600,
+    default_max_entries=5000,
+)
+
+# GPT 판정/크로스체크 결과 캐시 (모델 + 프롬프트 버전 + 정규화된 입력 기준)
+# 같은 통신사 기사가 여러 URL 로 퍼져도 내용이 같으면 한 번만 호출한다.
+llm_cache = SharedLRUCache(
+    "llm",
+    ttl_setting="LLM_CACHE_TTL",
+    max_entries_setting="LLM_CACHE_MAX_ENTRIES",
+    default_ttl=7 * 86400,
+    default_max_entries=20000,
+)
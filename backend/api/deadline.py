@@ -0,0 +1,78 @@
+"""
+요청별 처리 시간 예산 (deadline)
+
+requests 5초, Playwright 60초, 구글 10초, OpenAI 무제한처럼 단계마다 따로 정한 timeout 만으로는
+분석 한 건이 얼마나 걸릴지 보장할 수 없다. 요청을 받을 때 예산을 한 번 정하고 모든 단계에 넘긴다.
+
+- 외부 호출(requests, Playwright, OpenAI)은 원래 상한과 남은 예산 중 작은 값을 timeout 으로 쓴다.
+- 선택 단계(GPT, 구글 검색, 크로스체크)는 시작할 때 남은 예산이 부족하면 건너뛰고,
+  실행 중 예산이 끝나면 결과를 기다리지 않는다 (api/pipeline.py).
+- 건너뛴 단계는 최종 점수 가중치에서 빼고 나머지 가중치를 다시 맞춘다 (views.calculate_final_score).
+
+    deadline = make_deadline(request_seconds)
+    response = cached_get(url, timeout=timeout_for(deadline, 5))
+"""
+import math
+import time
+
+from django.conf import settings
+
+
+class DeadlineExceeded(Exception):
+    """예산이 끝나 단계를 마치지 못함 (선택 단계면 실패가 아니라 건너뛴 것으로 처리)"""
+
+
+class Deadline:
+    def __init__(self, seconds):
+        self.budget = float(seconds)
+        self.started = time.monotonic()
+        self.expires_at = self.started + self.budget
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def timeout(self, cap):
+        """외부 호출 timeout(초): cap 과 남은 예산 중 작은 값 (남은 예산이 없으면 DeadlineExceeded)"""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"처리 시간 예산({self.budget:g}초) 초과")
+        return min(cap, remaining)
+
+    def stats(self):
+        """응답의 deadline 항목"""
+        return {
+            "budget_seconds": self.budget,
+            "elapsed_seconds": round(time.monotonic() - self.started, 2),
+            "exceeded": self.expired(),
+        }
+
+
+def timeout_for(deadline, cap):
+    """deadline 이 없으면(None) 원래 상한 그대로"""
+    return cap if deadline is None else deadline.timeout(cap)
+
+
+def make_deadline(seconds=None):
+    """
+    요청에서 받은 예산(초) -> Deadline
+    없거나 숫자가 아니면 ANALYSIS_DEADLINE_SECONDS, ANALYSIS_DEADLINE_MIN/MAX_SECONDS 범위로 제한
+    """
+    default = getattr(settings, 'ANALYSIS_DEADLINE_SECONDS', 45)
+    try:
+        seconds = float(seconds) if seconds is not None else default
+    except (TypeError, ValueError):
+        seconds = default
+    if not math.isfinite(seconds):
+        seconds = default
+    low = getattr(settings, 'ANALYSIS_DEADLINE_MIN_SECONDS', 5)
+    high = getattr(settings, 'ANALYSIS_DEADLINE_MAX_SECONDS', 90)
+    return Deadline(min(max(seconds, low), high))
+
+
+def raise_if_expired(deadline, error):
+    """외부 호출 실패가 예산이 끝났기 때문이면 DeadlineExceeded 로 바꿔 던진다 (아니면 그냥 반환)"""
+    if deadline is not None and deadline.expired():
+        raise DeadlineExceeded(f"처리 시간 예산({deadline.budget:g}초) 초과: {error}") from error
@@ -0,0 +1,124 @@
+"""
+로컬 문장 임베딩 크로스체크 (CROSS_CHECK_MODE=embedding / hybrid)
+
+관련 기사와의 일치도를 매번 gpt-4o-mini 에 묻는 대신, 작은 문장 임베딩 모델(CPU)로
+원본 기사(제목 + 본문 앞부분)와 관련 기사(제목 + 검색 결과 요약)를 한 배치로 임베딩하고
+코사인 유사도를 한 번의 행렬 곱으로 계산해 기존 크로스체크 결과 형식으로 바꾼다.
+
+- 모델: EMBEDDING_MODEL (sentence-transformers 형식 모델을 저장한 로컬 디렉터리, 네트워크에서 내려받지 않음)
+  AutoModel 의 마지막 hidden state 를 attention_mask 로 평균(mean pooling)한 뒤 L2 정규화
+- 점수: 관련 기사별 유사도의 평균을 EMBEDDING_SIM_LOW~HIGH 구간에서 0~100 으로 환산
+- 일치도: 점수가 EMBEDDING_HIGH_SCORE 이상이면 "높음", EMBEDDING_LOW_SCORE 미만이면 "낮음", 나머지 "보통"
+- 모델은 프로세스마다 처음 쓸 때 한 번 로딩한다 (gunicorn post_worker_init 에서 미리 로딩).
+  지정하지 않았거나 로딩에 실패하면 None 을 돌려주고, 호출하는 쪽(views.cross_check_with_related_articles)이 GPT 로 대체한다.
+
+    result = embedding_cross_check(title, text, related_articles)
+    # {"score": 0~100, "consistency": "높음/보통/낮음", "reason": "...", "method": "embedding", ...}
+"""
+import os
+import threading
+
+import torch
+import torch.nn.functional as F
+from django.conf import settings
+from transformers import AutoModel, AutoTokenizer
+
+tokenizer = None
+model = None
+_load_attempted = False
+_load_lock = threading.Lock()
+
+
+def get_model_name():
+    return getattr(settings, 'EMBEDDING_MODEL', '')
+
+
+def load_model():
+    """임베딩 토크나이저/모델을 (프로세스에서 한 번만) 로딩, 실패하면 None"""
+    global tokenizer, model, _load_attempted
+    with _load_lock:
+        if _load_attempted:
+            return model
+        _load_attempted = True
+        name = get_model_name()
+        if not name:
+            print("⚠️ EMBEDDING_MODEL 이 없어 임베딩 크로스체크를 쓰지 않습니다 (gpt 로 동작)")
+            return None
+        try:
+            tokenizer = AutoTokenizer.from_pretrained(name, local_files_only=True)
+            model = AutoModel.from_pretrained(name, local_files_only=True)
+            model.eval()
+            print(f"✅ 임베딩 모델 로딩 성공 ({name}, pid={os.getpid()})")
+        except Exception as e:
+            print(f"❌ 임베딩 모델 로딩 실패 ({name}): {e}")
+            tokenizer = None
+            model = None
+        return model
+
+
+def embed(texts):
+    """문장 목록 -> L2 정규화된 임베딩 행렬 (len(texts) x hidden), 모델이 없으면 None"""
+    if load_model() is None:
+        return None
+    inputs = tokenizer(
+        texts, padding=True, truncation=True,
+        max_length=int(getattr(settings, 'EMBEDDING_MAX_LENGTH', 256)), return_tensors="pt",
+    )
+    with torch.no_grad():
+        hidden = model(**inputs).last_hidden_state
+    # 패딩 토큰을 빼고 평균 (mean pooling)
+    mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+    pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+    return F.normalize(pooled, p=2, dim=1)
+
+
+def article_text(title, text):
+    """원본 기사 입력: 제목 + 본문 앞부분 (GPT 크로스체크 프롬프트와 같은 1000자)"""
+    return f"{title}\n{(text or '')[:1000]}"
+
+
+def related_text(article):
+    """관련 기사 입력: 제목 + 검색 결과 요약 (요약이 없으면 제목만)"""
+    snippet = article.get("snippet") or ""
+    return f"{article['title']}\n{snippet}" if snippet else article["title"]
+
+
+def similarity_to_score(similarity):
+    """코사인 유사도 -> 0~100 (EMBEDDING_SIM_LOW 이하 0점, EMBEDDING_SIM_HIGH 이상 100점)"""
+    low = float(getattr(settings, 'EMBEDDING_SIM_LOW', 0.2))
+    high = float(getattr(settings, 'EMBEDDING_SIM_HIGH', 0.8))
+    ratio = (similarity - low) / (high - low) if high > low else float(similarity >= high)
+    return round(min(max(ratio, 0.0), 1.0) * 100, 2)
+
+
+def consistency_level(score):
+    if score >= float(getattr(settings, 'EMBEDDING_HIGH_SCORE', 70)):
+        return "높음"
+    if score < float(getattr(settings, 'EMBEDDING_LOW_SCORE', 40)):
+        return "낮음"
+    return "보통"
+
+
+def embedding_cross_check(title, text, related_articles):
+    """
+    원본 기사와 관련 기사(최대 5개)의 임베딩 유사도로 일치도 평가
+    Returns: {"score", "consistency", "reason", "method": "embedding", "similarities"}
+             모델을 불러올 수 없으면 None
+    """
+    related = related_articles[:5]
+    vectors = embed([article_text(title, text)] + [related_text(a) for a in related])
+    if vectors is None:
+        return None
+
+    # 정규화된 벡터라 내적이 곧 코사인 유사도 (관련 기사 전체를 한 번의 행렬 곱으로)
+    similarities = (vectors[1:] @ vectors[0]).tolist()
+    mean_similarity = sum(similarities) / len(similarities)
+    score = similarity_to_score(mean_similarity)
+    supporting = sum(1 for s in similarities if similarity_to_score(s) >= float(getattr(settings, 'EMBEDDING_HIGH_SCORE', 70)))
+    return {
+        "score": score,
+        "consistency": consistency_level(score),
+        "reason": f"관련 기사 {len(related)}건 중 {supporting}건이 원본과 내용이 비슷함 (평균 유사도 {mean_similarity:.2f})",
+        "method": "embedding",
+        "similarities": [round(s, 4) for s in similarities],
+    }
@@ -0,0 +1,248 @@
+"""
+기사 HTML 추출 (파서 백엔드 + 도메인별 추출기 레지스트리)
+
+- 파서: HTML_PARSER 설정 ("auto" 면 lxml 이 설치되어 있으면 lxml, 없으면 html.parser)
+  lxml 은 C 로 구현되어 있어 순수 Python 인 html.parser 보다 몇 배 빠르다.
+- 추출기: 기사 도메인(서브도메인 -> 상위 도메인 순서)으로 등록된 추출기를 고르고,
+  없으면 GENERIC_EXTRACTOR 를 쓴다. 사이트 추출기는 자기 선택자를 먼저 시도하고
+  못 찾으면 일반 선택자로 넘어간다.
+- 한 번 파싱한 트리를 한 번만 훑어 제목/본문/언론사/발행일을 모두 뽑는다.
+  각 선택자의 마지막 부분(태그/id/class)으로 후보 요소만 빠르게 모은 뒤 후보에만
+  CSS 선택자를 적용해 우선순위대로 고른다 (선택자마다 select_one 으로 트리 전체를
+  다시 훑으면 soupsieve 가 모든 요소에 선택자를 하나씩 대조해 파싱보다 오래 걸린다).
+
+새 사이트 추가:
+    register_extractor(ArticleExtractor("한겨레", ["hani.co.kr"], body=["div.article-text"]))
+"""
+import re
+
+import soupsieve
+from bs4 import BeautifulSoup
+from dateutil import parser as date_parser
+from django.conf import settings
+
+# 일반 선택자 (우선순위 순서, Playwright 렌더링 완료 판단에도 사용)
+ARTICLE_TITLE_SELECTORS = ('h1', 'h2.media_end_head_headline', 'h3.tit_view')
+ARTICLE_BODY_SELECTORS = (
+    'div#dic_area',          # 네이버
+    'div.article_view',      # 다음
+    'section.article-body',  # 조선일보 (핵심!)
+    'div.news_body_id',      # 일부 언론사
+    'article',               # 일반적인 HTML5 사이트
+)
+PUBLISH_DATE_META = ('article:published_time', 'og:published_time', 'pubdate')
+DATE_NOT_FOUND = "날짜 찾기 실패"
+
+_parser_name = None
+
+
+def get_parser_name():
+    """BeautifulSoup 에 넘길 파서 이름 (프로세스당 한 번 결정)"""
+    global _parser_name
+    if _parser_name is None:
+        name = getattr(settings, 'HTML_PARSER', 'auto')
+        if name in ('auto', 'lxml'):
+            try:
+                import lxml  # noqa: F401
+                name = 'lxml'
+            except ImportError:
+                if name == 'lxml':
+                    print("⚠️ lxml 이 설치되어 있지 않아 html.parser 사용")
+                name = 'html.parser'
+        _parser_name = name
+    return _parser_name
+
+
+def make_soup(html):
+    return BeautifulSoup(html, get_parser_name())
+
+
+def extract_date_from_url(url):
+    match = re.search(r'(\d{4})[/-](\d{1,2})[/-](\d{1,2})', url)
+    if match: return f"{match.group(1)}-{match.group(2)}-{match.group(3)}"
+    match_compact = re.search(r'/(\d{4})(\d{2})(\d{2})/', url)
+    if match_compact: return f"{match_compact.group(1)}-{match_compact.group(2)}-{match_compact.group(3)}"
+    return None
+
+
+def collect_meta(tags):
+    """<meta property|name=... content=...> 목록 -> dict (같은 키는 앞의 것 우선)"""
+    metas = {}
+    for tag in tags:
+        key = tag.get('property') or tag.get('name')
+        content = tag.get('content')
+        if key and content:
+            metas.setdefault(key, content.strip())
+    return metas
+
+
+def _parse_date(value):
+    try:
+        return date_parser.parse(value).isoformat()
+    except (ValueError, OverflowError):
+        return None
+
+
+def _selector_key(selector):
+    """'a.logo img' -> ("tag", "img"), 'div#dic_area' -> ("id", "dic_area"), 'h2.tit' -> ("class", "tit")"""
+    last = re.split(r'[\s>+~]+', re.sub(r'\[[^\]]*\]', '', selector.strip()))[-1]
+    match = re.search(r'#([\w-]+)', last)
+    if match:
+        return "id", match.group(1)
+    match = re.search(r'\.([\w-]+)', last)
+    if match:
+        return "class", match.group(1)
+    return "tag", re.match(r'[\w-]*', last).group(0).lower()
+
+
+class _Candidates:
+    """합친 선택자로 한 번에 모은 요소들 (문서 순서) 에서 선택자별 첫 요소를 찾는다"""
+
+    def __init__(self, elements, compiled):
+        self.elements = elements
+        self.compiled = compiled
+
+    def first(self, selector):
+        matcher = self.compiled[selector]
+        return next((el for el in self.elements if matcher.match(el)), None)
+
+    def first_text(self, selectors):
+        for selector in selectors:
+            tag = self.first(selector)
+            if tag:
+                text = tag.get_text().strip()
+                if text:
+                    return text
+        return ""
+
+    def first_attr(self, targets):
+        """targets: [(선택자, 속성 또는 None)] -> 처음 찾은 값 (None 이면 태그 글자)"""
+        for selector, attr in targets:
+            tag = self.first(selector)
+            if tag is None:
+                continue
+            value = (tag.get(attr) if attr else tag.get_text()) or ""
+            if value.strip():
+                return value.strip()
+        return None
+
+
+class ArticleExtractor:
+    """
+    사이트별 추출 규칙
+    title/body: CSS 선택자 목록, publisher/date: [(선택자, 속성)] 목록
+    (모두 일반 선택자보다 먼저 시도)
+    """
+
+    def __init__(self, name, domains=(), title=(), body=(), publisher=(), date=()):
+        self.name = name
+        self.domains = tuple(domains)
+        self.title_selectors = tuple(title) + ARTICLE_TITLE_SELECTORS
+        self.body_selectors = tuple(dict.fromkeys(tuple(body) + ARTICLE_BODY_SELECTORS))
+        self.publisher_targets = tuple(publisher)
+        self.date_targets = tuple(date)
+
+        selectors = list(dict.fromkeys(
+            self.title_selectors + self.body_selectors
+            + tuple(sel for sel, _ in self.publisher_targets + self.date_targets) + ('meta',)
+        ))
+        self._compiled = {sel: soupsieve.compile(sel) for sel in selectors}
+        keys = [_selector_key(sel) for sel in selectors]
+        self._tags = frozenset(v for k, v in keys if k == "tag")
+        self._ids = frozenset(v for k, v in keys if k == "id")
+        self._classes = frozenset(v for k, v in keys if k == "class")
+        self._match_all = "" in self._tags  # '*' 나 '[attr]' 처럼 태그를 특정할 수 없는 선택자
+
+    def _is_candidate(self, tag):
+        return (
+            self._match_all
+            or tag.name in self._tags
+            or tag.get('id') in self._ids
+            or not self._classes.isdisjoint(tag.get('class') or ())
+        )
+
+    def extract(self, soup, url, domain):
+        """Returns: (제목, 본문, 언론사, 발행일)"""
+        found = _Candidates(soup.find_all(self._is_candidate), self._compiled)
+        metas = collect_meta(el for el in found.elements if el.name == 'meta')
+        title, text = self.find_content(soup, found, metas)
+        return title, text, self.find_publisher(found, metas, domain), self.find_date(found, metas, url)
+
+    def find_content(self, soup, found, metas):
+        title = found.first_text(self.title_selectors) or metas.get('og:title', "")
+
+        article_body = next((body for body in map(found.first, self.body_selectors) if body), None)
+        if article_body:
+            # 불필요한 스크립트나 스타일 제거
+            for script in article_body(["script", "style", "iframe"]):
+                script.decompose()
+            text = article_body.get_text(separator=" ").strip()
+        else:
+            # 본문 영역을 못 찾으면 본문으로 추정되는 긴 p 태그들을 모음 (메뉴 등 짧은 문장 제외)
+            paragraphs = (p.get_text().strip() for p in soup.find_all('p'))
+            text = " ".join(p for p in paragraphs if len(p) > 30)
+        return title, text
+
+    def find_publisher(self, found, metas, domain):
+        return found.first_attr(self.publisher_targets) or metas.get('og:site_name') or domain
+
+    def find_date(self, found, metas, url):
+        candidates = [found.first_attr([target]) for target in self.date_targets]
+        candidates += [metas.get(key) for key in PUBLISH_DATE_META]
+        for value in candidates:
+            parsed = value and _parse_date(value)
+            if parsed:
+                return parsed
+        return extract_date_from_url(url) or DATE_NOT_FOUND
+
+
+GENERIC_EXTRACTOR = ArticleExtractor("generic")
+
+_registry = {}
+
+
+def register_extractor(extractor):
+    for domain in extractor.domains:
+        _registry[domain.lower()] = extractor
+    return extractor
+
+
+def get_extractor(domain):
+    """news.kbs.co.kr -> news.kbs.co.kr, kbs.co.kr, co.kr 순서로 등록된 추출기 (없으면 일반 추출기)"""
+    labels = (domain or "").lower().split(".")
+    for i in range(len(labels) - 1):
+        extractor = _registry.get(".".join(labels[i:]))
+        if extractor:
+            return extractor
+    return GENERIC_EXTRACTOR
+
+
+def extract_article(html, url, domain):
+    """HTML -> (제목, 본문, 언론사, 발행일), 한 번만 파싱"""
+    return get_extractor(domain).extract(make_soup(html), url, domain)
+
+
+# 네이버 뉴스: 본문이 <article id="dic_area"> 로 바뀌었고 og:site_name 은 언론사가 아니라 네이버
+register_extractor(ArticleExtractor(
+    "naver", ["news.naver.com", "n.news.naver.com", "m.news.naver.com", "entertain.naver.com", "sports.news.naver.com"],
+    title=['h2.media_end_head_headline', 'h2#title_area'],
+    body=['#dic_area', '#newsct_article'],
+    publisher=[('a.media_end_head_top_logo img', 'alt'), ('meta[property="og:article:author"]', 'content')],
+    date=[('span.media_end_head_info_datestamp_time', 'data-date-time')],
+))
+
+# 다음 뉴스
+register_extractor(ArticleExtractor(
+    "daum", ["v.daum.net", "news.v.daum.net"],
+    title=['h3.tit_view'],
+    body=['div.article_view'],
+    publisher=[('#kakaoServiceLogo', None)],
+    date=[('span.num_date', None)],
+))
+
+# 조선일보 (본문이 JS 로 채워지는 경우가 많아 브라우저 대기 선택자로도 쓰임)
+register_extractor(ArticleExtractor(
+    "chosun", ["chosun.com"],
+    title=['h1.article-header__headline', 'h1'],
+    body=['section.article-body'],
+))
@@ -0,0 +1,134 @@
+"""
+도메인별 기사 수집 전략 학습
+
+기사 수집은 requests(정적 HTML) -> 본문이 없으면 Playwright 순서로 시도하는데,
+JS 렌더링이 필요하거나 봇을 차단하는 언론사는 매번 requests 시도에 최대 5초를 버린다.
+도메인마다 두 방식의 성공률(EMA)을 기록해 두고, 정적 수집이 거의 항상 실패하는 도메인은
+처음부터 브라우저로 간다.
+
+전략 (classify)
+- static : 표본이 적거나 requests 성공률이 FETCH_STRATEGY_SKIP_THRESHOLD 이상 -> requests 먼저
+- browser: requests 는 실패하지만 브라우저는 성공 -> requests 건너뜀
+- blocked: 둘 다 실패하는 편 -> requests 는 건너뛰고 브라우저로 한 번만 시도
+
+브라우저로 건너뛰는 도메인도 FETCH_STRATEGY_EXPLORE_RATE 확률로 requests 를 다시 시도해
+사이트가 정적 HTML 로 바뀌면 다시 static 으로 돌아온다.
+기록은 DB(DomainFetchStrategy)에 있어 모든 워커가 함께 학습하며, DB 오류 시에는 기존 방식대로 동작한다.
+여러 워커가 같은 도메인을 동시에 기록해도 값을 잃지 않도록 갱신은 F() 식 UPDATE 한 번으로 한다.
+"""
+import random
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Case, F, Sum, Value, When
+from django.utils import timezone
+
+from .models import DomainFetchStrategy
+
+STATIC, BROWSER, BLOCKED = "static", "browser", "blocked"
+
+
+def classify(row):
+    """DomainFetchStrategy 행 -> "static" | "browser" | "blocked" """
+    min_samples = getattr(settings, 'FETCH_STRATEGY_MIN_SAMPLES', 3)
+    threshold = getattr(settings, 'FETCH_STRATEGY_SKIP_THRESHOLD', 0.3)
+    if row is None or row.static_attempts < min_samples or row.static_success >= threshold:
+        return STATIC
+    return BROWSER if row.browser_success >= 0.5 else BLOCKED
+
+
+def plan_fetch(domain):
+    """
+    Returns: {"strategy": 전략, "try_static": requests 를 먼저 시도할지}
+    """
+    try:
+        row = DomainFetchStrategy.objects.filter(domain=domain).first() if domain else None
+    except DatabaseError:
+        row = None
+    strategy = classify(row)
+    try_static = strategy == STATIC or random.random() < getattr(settings, 'FETCH_STRATEGY_EXPLORE_RATE', 0.05)
+    return {"strategy": strategy, "try_static": try_static}
+
+
+def _ema(previous, value, alpha):
+    """EMA 갱신 식 (previous 는 F() 식이어도 됨)"""
+    return (1 - alpha) * previous + alpha * value
+
+
+def record_fetch(domain, static_ok=None, static_ms=0.0, browser_ok=None):
+    """
+    수집 결과를 반영 (시도하지 않은 방식은 None)
+    static_ok=None 이고 브라우저로 본문을 얻었으면 requests 를 건너뛴 것으로 보고 아낀 시간을 더한다.
+    """
+    if not domain:
+        return
+    alpha = getattr(settings, 'FETCH_STRATEGY_ALPHA', 0.3)
+    changes = {}
+    if static_ok is not None:
+        changes.update(
+            static_attempts=F('static_attempts') + 1,
+            static_successes=F('static_successes') + int(static_ok),
+            static_success=_ema(F('static_success'), float(static_ok), alpha),
+        )
+        if not static_ok:
+            changes["static_fail_ms"] = Case(
+                When(static_fail_ms=0, then=Value(float(static_ms))),
+                default=_ema(F('static_fail_ms'), static_ms, alpha),
+            )
+    elif browser_ok:
+        changes.update(static_skipped=F('static_skipped') + 1, time_saved_ms=F('time_saved_ms') + F('static_fail_ms'))
+    if browser_ok is not None:
+        changes.update(
+            browser_attempts=F('browser_attempts') + 1,
+            browser_successes=F('browser_successes') + int(browser_ok),
+            browser_success=_ema(F('browser_success'), float(browser_ok), alpha),
+        )
+    if not changes:
+        return
+    try:
+        DomainFetchStrategy.objects.get_or_create(domain=domain)
+        # 읽고-고치고-저장하지 않고 DB 에서 바로 계산 (update() 는 auto_now 를 채우지 않음)
+        DomainFetchStrategy.objects.filter(domain=domain).update(updated_at=timezone.now(), **changes)
+    except DatabaseError as e:
+        print(f"⚠️ 수집 전략 기록 실패 ({domain}): {e}")
+
+
+def _rate(successes, attempts):
+    return round(successes / attempts, 3) if attempts else None
+
+
+def strategy_stats(limit=100):
+    """GET /api/fetch-strategies/ 응답 data"""
+    rows = DomainFetchStrategy.objects.order_by('-updated_at')[:limit]
+    totals = DomainFetchStrategy.objects.aggregate(
+        static_attempts=Sum('static_attempts'), static_successes=Sum('static_successes'),
+        browser_attempts=Sum('browser_attempts'), browser_successes=Sum('browser_successes'),
+        static_skipped=Sum('static_skipped'), time_saved_ms=Sum('time_saved_ms'),
+    )
+    totals = {k: v or 0 for k, v in totals.items()}
+    return {
+        "summary": {
+            "domains": DomainFetchStrategy.objects.count(),
+            "static_hit_rate": _rate(totals["static_successes"], totals["static_attempts"]),
+            "browser_hit_rate": _rate(totals["browser_successes"], totals["browser_attempts"]),
+            "static_skipped": totals["static_skipped"],
+            "time_saved_seconds": round(totals["time_saved_ms"] / 1000, 1),
+        },
+        "domains": [
+            {
+                "domain": row.domain,
+                "strategy": classify(row),
+                "static_success": round(row.static_success, 3),
+                "browser_success": round(row.browser_success, 3),
+                "static_hit_rate": _rate(row.static_successes, row.static_attempts),
+                "browser_hit_rate": _rate(row.browser_successes, row.browser_attempts),
+                "static_attempts": row.static_attempts,
+                "browser_attempts": row.browser_attempts,
+                "static_skipped": row.static_skipped,
+                "avg_static_fail_ms": round(row.static_fail_ms, 1),
+                "time_saved_seconds": round(row.time_saved_ms / 1000, 1),
+                "updated_at": row.updated_at.isoformat(),
+            }
+            for row in rows
+        ],
+    }
@@ -0,0 +1,219 @@
+"""
+워커별 공유 HTTP 클라이언트 + 디스크 HTTP 캐시
+
+requests.get() 을 바로 부르면 요청마다 TCP/TLS 연결을 새로 맺고 검증자(ETag 등)도 버린다.
+여기서는 프로세스당 requests.Session 하나를 두고 호스트별 keep-alive 연결 풀을 재사용하며,
+응답을 HTTP_CACHE_DIR 에 저장해 다음 요청 때 조건부 GET 으로 다시 확인한다.
+
+- Cache-Control max-age 가 남아 있으면 네트워크 없이 저장된 응답 사용 (받을 때의 Age 만큼 빼서 계산)
+- 만료됐거나 no-cache 이면 If-None-Match / If-Modified-Since 를 붙여 요청 -> 304 면 저장된 본문 재사용
+- no-store / private / Vary: * 이거나 검증자/max-age 가 모두 없는 응답은 저장하지 않음
+  (이전에 저장한 항목이 있으면 지운다 -> 다음 요청 때 옛 본문으로 재검증하지 않음)
+- 적중/재검증/저장 횟수는 api/metrics.py 로 기록 (여러 스레드에서 불려도 안전)
+- 캐시 파일은 모든 워커가 함께 쓰며, HTTP_CACHE_MAX_ENTRIES 를 넘으면 오래된 파일부터 삭제
+
+    response = cached_get(url, headers={'User-Agent': ...}, timeout=5)
+    response.status_code, response.text   # requests.Response 그대로 (304 도 200 으로 복원)
+"""
+import gzip
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+from . import metrics
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+# 캐시에 함께 저장해 두는 응답 헤더
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Date', 'Expires', 'Age')
+
+
+def get_http_session():
+    """워커 프로세스별 requests.Session (fork 후에는 새로 생성)"""
+    global _session, _session_pid
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=getattr(settings, 'HTTP_POOL_CONNECTIONS', 32),  # 연결 풀을 유지할 호스트 수
+                pool_maxsize=getattr(settings, 'HTTP_POOL_MAXSIZE', 16),          # 호스트당 keep-alive 연결 수
+                # 연결 실패/게이트웨이 오류만 한 번 재시도
+                max_retries=Retry(total=1, backoff_factor=0.2, status_forcelist=(502, 503, 504),
+                                  allowed_methods=frozenset(['GET', 'HEAD'])),
+            )
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session, _session_pid = session, os.getpid()
+        return _session
+
+
+class HttpDiskCache:
+    """URL(+User-Agent) 별로 응답 본문과 검증자를 gzip JSON 파일 하나에 저장"""
+
+    def __init__(self, directory, max_entries=2000):
+        self.directory = str(directory)
+        self.max_entries = max_entries
+
+    def _path(self, key):
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest[:2], f"{digest}.json.gz")
+
+    def load(self, key):
+        try:
+            with gzip.open(self._path(key), 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+            return entry if entry.get("key") == key else None
+        except (OSError, ValueError):
+            return None
+
+    def store(self, key, response):
+        entry = {
+            "key": key,
+            "url": response.url,
+            "headers": {h: response.headers[h] for h in STORED_HEADERS if h in response.headers},
+            "text": response.text,
+            "stored_at": time.time(),
+        }
+        self._write(key, entry)
+        if random.random() < 0.02:  # 가끔씩만 디렉토리를 훑어 용량 정리
+            self.evict()
+
+    def touch(self, key, entry, response):
+        """304 응답: 새 검증자/만료 정보로 갱신하고 저장 시각을 다시 잡는다"""
+        for h in STORED_HEADERS:
+            if h in response.headers and h != 'Content-Type':
+                entry["headers"][h] = response.headers[h]
+        entry["stored_at"] = time.time()
+        self._write(key, entry)
+
+    def delete(self, key):
+        try: os.remove(self._path(key))
+        except OSError: pass
+
+    def _write(self, key, entry):
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with gzip.open(tmp, 'wt', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, path)  # 다른 워커가 반쯤 쓴 파일을 읽지 않도록 교체로 저장
+        except OSError as e:
+            print(f"⚠️ HTTP 캐시 저장 실패: {e}")
+            try: os.remove(tmp)
+            except OSError: pass
+
+    def evict(self):
+        """max_entries 를 넘는 만큼 수정 시각이 오래된 파일부터 삭제"""
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith('.json.gz'):
+                    path = os.path.join(root, name)
+                    try: files.append((os.path.getmtime(path), path))
+                    except OSError: pass
+        for _, path in sorted(files)[:max(0, len(files) - self.max_entries)]:
+            try: os.remove(path)
+            except OSError: pass
+
+
+def _cache_directives(headers):
+    """Cache-Control 을 {지시어: 값} 으로 (값이 없는 지시어는 True)"""
+    directives = {}
+    for part in headers.get('Cache-Control', '').split(','):
+        name, _, value = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = value.strip().strip('"') or True
+    return directives
+
+
+def _max_age(headers):
+    """저장 시점부터 남은 신선도 수명(초): max-age - Age, no-cache 면 0 (항상 재검증)"""
+    directives = _cache_directives(headers)
+    if 'no-cache' in directives:
+        return 0
+    try:
+        max_age = int(directives.get('max-age', 0))
+    except (TypeError, ValueError):
+        return 0
+    age = headers.get('Age', '')
+    age = int(age) if str(age).isdigit() else 0
+    return max(0, max_age - age)
+
+
+def _is_storable(response):
+    directives = _cache_directives(response.headers)
+    if response.status_code != 200 or 'no-store' in directives or 'private' in directives:
+        return False
+    if response.headers.get('Vary', '').strip() == '*':  # 어떤 요청 헤더로도 같은 응답이라 볼 수 없음
+        return False
+    return bool(response.headers.get('ETag') or response.headers.get('Last-Modified') or _max_age(response.headers))
+
+
+def _response_from_entry(entry):
+    """저장된 항목을 requests.Response 로 복원"""
+    response = requests.models.Response()
+    response.status_code = 200
+    response.url = entry["url"]
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response._content = entry["text"].encode('utf-8')
+    response.encoding = 'utf-8'
+    return response
+
+
+def get_http_cache():
+    if not getattr(settings, 'HTTP_CACHE_ENABLED', True):
+        return None
+    return HttpDiskCache(
+        getattr(settings, 'HTTP_CACHE_DIR', os.path.join(settings.BASE_DIR, 'http_cache')),
+        max_entries=getattr(settings, 'HTTP_CACHE_MAX_ENTRIES', 2000),
+    )
+
+
+def cached_get(url, headers=None, timeout=5):
+    """공유 세션으로 GET (디스크 캐시 + 조건부 요청)"""
+    headers = dict(headers or {})
+    session = get_http_session()
+    cache = get_http_cache()
+    if cache is None:
+        return session.get(url, headers=headers, timeout=timeout)
+
+    key = f"{url}\x1f{headers.get('User-Agent', '')}"
+    entry = cache.load(key)
+    if entry:
+        if time.time() - entry["stored_at"] < _max_age(entry["headers"]):
+            metrics.record_cache("http", True)
+            return _response_from_entry(entry)
+        if entry["headers"].get('ETag'):
+            headers['If-None-Match'] = entry["headers"]['ETag']
+        if entry["headers"].get('Last-Modified'):
+            headers['If-Modified-Since'] = entry["headers"]['Last-Modified']
+
+    response = session.get(url, headers=headers, timeout=timeout)
+
+    if entry and response.status_code == 304:
+        metrics.record_cache("http", True, result="revalidated")
+        cache.touch(key, entry, response)
+        return _response_from_entry(entry)
+
+    metrics.record_cache("http", False)
+    if _is_storable(response):
+        cache.store(key, response)
+        metrics.inc("http_cache_writes_total", result="stored")
+    elif entry and response.status_code == 200:
+        # 새 응답을 저장할 수 없으면 예전 항목도 더는 쓰지 않는다
+        cache.delete(key)
+        metrics.inc("http_cache_writes_total", result="dropped")
+    return response
@@ -0,0 +1,375 @@
+"""
+로컬 가짜뉴스 분류 모델 추론 (마이크로 배칭)
+
+동시에 들어온 요청을 INFERENCE_MAX_WAIT_MS 동안 모아 한 번의 forward 로 처리한다.
+- 요청마다 padding="max_length"(512 토큰)로 채우지 않고, 배치 안에서 가장 긴 문장 길이까지만 패딩
+  (attention_mask 로 패딩은 무시되므로 점수는 같다)
+- 배치 크기 상한: INFERENCE_MAX_BATCH_SIZE (1이면 배칭 없이 호출한 스레드에서 바로 실행)
+  창 나누기 후의 행(창) 수로 센다. 넣으면 상한을 넘는 요청은 다음 배치로 넘기고,
+  창이 상한보다 많은 요청 하나는 상한 크기씩 나눠 forward 한다.
+- torch 스레드 수: INFERENCE_TORCH_THREADS (0이면 torch 기본값)
+
+추론 백엔드 (INFERENCE_BACKEND)
+- "torch"     : 기본 fp32 PyTorch
+- "int8"      : 로딩 시 torch 동적 int8 양자화 (Linear 레이어)
+- "onnx"      : ONNX Runtime (python manage.py convert_model 로 미리 변환 필요)
+- "onnx-int8" : ONNX Runtime + int8 양자화 모델 (convert_model --quantize)
+변환 후에는 python manage.py check_model_parity 로 fp32 와 확률 차이를 확인한다.
+
+긴 기사 처리 (INFERENCE_CHUNK_MODE)
+- "truncate": 기존처럼 "제목 [SEP] 본문" 을 512 토큰에서 자름
+- "window"  : 본문을 INFERENCE_WINDOW_OVERLAP 토큰씩 겹치는 창으로 나눠 (창마다 제목 포함)
+              한 번의 배치로 추론하고, 창별 확률을 INFERENCE_CHUNK_AGGREGATION(mean/max/confidence)으로 합침
+              창 개수는 INFERENCE_MAX_CHUNKS 로 제한 (넘으면 기사 전체에 고르게 골라 사용)
+"""
+import gc
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import torch
+from django.conf import settings
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+# --- AI 모델 로딩 (로컬) ---
+MODEL_PATH = os.environ.get("MODEL_DIRECTORY", "./my_fake_news_model")
+MAX_LENGTH = 512
+BACKENDS = ("torch", "int8", "onnx", "onnx-int8")
+
+
+def onnx_model_path(model_path=MODEL_PATH, quantized=False):
+    return os.path.join(model_path, "onnx", "model.int8.onnx" if quantized else "model.onnx")
+
+
+def load_torch_model(model_path=MODEL_PATH):
+    model = AutoModelForSequenceClassification.from_pretrained(model_path)
+    model.eval()
+    return model
+
+
+class TorchBackend:
+    """PyTorch 모델 (fp32 또는 동적 int8 양자화)"""
+
+    def __init__(self, model, name="torch"):
+        self.model = model
+        self.name = name
+
+    def __call__(self, inputs):
+        with torch.no_grad():
+            return self.model(**inputs).logits
+
+
+class OnnxBackend:
+    """
+    ONNX Runtime 세션 (onnxruntime 이 설치되어 있어야 함)
+    ORT 세션의 스레드 풀은 fork 후 쓸 수 없으므로 프로세스가 바뀌면 세션을 다시 만든다.
+    """
+
+    def __init__(self, onnx_path, name="onnx", threads=0):
+        self.onnx_path = onnx_path
+        self.threads = threads
+        self.name = name
+        self._create_session()
+
+    def _create_session(self):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        if self.threads > 0:
+            options.intra_op_num_threads = self.threads
+        self.session = ort.InferenceSession(self.onnx_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.pid = os.getpid()
+
+    def __call__(self, inputs):
+        if self.pid != os.getpid():
+            self._create_session()
+        feed = {k: v.numpy() for k, v in inputs.items() if k in self.input_names}
+        return torch.from_numpy(self.session.run(["logits"], feed)[0])
+
+
+def load_backend(name, model_path=MODEL_PATH, threads=0):
+    """INFERENCE_BACKEND 이름으로 추론 백엔드 생성"""
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 추론 백엔드: {name} (가능: {', '.join(BACKENDS)})")
+    if name.startswith("onnx"):
+        return OnnxBackend(onnx_model_path(model_path, quantized=name == "onnx-int8"), name=name, threads=threads)
+
+    model = load_torch_model(model_path)
+    if name == "int8":
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return TorchBackend(model, name=name)
+
+
+tokenizer = None
+backend = None
+_load_attempted = False
+_load_lock = threading.Lock()
+
+
+def load_model():
+    """
+    토크나이저와 추론 백엔드를 (프로세스에서 한 번만) 로딩
+    - MODEL_LOAD_MODE=worker : 각 gunicorn 워커가 시작할 때 호출 (워커마다 가중치 사본)
+    - MODEL_LOAD_MODE=preload: gunicorn 마스터가 fork 전에 호출 -> 워커들이 copy-on-write 로 공유
+    """
+    global tokenizer, backend, _load_attempted
+    with _load_lock:
+        if _load_attempted:
+            return backend
+        _load_attempted = True
+        try:
+            tokenizer = AutoTokenizer.from_pretrained(MODEL_PATH)
+            backend_name = getattr(settings, 'INFERENCE_BACKEND', 'torch')
+            try:
+                backend = load_backend(backend_name, threads=int(getattr(settings, 'INFERENCE_TORCH_THREADS', 0)))
+            except Exception as e:
+                if backend_name == "torch":
+                    raise
+                # ONNX 파일/onnxruntime 이 없으면 기본 fp32 로 대체
+                print(f"⚠️ 추론 백엔드 '{backend_name}' 로딩 실패, torch 로 대체: {e}")
+                backend = load_backend("torch")
+            print(f"✅ AI 모델 로딩 성공 ({MODEL_PATH}, backend={backend.name}, pid={os.getpid()})")
+        except Exception as e:
+            print(f"❌ AI 모델 로딩 실패: {e}")
+            tokenizer = None
+            backend = None
+        return backend
+
+
+def prepare_for_fork():
+    """
+    preload 모드: 마스터에서 모델을 올린 뒤 fork 전에 호출
+    gc.freeze() 로 현재 객체들을 GC 대상에서 빼서, 워커의 GC 가 공유 페이지를 건드려
+    복사(copy-on-write)가 일어나는 것을 막는다.
+    """
+    load_model()
+    gc.collect()
+    gc.freeze()
+
+
+def process_memory_mb(pid="self"):
+    """
+    프로세스 메모리 (MB): rss / pss / shared / private (Linux /proc/<pid>/smaps_rollup)
+    RSS 는 공유 페이지를 워커마다 중복으로 세므로, 실제 점유량은 PSS 합계로 본다.
+    """
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                    fields[parts[0][:-1]] = int(parts[1]) / 1024
+    except OSError:
+        return None
+    return {
+        "rss": round(fields.get("Rss", 0), 1),
+        "pss": round(fields.get("Pss", 0), 1),
+        "shared": round(fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0), 1),
+        "private": round(fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0), 1),
+    }
+
+
+class BatchingClassifier:
+    """
+    encode() 로 만든 입력을 predict_proba() 로 넘기면 [[p_true, p_fake], ...] 를 돌려준다.
+    여러 스레드가 동시에 호출하면 백그라운드 스레드가 하나의 배치로 묶어 실행한다.
+    """
+
+    def __init__(self, backend, tokenizer, max_batch_size=16, max_wait_ms=10):
+        self.backend = backend
+        self.tokenizer = tokenizer
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0, max_wait_ms) / 1000
+        self.requests = queue.Queue()
+        self._carry = None  # 상한을 넘어 다음 배치로 넘긴 요청
+        self.batches_run = 0
+        self.sequences_run = 0
+        if self.max_batch_size > 1:
+            threading.Thread(target=self._loop, name="inference-batcher", daemon=True).start()
+
+    def encode(self, text):
+        """토큰화만 수행 (패딩은 배치를 만들 때)"""
+        return self.tokenizer(text, truncation=True, max_length=MAX_LENGTH)
+
+    def encode_windows(self, title, text, max_chunks=4, overlap=128):
+        """
+        본문을 겹치는 창으로 나눠 각각 "제목 [SEP] 본문일부" 로 토큰화
+        Returns: (encodings, 전체 창 개수)
+        """
+        prefix = f"{title} [SEP] "
+        prefix_len = len(self.tokenizer(prefix, add_special_tokens=False)["input_ids"])
+        budget = MAX_LENGTH - self.tokenizer.num_special_tokens_to_add() - prefix_len
+
+        try:
+            offsets = self.tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)["offset_mapping"]
+        except NotImplementedError:
+            offsets = None  # 느린(파이썬) 토크나이저는 offset 미지원 -> 기존 방식
+        if offsets is None or budget <= overlap or len(offsets) <= budget:
+            return [self.encode(prefix + text)], 1
+
+        step = budget - overlap
+        starts = [0]
+        while starts[-1] + budget < len(offsets):
+            starts.append(starts[-1] + step)
+
+        total = len(starts)
+        if total > max_chunks:
+            # 앞부분만 보지 않도록 처음~끝 사이에서 고르게 선택
+            if max_chunks <= 1:
+                starts = starts[:1]
+            else:
+                starts = [starts[round(i * (total - 1) / (max_chunks - 1))] for i in range(max_chunks)]
+
+        encodings = []
+        for start in starts:
+            end = min(start + budget, len(offsets)) - 1
+            window_text = text[offsets[start][0]:offsets[end][1]]
+            encodings.append(self.encode(prefix + window_text))
+        return encodings, total
+
+    def predict_proba(self, encodings):
+        if self.max_batch_size == 1:
+            return self._forward_rows(encodings)
+        future = Future()
+        self.requests.put((encodings, future))
+        return future.result()
+
+    def _loop(self):
+        while True:
+            first, self._carry = self._carry or self.requests.get(), None
+            batch = [first]
+            size = len(first[0])
+            deadline = time.monotonic() + self.max_wait
+
+            # 최대 max_wait 동안 다른 요청을 더 모은다 (창 수 합계가 상한을 넘으면 다음 배치로)
+            while size < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if size + len(item[0]) > self.max_batch_size:
+                    self._carry = item
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        encodings = [enc for encs, _ in batch for enc in encs]
+        try:
+            probs = self._forward_rows(encodings)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        offset = 0
+        for encs, future in batch:
+            future.set_result(probs[offset:offset + len(encs)])
+            offset += len(encs)
+
+    def _forward_rows(self, encodings):
+        """max_batch_size 행씩 나눠 forward (창이 많은 요청 하나도 메모리 상한을 지키도록)"""
+        probs = []
+        for start in range(0, len(encodings), self.max_batch_size):
+            probs.extend(self._forward(encodings[start:start + self.max_batch_size]))
+        return probs
+
+    def _forward(self, encodings):
+        inputs = self.tokenizer.pad(list(encodings), padding=True, return_tensors="pt")
+        logits = self.backend(inputs)
+        self.batches_run += 1
+        self.sequences_run += len(encodings)
+        return torch.nn.functional.softmax(logits, dim=-1).tolist()
+
+
+_classifier = None
+_classifier_pid = None
+_classifier_lock = threading.Lock()
+
+
+def get_classifier():
+    """워커 프로세스별 BatchingClassifier (모델 로딩 실패 시 None)"""
+    global _classifier, _classifier_pid
+    load_model()
+    if backend is None or tokenizer is None:
+        return None
+    with _classifier_lock:
+        # 배칭 스레드는 fork 후에 살아남지 않으므로 프로세스마다 새로 만든다
+        if _classifier is None or _classifier_pid != os.getpid():
+            threads = int(getattr(settings, 'INFERENCE_TORCH_THREADS', 0))
+            if threads > 0:
+                torch.set_num_threads(threads)
+            _classifier = BatchingClassifier(
+                backend, tokenizer,
+                max_batch_size=int(getattr(settings, 'INFERENCE_MAX_BATCH_SIZE', 16)),
+                max_wait_ms=float(getattr(settings, 'INFERENCE_MAX_WAIT_MS', 10)),
+            )
+            _classifier_pid = os.getpid()
+        return _classifier
+
+
+def aggregate_chunk_probs(probs, method="mean"):
+    """
+    창별 [p_true, p_fake] 를 하나로 합침
+    - mean    : 평균
+    - max     : 가짜 확률이 가장 높은 창 (의심스러운 부분 하나만 있어도 반영)
+    - confidence: 확신도(|p_true - p_fake|)가 큰 창에 가중치를 주는 평균
+      (모델의 attention 으로 창 가중치를 학습하는 pooling 은 모델을 다시 학습해야 해서, 확률만으로 가중)
+    """
+    if len(probs) == 1:
+        return probs[0][0], probs[0][1]
+    if method == "max":
+        prob_true, prob_fake = max(probs, key=lambda p: p[1])[:2]
+        return prob_true, prob_fake
+    if method == "confidence":
+        weights = [abs(p[0] - p[1]) + 1e-6 for p in probs]
+    else:
+        weights = [1.0] * len(probs)
+    total = sum(weights)
+    prob_true = sum(w * p[0] for w, p in zip(weights, probs)) / total
+    return prob_true, 1 - prob_true
+
+
+# --- AI 예측 (로컬) ---
+def get_fake_news_prediction(title, text):
+    """로컬 AI 모델 예측 (0~100 점수로 변환)"""
+    classifier = get_classifier()
+    if not classifier:
+        return {
+            "error": "AI 모델 로딩 실패",
+            "score": 50,  # 기본값
+            "prediction": "Unknown"
+        }
+
+    if getattr(settings, 'INFERENCE_CHUNK_MODE', 'truncate') == "window":
+        encodings, chunks_total = classifier.encode_windows(
+            title, text,
+            max_chunks=int(getattr(settings, 'INFERENCE_MAX_CHUNKS', 4)),
+            overlap=int(getattr(settings, 'INFERENCE_WINDOW_OVERLAP', 128)),
+        )
+    else:
+        encodings, chunks_total = [classifier.encode(f"{title} [SEP] {text}")], 1
+
+    # 창 여러 개도 한 번의 배치로 실행
+    probs = classifier.predict_proba(encodings)
+    prob_true, prob_fake = aggregate_chunk_probs(probs, getattr(settings, 'INFERENCE_CHUNK_AGGREGATION', 'mean'))
+
+    # True 확률을 점수로 변환 (높을수록 진실)
+    score = round(prob_true * 100, 2)
+
+    return {
+        "prediction": "Fake" if prob_fake > prob_true else "True",
+        "score": score,  # 진실 점수
+        "fake_percentage": round(prob_fake * 100, 2),
+        "true_percentage": round(prob_true * 100, 2),
+        "chunks_scored": len(encodings),
+        "chunks_total": chunks_total,
+    }
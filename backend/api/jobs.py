@@ -0,0 +1,200 @@
+"""
+비동기 분석 작업 큐 (DB 기반, AnalysisJob 테이블)
+
+긴 Playwright/GPT 분석이 gunicorn sync 워커(timeout 120초)를 붙잡지 않도록
+웹 워커는 작업을 등록하고 바로 작업 id 를 돌려주며, 실제 분석은 별도 프로세스가 실행한다.
+
+    POST /api/jobs/            -> 202 {"job": {"id": ..., "status": "queued", ...}}
+    GET  /api/jobs/<id>/       -> 상태 + 끝난 단계의 중간 결과(partial) + 최종 결과(result)
+    python manage.py run_analysis_workers --processes 2   (작업 실행 프로세스)
+
+- 큐는 Django DB 테이블이라 로컬(SQLite)에서도 별도 서버 없이 동작한다.
+- 작업 가져오기는 "status=queued 인 행만 running 으로 바꾸는 UPDATE" 로 원자적으로 처리하므로
+  여러 워커 프로세스가 같은 작업을 동시에 가져가지 않는다.
+- 대기 중인 작업이 JOB_QUEUE_MAX_DEPTH 이상이면 새 작업을 받지 않는다 (QueueFullError -> 503).
+- 같은 기사(정규화 URL)의 작업이 이미 대기/실행 중이면 새로 만들지 않고 그 작업을 돌려준다.
+- 워커가 죽어 JOB_STALE_SECONDS 동안 heartbeat 가 없는 작업은 다시 대기열로 돌린다
+  (JOB_MAX_ATTEMPTS 번 실패하면 failed).
+"""
+import os
+import socket
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import F
+from django.utils import timezone
+
+from .models import AnalysisJob
+
+
+class QueueFullError(Exception):
+    def __init__(self, depth, limit):
+        super().__init__(f"분석 대기열이 가득 찼습니다 ({depth}/{limit})")
+        self.depth = depth
+        self.limit = limit
+
+
+def queue_depth():
+    return AnalysisJob.objects.filter(status=AnalysisJob.QUEUED).count()
+
+
+def submit_job(url, canonical_url, force_refresh=False):
+    """
+    분석 작업 등록
+    Returns: (job, created) - 같은 기사의 작업이 이미 대기/실행 중이면 (기존 작업, False)
+    Raises: QueueFullError
+    """
+    if not force_refresh:
+        existing = (
+            AnalysisJob.objects
+            .filter(canonical_url=canonical_url, status__in=[AnalysisJob.QUEUED, AnalysisJob.RUNNING])
+            .order_by('created_at')
+            .first()
+        )
+        if existing:
+            return existing, False
+
+    limit = getattr(settings, 'JOB_QUEUE_MAX_DEPTH', 100)
+    depth = queue_depth()
+    if depth >= limit:
+        raise QueueFullError(depth, limit)
+
+    job = AnalysisJob.objects.create(url=url, canonical_url=canonical_url, force_refresh=force_refresh)
+    return job, True
+
+
+def record_cached_job(url, canonical_url, data):
+    """캐시에 결과가 있으면 큐를 거치지 않고 바로 완료된 작업으로 기록"""
+    now = timezone.now()
+    return AnalysisJob.objects.create(
+        url=url, canonical_url=canonical_url, status=AnalysisJob.DONE,
+        result=data, status_code=200, started_at=now, finished_at=now,
+    )
+
+
+def claim_next_job(worker_name):
+    """가장 오래 기다린 작업을 running 으로 바꾸고 반환 (없으면 None)"""
+    for _ in range(5):  # 다른 워커와 경쟁해서 놓치면 다음 작업으로 재시도
+        candidate = (
+            AnalysisJob.objects.filter(status=AnalysisJob.QUEUED)
+            .order_by('created_at')
+            .values_list('pk', flat=True)
+            .first()
+        )
+        if candidate is None:
+            return None
+        now = timezone.now()
+        claimed = AnalysisJob.objects.filter(pk=candidate, status=AnalysisJob.QUEUED).update(
+            status=AnalysisJob.RUNNING, worker=worker_name, started_at=now, heartbeat_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return AnalysisJob.objects.get(pk=candidate)
+    return None
+
+
+def run_job(job):
+    """작업 하나를 실행하고 결과를 저장 (단계가 끝날 때마다 partial 과 heartbeat 갱신)"""
+    from .views import analyze_with_cache  # views -> jobs 순환 import 방지
+
+    partial = {}
+
+    def on_progress(event, data):
+        if event == "extraction":
+            partial["extraction"] = data
+        else:
+            partial[data["stage"]] = data["result"]
+        AnalysisJob.objects.filter(pk=job.pk).update(partial=partial, heartbeat_at=timezone.now())
+
+    started = time.perf_counter()
+    try:
+        # 응답을 기다리는 요청이 없으므로 가장 넉넉한 예산으로 분석
+        status, payload = analyze_with_cache(
+            job.url, job.force_refresh, on_progress=on_progress,
+            deadline_seconds=getattr(settings, 'ANALYSIS_DEADLINE_MAX_SECONDS', 90),
+        )
+    except Exception as e:
+        print(f"⚠️ 작업 실행 오류 [{job.pk}]: {e}")
+        status, payload = 500, {"success": False, "error": {"message": f"분석 중 오류: {str(e)}"}}
+
+    fields = {"partial": partial, "status_code": status, "finished_at": timezone.now()}
+    if payload["success"]:
+        fields.update(status=AnalysisJob.DONE, result=payload["data"])
+    else:
+        fields.update(status=AnalysisJob.FAILED, error=payload["error"]["message"])
+    AnalysisJob.objects.filter(pk=job.pk).update(**fields)
+    print(f"🧾 작업 {job.pk} {fields['status']} ({time.perf_counter() - started:.1f}초)")
+
+
+def requeue_stale_jobs():
+    """heartbeat 가 끊긴 running 작업을 다시 대기열로 (시도 횟수를 넘기면 실패 처리)"""
+    now = timezone.now()
+    stale = AnalysisJob.objects.filter(
+        status=AnalysisJob.RUNNING,
+        heartbeat_at__lt=now - timedelta(seconds=getattr(settings, 'JOB_STALE_SECONDS', 300)),
+    )
+    failed = stale.filter(attempts__gte=getattr(settings, 'JOB_MAX_ATTEMPTS', 2)).update(
+        status=AnalysisJob.FAILED, error="작업 시간 초과 (워커 중단)", status_code=500, finished_at=now,
+    )
+    requeued = stale.update(status=AnalysisJob.QUEUED, worker="")
+    if failed or requeued:
+        print(f"♻️ 중단된 작업 정리: 재시도 {requeued}개, 실패 {failed}개")
+
+
+def purge_finished_jobs():
+    """JOB_RETENTION_SECONDS 가 지난 완료/실패 작업 삭제"""
+    cutoff = timezone.now() - timedelta(seconds=getattr(settings, 'JOB_RETENTION_SECONDS', 86400))
+    AnalysisJob.objects.filter(
+        status__in=[AnalysisJob.DONE, AnalysisJob.FAILED], finished_at__lt=cutoff
+    ).delete()
+
+
+def worker_loop(should_stop, poll_interval=1.0, exit_when_empty=False):
+    """
+    작업 실행 루프 (run_analysis_workers 의 각 프로세스에서 실행)
+    should_stop(): True 를 반환하면 현재 작업을 마친 뒤 종료
+    """
+    worker_name = f"{socket.gethostname()}:{os.getpid()}"
+    last_maintenance = 0.0
+    print(f"👷 분석 워커 시작 ({worker_name})")
+
+    while not should_stop():
+        if time.monotonic() - last_maintenance > 60:
+            requeue_stale_jobs()
+            purge_finished_jobs()
+            last_maintenance = time.monotonic()
+
+        job = claim_next_job(worker_name)
+        if job is None:
+            if exit_when_empty:
+                break
+            connections.close_all()  # 대기 중에는 DB 연결을 들고 있지 않는다
+            time.sleep(poll_interval)
+            continue
+        run_job(job)
+
+    print(f"👋 분석 워커 종료 ({worker_name})")
+
+
+def job_payload(job):
+    """GET /api/jobs/<id>/ 응답의 job 항목"""
+    payload = {
+        "id": str(job.pk),
+        "url": job.url,
+        "status": job.status,
+        "created_at": job.created_at.isoformat(),
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "partial": job.partial,
+    }
+    if job.status == AnalysisJob.QUEUED:
+        payload["queue_position"] = AnalysisJob.objects.filter(
+            status=AnalysisJob.QUEUED, created_at__lt=job.created_at
+        ).count() + 1
+    if job.status == AnalysisJob.DONE:
+        payload["result"] = job.result
+    if job.status == AnalysisJob.FAILED:
+        payload["error"] = {"message": job.error, "status": job.status_code}
+    return payload
@@ -0,0 +1,145 @@
+"""
+로컬 검색 키워드 추출 (TF-IDF)
+
+관련 기사 검색이 GPT 응답의 keywords 를 기다리면 네이버/구글 검색 시간이 GPT 시간 뒤에 그대로 붙고,
+GPT 가 실패하면 검색 자체를 못 한다. 기사 추출 직후 몇 ms 안에 로컬에서 키워드를 뽑아 바로 검색한다.
+
+- 토큰: 한글/영문/숫자 덩어리에서 흔한 조사/어미를 떼어 낸 명사 후보 (형태소 분석기 없이)
+- TF: 제목은 KEYWORD_TITLE_WEIGHT 배, 본문은 앞 KEYWORD_MAX_CHARS 글자만
+- IDF: KEYWORD_IDF_PATH 의 뉴스 말뭉치 통계 (python manage.py build_keyword_idf 로 생성)
+    {"documents": 문서 수, "df": {"단어": 그 단어가 나온 문서 수, ...}}
+  파일이 없으면 IDF 없이 TF 와 불용어만으로 고른다.
+- 결과는 GPT keywords 와 같은 형식 (상위 KEYWORD_MAX_TERMS 개를 띄어쓰기로 연결)
+
+통계 파일은 프로세스마다 처음 쓸 때 한 번 읽는다 (gunicorn post_worker_init 에서 미리 읽음).
+
+    extract_keywords("비트코인 가격 폭락에 투자자 '패닉'", text)  # -> "비트코인 폭락 투자자"
+"""
+import json
+import math
+import re
+import threading
+from collections import Counter
+
+from django.conf import settings
+
+TOKEN_RE = re.compile(r"[가-힣]+|[A-Za-z][A-Za-z0-9]*|[0-9]+[가-힣A-Za-z]*")
+
+# 명사 뒤에 붙는 조사 (긴 것부터 떼어 낸다)
+JOSA = sorted([
+    "이", "가", "은", "는", "을", "를", "의", "에", "와", "과", "도", "로", "만", "께",
+    "에서", "에게", "으로", "까지", "부터", "보다", "처럼", "마저", "조차", "이나", "이며",
+    "한테", "라고", "이라고", "이라는", "라는", "에서는", "에서도", "으로는", "에는", "에도",
+    "와의", "과의", "에의", "로서", "으로서", "로써", "으로써", "에게서", "이란", "란",
+], key=len, reverse=True)
+
+# 명사 + 하다/되다/이다 꼴 서술어: 어미를 떼고 앞의 명사를 쓴다 (폭락했다 -> 폭락, 전망이다 -> 전망)
+NOUN_PREDICATE_ENDINGS = sorted([
+    "했다", "한다", "하는", "하고", "하며", "해서", "했고", "했으며", "하기", "하면", "했던", "하던", "하게",
+    "된다", "됐다", "되는", "되고", "됐고", "됐으며", "되며", "이다", "였다", "이었다",
+], key=len, reverse=True)
+
+# 이 어미로 끝나는 토큰은 서술어로 보고 버린다
+PREDICATE_ENDINGS = (
+    "있다", "없다", "었다", "았다", "겠다", "혔다", "렸다", "졌다", "였다", "라며", "지만", "는데",
+)
+
+STOPWORDS = {
+    "기자", "뉴스", "사진", "제공", "연합뉴스", "무단", "전재", "재배포", "금지", "저작권",
+    "오늘", "어제", "내일", "지난", "이번", "올해", "지난해", "현재", "최근", "당시", "이후", "이전",
+    "관련", "대한", "위해", "통해", "대해", "따르면", "따라", "가운데", "이날", "때문",
+    "그는", "그러나", "하지만", "또한", "그리고", "이어", "또", "및", "등", "것", "수", "중", "더",
+    "있는", "없는", "이런", "그런", "저런", "모든", "각각", "정도", "경우", "부분", "사실",
+}
+
+_stats = None
+_stats_lock = threading.Lock()
+
+
+def strip_josa(token):
+    """조사를 떼어 낸 명사 후보 (떼어 내고 2글자 미만이 되면 그대로)"""
+    for josa in JOSA:
+        if token.endswith(josa) and len(token) - len(josa) >= 2:
+            return token[:-len(josa)]
+    return token
+
+
+def strip_predicate(token):
+    """명사 + 하다/되다/이다 꼴이면 앞의 명사, 그 밖의 서술어면 None, 아니면 그대로"""
+    for ending in NOUN_PREDICATE_ENDINGS:
+        if token.endswith(ending):
+            stem = token[:-len(ending)]
+            return stem if len(stem) >= 2 else None
+    if token.endswith(PREDICATE_ENDINGS):
+        return None
+    return token
+
+
+def tokenize(text):
+    """검색 키워드 후보 토큰 목록 (서술어 어미/조사 제거, 불용어/1글자 제외)"""
+    tokens = []
+    for raw in TOKEN_RE.findall(text or ""):
+        token = strip_predicate(raw)
+        if token is None:
+            continue
+        token = strip_josa(token)
+        if len(token) < 2 or token.isdigit() or token in STOPWORDS:
+            continue
+        tokens.append(token)
+    return tokens
+
+
+def load_idf_stats(path=None):
+    """KEYWORD_IDF_PATH 의 {"documents", "df"} (없거나 읽을 수 없으면 None)"""
+    path = path if path is not None else getattr(settings, 'KEYWORD_IDF_PATH', '')
+    if not path:
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            stats = json.load(f)
+        return {"documents": int(stats["documents"]), "df": dict(stats["df"])}
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"⚠️ 키워드 IDF 통계 로딩 실패 ({path}), TF 만 사용: {e}")
+        return None
+
+
+def get_idf_stats():
+    """IDF 통계를 지연 로딩 (프로세스당 한 번)"""
+    global _stats
+    if _stats is None:
+        with _stats_lock:
+            if _stats is None:
+                _stats = load_idf_stats() or {"documents": 0, "df": {}}
+    return _stats
+
+
+def idf(term, stats):
+    """smooth IDF (통계가 없으면 1: 모든 단어 같은 가중치)"""
+    if not stats["documents"]:
+        return 1.0
+    return math.log((stats["documents"] + 1) / (stats["df"].get(term, 0) + 1)) + 1
+
+
+def rank_keywords(title, text):
+    """(단어, TF-IDF 점수) 목록 (점수 내림차순, 같으면 먼저 나온 순)"""
+    title_weight = float(getattr(settings, 'KEYWORD_TITLE_WEIGHT', 3))
+    body = (text or "")[:int(getattr(settings, 'KEYWORD_MAX_CHARS', 3000))]
+    title_tokens, body_tokens = tokenize(title), tokenize(body)
+    counts = Counter(body_tokens)
+    for token in title_tokens:
+        counts[token] += title_weight
+    order = {}  # 처음 나온 위치 (제목 먼저)
+    for i, token in enumerate(title_tokens + body_tokens):
+        order.setdefault(token, i)
+
+    stats = get_idf_stats()
+    scored = [(term, tf * idf(term, stats)) for term, tf in counts.items()]
+    scored.sort(key=lambda item: (-item[1], order.get(item[0], 0)))
+    return scored
+
+
+def extract_keywords(title, text, max_terms=None):
+    """검색 키워드 문자열 (GPT keywords 와 같은 형식, 뽑을 단어가 없으면 "")"""
+    max_terms = max_terms or int(getattr(settings, 'KEYWORD_MAX_TERMS', 3))
+    return " ".join(term for term, _ in rank_keywords(title, text)[:max_terms])
+
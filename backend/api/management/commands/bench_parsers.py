@@ -0,0 +1,130 @@
+"""
+기사 HTML 추출 벤치마크 (저장해 둔 HTML 픽스처 사용)
+
+    python manage.py bench_parsers
+    python manage.py bench_parsers --repeat 50 --fixtures-dir path/to/html
+
+픽스처 디렉터리의 index.json ([{"file": ..., "url": ...}]) 에 적힌 HTML 파일마다
+이전 방식(html.parser + 제목/본문, 언론사, 발행일을 각각 따로 트리 탐색)과
+api/extractors.py 의 도메인별 추출기를 설치된 파서(html.parser, lxml)별로 비교한다.
+"""
+import json
+import os
+import time
+
+from bs4 import BeautifulSoup
+from dateutil import parser as date_parser
+from django.core.management.base import BaseCommand, CommandError
+
+from api import extractors
+from api.views import get_domain_from_url
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'fixtures', 'html')
+
+
+def legacy_extract(html, url, domain):
+    """extractors.py 도입 전 구현 (비교 기준)"""
+    soup = BeautifulSoup(html, "html.parser")
+
+    title = ""
+    if soup.find('h1'):
+        title = soup.find('h1').get_text().strip()
+    if not title:
+        title_tag = soup.select_one('h2.media_end_head_headline') or soup.select_one('h3.tit_view')
+        if title_tag: title = title_tag.get_text().strip()
+    if not title:
+        og_title = soup.find('meta', {'property': 'og:title'})
+        if og_title and og_title.get('content'): title = og_title['content'].strip()
+
+    article_body = (
+        soup.select_one('div#dic_area') or soup.select_one('div.article_view') or
+        soup.select_one('section.article-body') or soup.select_one('div.news_body_id') or
+        soup.find('article')
+    )
+    if article_body:
+        for script in article_body(["script", "style", "iframe"]):
+            script.decompose()
+        text = article_body.get_text(separator=" ").strip()
+    else:
+        paragraphs = soup.find_all('p')
+        text = " ".join(p.get_text().strip() for p in paragraphs if len(p.get_text().strip()) > 30)
+
+    og = soup.find('meta', {'property': 'og:site_name'})
+    publisher = og['content'].strip() if og and og.get('content') else domain
+
+    publish_date = None
+    for attr in ['article:published_time', 'og:published_time', 'pubdate']:
+        tag = soup.find('meta', attrs={'property': attr}) or soup.find('meta', attrs={'name': attr})
+        if tag and tag.get('content'):
+            try:
+                publish_date = date_parser.parse(tag['content']).isoformat()
+                break
+            except (ValueError, OverflowError):
+                continue
+    publish_date = publish_date or extractors.extract_date_from_url(url) or extractors.DATE_NOT_FOUND
+    return title, text, publisher, publish_date
+
+
+def installed_parsers():
+    parsers = ['html.parser']
+    try:
+        import lxml  # noqa: F401
+        parsers.append('lxml')
+    except ImportError:
+        pass
+    return parsers
+
+
+def extract_with(parser_name):
+    def extract(html, url, domain):
+        soup = BeautifulSoup(html, parser_name)
+        return extractors.get_extractor(domain).extract(soup, url, domain)
+    return extract
+
+
+class Command(BaseCommand):
+    help = "기사 HTML 추출(파서 + 추출기)의 이전 방식과 현재 방식의 속도/결과를 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--fixtures-dir', default=DEFAULT_FIXTURES_DIR)
+
+    def handle(self, *args, **options):
+        fixtures_dir = options['fixtures_dir']
+        try:
+            with open(os.path.join(fixtures_dir, 'index.json'), encoding='utf-8') as f:
+                index = json.load(f)
+            pages = []
+            for entry in index:
+                with open(os.path.join(fixtures_dir, entry['file']), encoding='utf-8') as f:
+                    pages.append((entry['file'], entry['url'], f.read()))
+        except OSError as e:
+            raise CommandError(f"픽스처를 읽을 수 없습니다: {e}")
+
+        variants = [("이전 방식 (html.parser, 3회 탐색)", legacy_extract)]
+        variants += [(f"추출기 ({name})", extract_with(name)) for name in installed_parsers()]
+        if len(variants) == 2:
+            self.stdout.write("ℹ️ lxml 이 설치되어 있지 않아 html.parser 만 비교합니다 (pip install lxml)\n")
+
+        totals = {name: 0.0 for name, _ in variants}
+        for file_name, url, html in pages:
+            domain = get_domain_from_url(url)
+            self.stdout.write(
+                f"\n📄 {file_name} ({len(html.encode()) / 1024:.0f}KB, 추출기: {extractors.get_extractor(domain).name})"
+            )
+            for name, func in variants:
+                title, text, publisher, publish_date = func(html, url, domain)
+                started = time.perf_counter()
+                for _ in range(options['repeat']):
+                    func(html, url, domain)
+                per_call = (time.perf_counter() - started) * 1000 / options['repeat']
+                totals[name] += per_call
+                self.stdout.write(
+                    f"  {name:<30} {per_call:8.2f}ms/회 | 제목 {title[:20]!r} | 본문 {len(text):,}자 | "
+                    f"언론사 {publisher!r} | 발행일 {publish_date}"
+                )
+
+        baseline = totals[variants[0][0]]
+        self.stdout.write("\n합계 (픽스처 1회씩)")
+        for name, total in totals.items():
+            self.stdout.write(f"  {name:<30} {total:8.2f}ms  (x{baseline / total:.2f})")
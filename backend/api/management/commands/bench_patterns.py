@@ -0,0 +1,85 @@
+"""
+자극적 표현/광고성 패턴 검사 마이크로 벤치마크
+
+    python manage.py bench_patterns
+    python manage.py bench_patterns --chars 200000 --repeat 50
+
+긴 기사(픽스처 기사 본문을 --chars 길이까지 이어 붙임)에 대해
+예전 방식(단어마다 `in`, 패턴마다 re.search)과 컴파일된 단일 스캔 매처의 소요 시간을 비교한다.
+예전 방식은 패턴별로 첫 매치만 찾으므로, 같은 정보(모든 위치/개수)를 모으려면
+패턴마다 finditer 를 돌려야 한다 -> 이 경우도 함께 측정한다.
+"""
+import json
+import os
+import re
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.patterns import AD_DOMAINS, COMMERCIAL_PATTERNS, SENSATIONAL_WORDS, get_pattern_matchers
+from api.views import check_commercial_content, check_sensational_words
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(__file__), '..', '..', 'fixtures', 'parity_articles.json')
+
+
+def legacy_checks(title, text, url):
+    """패턴 목록을 하나씩 훑던 이전 구현 (비교 기준)"""
+    full_text = title + " " + text[:500]
+    sensational = [w for w in SENSATIONAL_WORDS if w in full_text]
+    commercial = [p for p in COMMERCIAL_PATTERNS if re.search(p, text, re.IGNORECASE)]
+    url_commercial = any(d in url.lower() for d in AD_DOMAINS)
+    return sensational, commercial, url_commercial
+
+
+def legacy_checks_with_positions(title, text, url):
+    """이전 방식으로 모든 매치 위치까지 모으는 경우 (패턴마다 본문 전체를 훑음)"""
+    full_text = title + " " + text[:500]
+    sensational = {w: [m.start() for m in re.finditer(re.escape(w), full_text)] for w in SENSATIONAL_WORDS}
+    commercial = {p: [m.start() for m in re.finditer(p, text, re.IGNORECASE)] for p in COMMERCIAL_PATTERNS}
+    url_commercial = any(d in url.lower() for d in AD_DOMAINS)
+    return [w for w, pos in sensational.items() if pos], [p for p, pos in commercial.items() if pos], url_commercial
+
+
+def compiled_checks(title, text, url):
+    sensational = check_sensational_words(title, text)
+    commercial = check_commercial_content(text, url)
+    return sensational["detected_words"], commercial["detected_patterns"], commercial["is_commercial"]
+
+
+class Command(BaseCommand):
+    help = "패턴 검사의 이전 방식과 컴파일된 단일 스캔 매처의 속도를 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chars', type=int, default=100000, help='벤치마크용 본문 길이 (글자 수)')
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--fixtures', default=DEFAULT_FIXTURES)
+
+    def handle(self, *args, **options):
+        with open(options['fixtures'], encoding='utf-8') as f:
+            articles = json.load(f)
+        body = " ".join(a['text'] for a in articles)
+        text = (body * (options['chars'] // max(len(body), 1) + 1))[:options['chars']]
+        title = articles[0]['title']
+        url = "https://news.example.com/article/1?utm_source=coupang"
+
+        get_pattern_matchers()  # 컴파일 시간은 측정에서 제외
+        variants = [
+            ("이전 방식 (패턴별 첫 매치)", legacy_checks),
+            ("이전 방식 + 위치 수집", legacy_checks_with_positions),
+            ("컴파일된 단일 스캔", compiled_checks),
+        ]
+        for name, func in variants:
+            result = func(title, text, url)
+            started = time.perf_counter()
+            for _ in range(options['repeat']):
+                func(title, text, url)
+            per_call = (time.perf_counter() - started) * 1000 / options['repeat']
+            self.stdout.write(
+                f"{name:<24} {per_call:8.2f}ms/회  (자극적 {len(result[0])}개, 광고 패턴 {len(result[1])}개)"
+            )
+
+        matches = get_pattern_matchers()["commercial"].scan(text)
+        self.stdout.write(
+            f"\n본문 {len(text):,}자 | 광고 패턴 매치 {sum(len(p) for p in matches.values()):,}건 "
+            f"(패턴 {len(matches)}종)"
+        )
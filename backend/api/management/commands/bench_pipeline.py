@@ -0,0 +1,213 @@
+"""
+분석 파이프라인 전체 벤치마크 (외부 서비스 없이, 로컬 대체 서버 사용)
+
+    python manage.py bench_pipeline
+    python manage.py bench_pipeline --requests 100 --concurrency 8 --variants plain,slow,huge
+    python manage.py bench_pipeline --llm-delay-ms 800 --warm
+
+api/bench_server.py 의 대체 서버(기사 페이지, OpenAI 호환 API, 네이버/구글 검색)를 띄우고
+OPENAI_BASE_URL / NAVER_SEARCH_URL / GOOGLE_SEARCH_URL 을 그쪽으로 바꾼 뒤
+AnalyzeView 에 --concurrency 개씩 동시에 요청해 전체/단계별 p50/p95/p99 와 초당 처리량을 출력한다.
+
+- 기본(cold): 분석/LLM/HTTP 캐시, 유사 기사 재사용, 동시 요청 합치기를 끄고 요청마다 다른 URL 을 써서
+  매 요청이 파이프라인 전체를 실행한다. --warm 이면 설정 그대로 같은 URL 을 반복한다.
+- js 변형은 Playwright(Chromium)가 있어야 본문을 얻는다. 구글 검색도 브라우저를 쓴다.
+- 로컬 분류 모델이 없으면 ai_model 단계는 기본값으로 끝난다 (그 단계 시간은 의미 없음).
+- DB 는 그대로 쓰며, 끝나면 대체 서버 도메인의 수집 전략/유사 기사 기록을 지운다.
+"""
+import json
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import RequestFactory
+
+from api import views
+from api.bench_server import VARIANTS, BenchServer
+from api.models import ArticleFingerprint, DomainFetchStrategy
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'fixtures', 'html')
+
+# cold 모드에서 끄는 설정 (요청마다 전체 파이프라인을 실행하도록)
+COLD_SETTINGS = {
+    "ANALYSIS_CACHE_TTL": 0,
+    "LLM_CACHE_TTL": 0,
+    "HTTP_CACHE_ENABLED": False,
+    "NEAR_DUPLICATE_ENABLED": False,
+    "SINGLEFLIGHT_ENABLED": False,
+}
+
+
+def percentile(sorted_values, p):
+    """nearest-rank 백분위수 (정렬된 목록)"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(values_ms):
+    values = sorted(values_ms)
+    return {
+        "n": len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "mean": sum(values) / len(values) if values else None,
+    }
+
+
+def _fmt(value):
+    return "-" if value is None else f"{value:,.0f}"
+
+
+class Command(BaseCommand):
+    help = "로컬 대체 서버로 AnalyzeView 전체 파이프라인의 지연 시간(p50/p95/p99)과 처리량을 측정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=40, help='측정할 요청 수 (워밍업 제외)')
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--warmup', type=int, default=2, help='모델 로딩 등을 위해 먼저 보내는 요청 수')
+        parser.add_argument('--variants', default='plain', help=f"기사 변형 (쉼표 구분): {', '.join(VARIANTS)}")
+        parser.add_argument('--llm-delay-ms', type=int, default=300, help='대체 OpenAI 응답 지연')
+        parser.add_argument('--search-delay-ms', type=int, default=100, help='대체 네이버/구글 응답 지연')
+        parser.add_argument('--slow-delay-ms', type=int, default=2000, help='slow 변형 기사 응답 지연')
+        parser.add_argument('--huge-kb', type=int, default=2048, help='huge 변형 기사 크기')
+        parser.add_argument('--warm', action='store_true', help='캐시/재사용/합치기 설정을 끄지 않고 같은 URL 반복')
+        parser.add_argument('--fixtures-dir', default=DEFAULT_FIXTURES_DIR)
+        parser.add_argument('--json', action='store_true', help='결과를 JSON 으로 출력')
+
+    def handle(self, *args, **options):
+        variants = [v.strip() for v in options['variants'].split(',') if v.strip()]
+        unknown = [v for v in variants if v not in VARIANTS]
+        if unknown:
+            raise CommandError(f"알 수 없는 변형: {unknown} (가능: {', '.join(VARIANTS)})")
+        try:
+            server = BenchServer(
+                options['fixtures_dir'],
+                slow_delay_ms=options['slow_delay_ms'], huge_kb=options['huge_kb'],
+                llm_delay_ms=options['llm_delay_ms'], search_delay_ms=options['search_delay_ms'],
+            )
+        except OSError as e:
+            raise CommandError(f"픽스처를 읽을 수 없습니다: {e}")
+
+        with server:
+            overrides = {
+                "OPENAI_BASE_URL": server.url("/openai/v1"),
+                "NAVER_SEARCH_URL": server.url("/naver/search.naver"),
+                "GOOGLE_SEARCH_URL": server.url("/google/search"),
+                "METRICS_ENABLED": False,  # 운영 지표에 벤치마크 요청이 섞이지 않도록
+                **({} if options['warm'] else COLD_SETTINGS),
+            }
+            previous = {name: getattr(settings, name, None) for name in overrides}
+            previous_key = os.environ.get("OPENAI_API_KEY")
+            for name, value in overrides.items():
+                setattr(settings, name, value)
+            os.environ["OPENAI_API_KEY"] = "bench"
+            views._client = None  # 대체 서버 주소로 다시 만들도록
+            try:
+                report = self.run_benchmark(server, variants, options)
+            finally:
+                for name, value in previous.items():
+                    setattr(settings, name, value)
+                if previous_key is None:
+                    os.environ.pop("OPENAI_API_KEY", None)
+                else:
+                    os.environ["OPENAI_API_KEY"] = previous_key
+                views._client = None
+                self.cleanup(server)
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, ensure_ascii=False, indent=2))
+        else:
+            self.print_report(report, options)
+
+    def run_benchmark(self, server, variants, options):
+        view = views.AnalyzeView.as_view(throttle_classes=[])
+        factory = RequestFactory()
+        urls = [url for variant in variants for url in server.article_urls(variant)]
+
+        def analyze(i):
+            url = urls[i % len(urls)]
+            if not options['warm']:
+                url = f"{url}?n={i}"  # 요청마다 다른 URL
+            request = factory.post('/api/analyze/', data=json.dumps({"url": url}), content_type='application/json')
+            started = time.perf_counter()
+            try:
+                response = view(request)
+                payload = json.loads(response.content)
+            finally:
+                connections.close_all()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            variant = url.split("/articles/")[1].split("/")[0]
+            data = payload.get("data") or {}
+            return {
+                "variant": variant,
+                "status": response.status_code,
+                "elapsed_ms": elapsed_ms,
+                "stage_timings": data.get("stage_timings", {}),
+                "error": None if payload.get("success") else payload.get("error", {}).get("message"),
+            }
+
+        for i in range(options['warmup']):
+            analyze(-1 - i)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, options['concurrency']), thread_name_prefix="bench") as executor:
+            results = list(executor.map(analyze, range(options['requests'])))
+        wall_seconds = time.perf_counter() - started
+
+        ok = [r for r in results if r["status"] == 200]
+        stage_values = {}
+        for r in ok:
+            for stage, ms in r["stage_timings"].items():
+                stage_values.setdefault(stage, []).append(ms)
+        errors = {}
+        for r in results:
+            if r["error"]:
+                errors[r["error"]] = errors.get(r["error"], 0) + 1
+
+        return {
+            "requests": len(results),
+            "succeeded": len(ok),
+            "concurrency": options['concurrency'],
+            "wall_seconds": round(wall_seconds, 2),
+            "requests_per_second": round(len(ok) / wall_seconds, 2) if wall_seconds else None,
+            "latency_ms": summarize([r["elapsed_ms"] for r in ok]),
+            "variants": {
+                v: summarize([r["elapsed_ms"] for r in ok if r["variant"] == v]) for v in variants
+            },
+            "stages_ms": {stage: summarize(values) for stage, values in stage_values.items()},
+            "errors": errors,
+            "stub_requests": dict(server.counts),
+        }
+
+    def cleanup(self, server):
+        host = f"127.0.0.1:{server.port}"
+        DomainFetchStrategy.objects.filter(domain=host).delete()
+        ArticleFingerprint.objects.filter(canonical_url__startswith=f"{host}/").delete()
+
+    def print_report(self, report, options):
+        mode = "warm (설정 그대로)" if options['warm'] else "cold (캐시/재사용/합치기 끔)"
+        self.stdout.write(
+            f"\n📊 {report['succeeded']}/{report['requests']}건 성공 | 동시 {report['concurrency']} | {mode}\n"
+            f"   {report['wall_seconds']}초, {report['requests_per_second']} req/s\n"
+        )
+        header = f"  {'':<18} {'n':>5} {'p50':>8} {'p95':>8} {'p99':>8} {'mean':>8}  (ms)"
+        rows = [("전체", report["latency_ms"])]
+        rows += [(f"변형:{v}", s) for v, s in report["variants"].items() if len(report["variants"]) > 1]
+        rows += [(stage, s) for stage, s in report["stages_ms"].items()]
+        self.stdout.write(header)
+        for name, s in rows:
+            self.stdout.write(
+                f"  {name:<18} {s['n']:>5} {_fmt(s['p50']):>8} {_fmt(s['p95']):>8} {_fmt(s['p99']):>8} {_fmt(s['mean']):>8}"
+            )
+        if report["errors"]:
+            self.stdout.write("\n⚠️ 실패")
+            for message, count in report["errors"].items():
+                self.stdout.write(f"  {count}건: {message.splitlines()[0]}")
+        self.stdout.write(f"\n대체 서버 요청 수: {report['stub_requests']}")
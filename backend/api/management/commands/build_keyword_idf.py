@@ -0,0 +1,83 @@
+"""
+뉴스 말뭉치에서 키워드 추출용 IDF 통계 파일 만들기 (api/keywords.py)
+
+    python manage.py build_keyword_idf corpus.jsonl --output keyword_idf.json
+    python manage.py build_keyword_idf articles/ --min-df 3
+
+입력 (파일 또는 디렉터리, 여러 개 가능)
+- .jsonl: 한 줄에 기사 하나 {"title": ..., "text": ...}
+- .txt  : 파일 하나가 기사 하나
+- .html : 저장된 기사 페이지 (api/extractors.py 로 제목/본문 추출)
+
+문서마다 api/keywords.tokenize 로 나눈 단어의 문서 빈도(df)를 세어
+{"documents": 문서 수, "df": {"단어": df}} 로 저장한다. 만든 파일은 KEYWORD_IDF_PATH 로 지정한다.
+"""
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.extractors import extract_article
+from api.keywords import tokenize
+
+EXTENSIONS = ('.jsonl', '.txt', '.html')
+
+
+class Command(BaseCommand):
+    help = "뉴스 말뭉치의 단어별 문서 빈도로 키워드 추출용 IDF 통계 파일을 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='.jsonl/.txt/.html 파일 또는 디렉터리')
+        parser.add_argument('--output', default='', help='저장 경로 (기본: KEYWORD_IDF_PATH)')
+        parser.add_argument('--min-df', type=int, default=2, help='이보다 적은 문서에 나온 단어는 저장하지 않음')
+
+    def handle(self, *args, **options):
+        output = options['output'] or getattr(settings, 'KEYWORD_IDF_PATH', '')
+        if not output:
+            raise CommandError("--output 또는 KEYWORD_IDF_PATH 를 지정하세요.")
+
+        documents = 0
+        df = {}
+        for title, text in self.iter_documents(options['paths']):
+            documents += 1
+            for term in set(tokenize(f"{title}\n{text}")):
+                df[term] = df.get(term, 0) + 1
+        if not documents:
+            raise CommandError("읽은 문서가 없습니다.")
+
+        kept = {term: count for term, count in df.items() if count >= options['min_df']}
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump({"documents": documents, "df": kept}, f, ensure_ascii=False)
+        self.stdout.write(self.style.SUCCESS(
+            f"문서 {documents}개, 단어 {len(kept)}개 (전체 {len(df)}개 중 df >= {options['min_df']}) -> {output}"
+        ))
+
+    def iter_files(self, paths):
+        for path in paths:
+            if os.path.isdir(path):
+                for root, _, names in os.walk(path):
+                    for name in sorted(names):
+                        if name.endswith(EXTENSIONS):
+                            yield os.path.join(root, name)
+            elif os.path.isfile(path):
+                yield path
+            else:
+                raise CommandError(f"파일을 찾을 수 없습니다: {path}")
+
+    def iter_documents(self, paths):
+        """(제목, 본문) 을 하나씩"""
+        for path in self.iter_files(paths):
+            with open(path, encoding='utf-8', errors='replace') as f:
+                if path.endswith('.jsonl'):
+                    for line in f:
+                        try:
+                            doc = json.loads(line)
+                        except ValueError:
+                            continue
+                        yield doc.get("title", ""), doc.get("text", "")
+                elif path.endswith('.html'):
+                    title, text, _, _ = extract_article(f.read(), path, "")
+                    yield title or "", text or ""
+                else:
+                    yield "", f.read()
@@ -0,0 +1,69 @@
+"""
+추론 백엔드 결과가 fp32 PyTorch 모델과 같은지 확인
+
+    python manage.py check_model_parity --backend onnx-int8
+    python manage.py check_model_parity --backend int8 --tolerance 0.03
+
+픽스처(api/fixtures/parity_articles.json)의 기사마다 p_true 차이와 예측 라벨 일치 여부를 출력하고,
+최대 차이가 tolerance 를 넘거나 라벨이 하나라도 달라지면 실패(종료 코드 1)로 끝난다.
+"""
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.inference import BACKENDS, MODEL_PATH, BatchingClassifier, load_backend
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(__file__), '..', '..', 'fixtures', 'parity_articles.json')
+
+
+class Command(BaseCommand):
+    help = "fp32 모델과 다른 추론 백엔드의 확률 차이를 픽스처 기사로 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backend', choices=BACKENDS, required=True)
+        parser.add_argument('--model-path', default=MODEL_PATH)
+        parser.add_argument('--fixtures', default=DEFAULT_FIXTURES)
+        parser.add_argument('--tolerance', type=float, default=0.02, help='허용하는 p_true 최대 차이')
+
+    def handle(self, *args, **options):
+        from transformers import AutoTokenizer
+
+        with open(options['fixtures'], encoding='utf-8') as f:
+            articles = json.load(f)
+        texts = [f"{a['title']} [SEP] {a['text']}" for a in articles]
+
+        try:
+            tokenizer = AutoTokenizer.from_pretrained(options['model_path'])
+            reference = BatchingClassifier(load_backend("torch", options['model_path']), tokenizer, max_batch_size=1)
+            candidate = BatchingClassifier(load_backend(options['backend'], options['model_path']), tokenizer, max_batch_size=1)
+        except Exception as e:
+            raise CommandError(f"모델/백엔드 로딩 실패: {e}")
+
+        ref_probs, ref_ms = self._score(reference, texts)
+        new_probs, new_ms = self._score(candidate, texts)
+
+        diffs = []
+        label_mismatch = 0
+        for article, ref, new in zip(articles, ref_probs, new_probs):
+            diff = abs(ref[0] - new[0])
+            same_label = (ref[0] >= ref[1]) == (new[0] >= new[1])
+            diffs.append(diff)
+            label_mismatch += 0 if same_label else 1
+            mark = "" if same_label else "  ← 라벨 다름"
+            self.stdout.write(f"{article['title'][:30]:<30}  fp32={ref[0]:.4f}  {options['backend']}={new[0]:.4f}  diff={diff:.4f}{mark}")
+
+        max_diff = max(diffs)
+        self.stdout.write(
+            f"\n기사 {len(texts)}개 | 최대 차이 {max_diff:.4f} | 평균 차이 {sum(diffs) / len(diffs):.4f} | "
+            f"라벨 불일치 {label_mismatch}개 | 소요 fp32 {ref_ms:.0f}ms / {options['backend']} {new_ms:.0f}ms"
+        )
+        if max_diff > options['tolerance'] or label_mismatch:
+            raise CommandError(f"parity 실패 (허용 차이 {options['tolerance']})")
+        self.stdout.write(self.style.SUCCESS("✅ parity 통과"))
+
+    def _score(self, classifier, texts):
+        started = time.perf_counter()
+        probs = [classifier.predict_proba([classifier.encode(t)])[0] for t in texts]
+        return probs, (time.perf_counter() - started) * 1000
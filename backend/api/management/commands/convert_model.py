@@ -0,0 +1,65 @@
+"""
+로컬 분류 모델을 ONNX 로 변환 (INFERENCE_BACKEND=onnx / onnx-int8 용)
+
+    python manage.py convert_model              # {MODEL_DIRECTORY}/onnx/model.onnx
+    python manage.py convert_model --quantize   # + model.int8.onnx (동적 int8 양자화)
+
+변환 후 python manage.py check_model_parity --backend onnx 로 확률 차이를 확인하세요.
+"""
+import inspect
+import os
+
+import torch
+from django.core.management.base import BaseCommand, CommandError
+from transformers import AutoTokenizer
+
+from api.inference import MODEL_PATH, load_torch_model, onnx_model_path
+
+
+class Command(BaseCommand):
+    help = "로컬 분류 모델을 ONNX(및 int8 양자화 ONNX)로 변환합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model-path', default=MODEL_PATH)
+        parser.add_argument('--quantize', action='store_true', help='int8 동적 양자화 모델도 함께 생성')
+        parser.add_argument('--opset', type=int, default=17)
+
+    def handle(self, *args, **options):
+        model_path = options['model_path']
+        try:
+            tokenizer = AutoTokenizer.from_pretrained(model_path)
+            model = load_torch_model(model_path)
+        except Exception as e:
+            raise CommandError(f"모델 로딩 실패 ({model_path}): {e}")
+
+        output_path = onnx_model_path(model_path)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+        sample = tokenizer(["샘플 기사 제목 [SEP] 샘플 본문입니다.", "짧은 문장"], padding=True, return_tensors="pt")
+        # ONNX 그래프 입력 순서는 forward() 인자 순서를 따르므로 이름도 그 순서로 맞춘다
+        input_names = [name for name in inspect.signature(model.forward).parameters if name in sample]
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["logits"] = {0: "batch"}
+
+        self.stdout.write(f"ONNX 변환 중: {output_path}")
+        torch.onnx.export(
+            model, (), output_path,
+            kwargs={name: sample[name] for name in input_names},
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=options['opset'],
+            dynamo=False,
+        )
+        self.stdout.write(self.style.SUCCESS(f"✅ ONNX 저장 ({os.path.getsize(output_path) / 1e6:.1f}MB)"))
+
+        if options['quantize']:
+            try:
+                from onnxruntime.quantization import QuantType, quantize_dynamic
+            except ImportError:
+                raise CommandError("onnxruntime 이 설치되어 있지 않습니다 (pip install onnxruntime)")
+            quantized_path = onnx_model_path(model_path, quantized=True)
+            quantize_dynamic(output_path, quantized_path, weight_type=QuantType.QInt8)
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ int8 ONNX 저장: {quantized_path} ({os.path.getsize(quantized_path) / 1e6:.1f}MB)"
+            ))
@@ -0,0 +1,107 @@
+"""
+CSV 로 언론사 신뢰도 목록을 한꺼번에 등록/수정
+
+    python manage.py import_media_outlets outlets.csv
+    python manage.py import_media_outlets outlets.csv --replace   # 파일에 없는 언론사는 삭제
+    python manage.py import_media_outlets outlets.csv --dry-run
+
+CSV 형식 (첫 줄은 헤더, name 만 필수):
+    name,domain,aliases,rank,score,category
+    KBS,kbs.co.kr,한국방송;KBS뉴스,1,95,공영방송
+
+- aliases 는 ';' 또는 '|' 로 구분하며, '.' 이 들어간 별칭은 추가 도메인으로도 쓰인다.
+- 정규화된 이름(normalize_publisher_name)이 같으면 같은 언론사로 보고 덮어쓴다.
+- 실행 중인 워커들은 MEDIA_REGISTRY_CHECK_INTERVAL 초 안에 변경 사항을 반영한다.
+"""
+import csv
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from api.media_registry import media_registry, normalize_domain, normalize_publisher_name
+from api.models import MediaOutlet
+
+FIELDS = ['name', 'domain', 'aliases', 'rank', 'score', 'category', 'normalized_name', 'updated_at']
+
+
+class Command(BaseCommand):
+    help = "CSV 파일의 언론사 신뢰도 목록을 MediaOutlet 테이블에 반영합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path')
+        parser.add_argument('--replace', action='store_true', help='CSV 에 없는 언론사 삭제')
+        parser.add_argument('--dry-run', action='store_true', help='DB 에 쓰지 않고 결과만 출력')
+        parser.add_argument('--encoding', default='utf-8-sig')
+
+    def handle(self, *args, **options):
+        rows = self._read_rows(options['csv_path'], options['encoding'])
+        now = timezone.now()
+        existing = {o.normalized_name: o for o in MediaOutlet.objects.all()}
+
+        to_create, to_update = [], []
+        for row in rows.values():
+            outlet = existing.get(row['normalized_name'])
+            if outlet is None:
+                to_create.append(MediaOutlet(**row, updated_at=now))
+                continue
+            if any(getattr(outlet, field) != value for field, value in row.items()):
+                for field, value in row.items():
+                    setattr(outlet, field, value)
+                outlet.updated_at = now  # bulk_update 는 auto_now 를 채우지 않으므로 직접 갱신
+                to_update.append(outlet)
+
+        to_delete = [k for k in existing if k not in rows] if options['replace'] else []
+
+        self.stdout.write(
+            f"CSV {len(rows)}개 | 추가 {len(to_create)} | 수정 {len(to_update)} | 삭제 {len(to_delete)} | "
+            f"변경 없음 {len(rows) - len(to_create) - len(to_update)}"
+        )
+        if options['dry_run']:
+            return
+
+        with transaction.atomic():
+            MediaOutlet.objects.bulk_create(to_create, batch_size=500)
+            MediaOutlet.objects.bulk_update(to_update, FIELDS, batch_size=500)
+            if to_delete:
+                MediaOutlet.objects.filter(normalized_name__in=to_delete).delete()
+        media_registry.invalidate()
+        self.stdout.write(self.style.SUCCESS("✅ 언론사 목록 반영 완료"))
+
+    def _read_rows(self, path, encoding):
+        """Returns: {정규화된 이름: 필드 dict} (같은 이름이 여러 번 나오면 마지막 줄 사용)"""
+        try:
+            with open(path, newline='', encoding=encoding) as f:
+                reader = csv.DictReader(f)
+                if not reader.fieldnames or 'name' not in reader.fieldnames:
+                    raise CommandError("CSV 헤더에 name 컬럼이 필요합니다")
+                lines = list(reader)
+        except OSError as e:
+            raise CommandError(f"CSV 파일을 열 수 없습니다: {e}")
+
+        rows = {}
+        for line_no, line in enumerate(lines, start=2):
+            name = (line.get('name') or '').strip()
+            normalized = normalize_publisher_name(name)
+            if not normalized:
+                self.stderr.write(f"{line_no}번째 줄: name 이 비어 있어 건너뜀")
+                continue
+            try:
+                rank = int(line['rank']) if (line.get('rank') or '').strip() else None
+                score = int(line['score']) if (line.get('score') or '').strip() else 60
+            except ValueError:
+                raise CommandError(f"{line_no}번째 줄: rank/score 는 정수여야 합니다 ({line})")
+            if not 0 <= score <= 100:
+                raise CommandError(f"{line_no}번째 줄: score 는 0~100 이어야 합니다 ({score})")
+
+            rows[normalized] = {
+                'name': name,
+                'normalized_name': normalized,
+                'domain': normalize_domain(line.get('domain')),
+                'aliases': [a.strip() for a in re.split(r'[;|]', line.get('aliases') or '') if a.strip()],
+                'rank': rank,
+                'score': score,
+                'category': (line.get('category') or '').strip(),
+            }
+        return rows
@@ -0,0 +1,96 @@
+"""
+워커별 메모리 비교: 워커마다 모델 로딩 vs 마스터에서 preload 후 fork (copy-on-write 공유)
+
+    python manage.py model_memory_report --workers 4
+
+gunicorn 과 같은 방식으로 자식 프로세스를 fork 하고, 각 자식이 한 번 추론한 뒤
+/proc/self/smaps_rollup 기준 RSS/PSS/공유/전용 메모리를 보고한다. (Linux 전용)
+"""
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import inference
+
+
+def _child_report(write_fd, load_in_child):
+    """자식 프로세스: (필요하면 모델 로딩) -> 한 번 추론 -> 메모리 기록 후 종료"""
+    try:
+        if load_in_child:
+            inference.load_model()
+        inference.get_fake_news_prediction("메모리 측정용 제목", "메모리 측정용 본문입니다. " * 50)
+        report = inference.process_memory_mb()
+    except Exception as e:
+        report = {"error": str(e)}
+    os.write(write_fd, json.dumps(report).encode())
+    os._exit(0)
+
+
+def _spawn_workers(count, load_in_child):
+    reports = []
+    children = []
+    for _ in range(count):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            _child_report(write_fd, load_in_child)
+        os.close(write_fd)
+        children.append((pid, read_fd))
+
+    for pid, read_fd in children:
+        chunks = []
+        while True:
+            chunk = os.read(read_fd, 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+        reports.append(json.loads(b"".join(chunks) or b"{}"))
+    return reports
+
+
+class Command(BaseCommand):
+    help = "모델 로딩 방식(worker / preload)별 워커 메모리(RSS/PSS)를 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=3)
+
+    def handle(self, *args, **options):
+        if inference.process_memory_mb() is None or not hasattr(os, "fork"):
+            raise CommandError("Linux(/proc/self/smaps_rollup, fork) 환경에서만 측정할 수 있습니다.")
+        if inference._load_attempted:
+            raise CommandError("이미 모델이 로딩된 프로세스입니다. 새 프로세스에서 실행하세요.")
+
+        workers = options['workers']
+        # 1) 워커마다 로딩 (부모는 모델 없음) -> 2) 부모가 preload 후 fork
+        results = {"worker": _spawn_workers(workers, load_in_child=True)}
+        inference.prepare_for_fork()
+        if inference.backend is None:
+            raise CommandError("모델 로딩 실패 (MODEL_DIRECTORY 확인)")
+        master = inference.process_memory_mb()
+        results["preload"] = _spawn_workers(workers, load_in_child=False)
+
+        self.stdout.write(f"워커 {workers}개, backend={inference.backend.name} (단위 MB)\n")
+        self.stdout.write(f"{'mode':<8} {'worker':>6} {'RSS':>9} {'PSS':>9} {'shared':>9} {'private':>9}")
+        for mode, reports in results.items():
+            for i, r in enumerate(reports):
+                if "error" in r:
+                    self.stdout.write(f"{mode:<8} {i:>6}  오류: {r['error']}")
+                    continue
+                self.stdout.write(f"{mode:<8} {i:>6} {r['rss']:>9} {r['pss']:>9} {r['shared']:>9} {r['private']:>9}")
+
+        self.stdout.write("")
+        for mode, reports in results.items():
+            ok = [r for r in reports if "error" not in r]
+            if not ok:
+                continue
+            avg_rss = sum(r['rss'] for r in ok) / len(ok)
+            avg_private = sum(r['private'] for r in ok) / len(ok)
+            total_pss = sum(r['pss'] for r in ok)
+            self.stdout.write(
+                f"{mode:<8} 평균 RSS {avg_rss:.1f} / 평균 전용(private) {avg_private:.1f} / 워커 PSS 합계 {total_pss:.1f}"
+            )
+        self.stdout.write(f"(preload 마스터: {master})")
@@ -0,0 +1,85 @@
+"""
+비동기 분석 작업(AnalysisJob) 실행 프로세스
+
+    python manage.py run_analysis_workers                 # JOB_WORKER_PROCESSES 개 프로세스
+    python manage.py run_analysis_workers --processes 4
+    python manage.py run_analysis_workers --once          # 대기열이 빌 때까지만 처리하고 종료
+
+각 프로세스가 api/jobs.py 의 worker_loop 를 돌며 작업을 하나씩 가져가 실행한다.
+SIGTERM/SIGINT 를 받으면 실행 중인 작업을 마친 뒤 종료하고,
+비정상 종료된 자식 프로세스는 다시 띄운다.
+"""
+import multiprocessing
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from api.jobs import worker_loop
+
+_stop_requested = False
+
+
+def _request_stop(signum, frame):
+    global _stop_requested
+    _stop_requested = True
+
+
+def _should_stop():
+    return _stop_requested
+
+
+def _child_main(poll_interval, exit_when_empty):
+    signal.signal(signal.SIGTERM, _request_stop)
+    signal.signal(signal.SIGINT, _request_stop)
+    worker_loop(_should_stop, poll_interval=poll_interval, exit_when_empty=exit_when_empty)
+
+
+class Command(BaseCommand):
+    help = "분석 작업 대기열(AnalysisJob)을 처리하는 워커 프로세스를 실행합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=getattr(settings, 'JOB_WORKER_PROCESSES', 2))
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='대기열이 비었을 때 확인 간격(초)')
+        parser.add_argument('--once', action='store_true', help='대기열이 비면 종료')
+
+    def handle(self, *args, **options):
+        signal.signal(signal.SIGTERM, _request_stop)
+        signal.signal(signal.SIGINT, _request_stop)
+        processes = max(1, options['processes'])
+        args = (options['poll_interval'], options['once'])
+
+        if processes == 1:
+            _child_main(*args)
+            return
+
+        # 부모가 연 DB 연결을 자식이 물려받지 않도록 fork 전에 닫는다
+        connections.close_all()
+        children = [self._spawn(args) for _ in range(processes)]
+        self.stdout.write(f"분석 워커 {processes}개 실행 중 (pid: {[c.pid for c in children]})")
+
+        while not _stop_requested:
+            time.sleep(1)
+            for i, child in enumerate(children):
+                if child.is_alive():
+                    continue
+                if options['once'] and child.exitcode == 0:
+                    continue
+                self.stderr.write(f"⚠️ 워커 {child.pid} 종료 (exit {child.exitcode}), 다시 실행합니다")
+                children[i] = self._spawn(args)
+            if options['once'] and not any(c.is_alive() for c in children):
+                break
+
+        for child in children:
+            if child.is_alive():
+                child.terminate()  # SIGTERM -> 실행 중인 작업을 마치고 종료
+        for child in children:
+            child.join()
+
+    def _spawn(self, args):
+        # 자식은 이미 설정된 Django 를 그대로 물려받아야 하므로 fork 사용
+        child = multiprocessing.get_context('fork').Process(target=_child_main, args=args, daemon=False)
+        child.start()
+        return child
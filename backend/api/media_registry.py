@@ -0,0 +1,192 @@
+"""
+언론사 신뢰도 레지스트리 (MediaOutlet 테이블 + 워커별 메모리 인덱스)
+
+og:site_name 문자열로 MEDIA_TRUST_DB 를 처음부터 끝까지 부분 문자열 검색하던 방식 대신
+도메인 / 정규화된 이름 / 별칭을 키로 하는 dict 인덱스를 만들어 몇 번의 dict 조회로 찾는다.
+(언론사가 수천 개여도 조회 비용은 같다)
+
+- 조회 순서: 기사 도메인(서브도메인 -> 상위 도메인) -> 언론사 이름(전체, "|" 등으로 나눈 부분,
+  "뉴스/신문/닷컴" 같은 접미사를 뗀 형태) -> 언론사 대표 이름으로 시작하거나 끝나는 경우 가장 긴 것
+  (예전 부분 문자열 검색처럼 "연합뉴스TV", "KBS World", "부산MBC" 같은 변형도 찾는다.
+   별칭("한경", "매경" 등)은 짧아서 "대한경제", "매경이코노미" 같은 다른 매체에 걸리므로 쓰지 않는다.
+   이름 길이만큼 앞/뒤 부분을 dict 에서 찾으므로 언론사 수와 무관하다)
+- 인덱스는 워커마다 메모리에 두고, MEDIA_REGISTRY_CHECK_INTERVAL 초마다 DB 의
+  (행 수, 최신 updated_at) 을 확인해 바뀌었으면 다시 만든다 -> 관리자 화면이나
+  import_media_outlets 명령으로 수정하면 재배포/재시작 없이 모든 워커에 반영된다.
+- 같은 프로세스에서 저장/삭제하면 post_save/post_delete 시그널로 즉시 무효화한다.
+- migrate 전이라 테이블이 없으면 DEFAULT_MEDIA_OUTLETS 로 동작한다.
+
+주의: QuerySet.update() 는 updated_at 을 바꾸지 않으므로 다른 워커가 변경을 알아채지 못한다.
+      수정은 save() / 관리자 화면 / import_media_outlets 로 한다.
+"""
+import re
+import threading
+import time
+import unicodedata
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Count, F, Max
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import MediaOutlet
+
+# 기본 언론사 목록 (migrations/0002_mediaoutlet 의 초기 데이터와 같음)
+DEFAULT_MEDIA_OUTLETS = [
+    {"name": "KBS", "domain": "kbs.co.kr", "aliases": ["한국방송"], "rank": 1, "score": 95, "category": "공영방송"},
+    {"name": "MBC", "domain": "imbc.com", "aliases": ["문화방송"], "rank": 2, "score": 92, "category": "공영방송"},
+    {"name": "SBS", "domain": "sbs.co.kr", "aliases": [], "rank": 3, "score": 88, "category": "지상파"},
+    {"name": "YTN", "domain": "ytn.co.kr", "aliases": [], "rank": 4, "score": 85, "category": "뉴스전문"},
+    {"name": "JTBC", "domain": "jtbc.co.kr", "aliases": ["jtbc.joins.com"], "rank": 5, "score": 82, "category": "종편"},
+    {"name": "연합뉴스", "domain": "yna.co.kr", "aliases": ["Yonhap"], "rank": 6, "score": 90, "category": "통신사"},
+    {"name": "뉴스1", "domain": "news1.kr", "aliases": ["News1"], "rank": 7, "score": 80, "category": "통신사"},
+    {"name": "조선일보", "domain": "chosun.com", "aliases": ["조선닷컴", "Chosun"], "rank": 8, "score": 75, "category": "종합일간지"},
+    {"name": "중앙일보", "domain": "joongang.co.kr", "aliases": ["JoongAng", "joins.com"], "rank": 9, "score": 75, "category": "종합일간지"},
+    {"name": "동아일보", "domain": "donga.com", "aliases": ["동아닷컴"], "rank": 10, "score": 75, "category": "종합일간지"},
+    {"name": "한겨레", "domain": "hani.co.kr", "aliases": ["한겨레신문"], "rank": 11, "score": 75, "category": "종합일간지"},
+    {"name": "경향신문", "domain": "khan.co.kr", "aliases": ["경향"], "rank": 12, "score": 75, "category": "종합일간지"},
+    {"name": "한국경제", "domain": "hankyung.com", "aliases": ["한경", "한국경제신문"], "rank": 13, "score": 70, "category": "경제지"},
+    {"name": "매일경제", "domain": "mk.co.kr", "aliases": ["매경", "매일경제신문"], "rank": 14, "score": 70, "category": "경제지"},
+]
+
+# 이름 끝에 붙어도 같은 언론사로 보는 접미사 (정규화 후 기준, 예: "KBS 뉴스" -> "kbs")
+NAME_SUFFIXES = ("뉴스", "신문", "닷컴", "온라인", "news", "online")
+
+# og:site_name 에서 언론사 이름과 부가 설명을 나누는 구분자 (예: "조선일보 | 뉴스")
+NAME_SEPARATORS = re.compile(r"\s*[|·:–—]\s*|\s+-\s+")
+
+# 앞/뒤 일치 검색에 쓰는 대표 이름의 최소 길이 (정규화 후, 너무 짧으면 엉뚱한 이름에 걸린다)
+PARTIAL_MATCH_MIN_LENGTH = 2
+
+
+def normalize_publisher_name(name):
+    """대소문자, 전각/반각, 공백, 문장부호 차이를 없앤 비교용 이름"""
+    name = unicodedata.normalize("NFKC", name or "").lower()
+    return re.sub(r"[\W_]+", "", name)
+
+
+def normalize_domain(domain):
+    domain = (domain or "").strip().lower().rstrip(".")
+    return domain[4:] if domain.startswith("www.") else domain
+
+
+def _domain_candidates(domain):
+    """news.kbs.co.kr -> [news.kbs.co.kr, kbs.co.kr, co.kr]"""
+    labels = normalize_domain(domain).split(".")
+    return [".".join(labels[i:]) for i in range(len(labels) - 1)]
+
+
+def _name_candidates(publisher_name):
+    """전체 이름, 구분자로 나눈 부분, 접미사를 뗀 형태 순서로 정규화된 후보 이름"""
+    candidates = []
+    for part in [publisher_name] + NAME_SEPARATORS.split(publisher_name or ""):
+        normalized = normalize_publisher_name(part)
+        if not normalized:
+            continue
+        candidates.append(normalized)
+        for suffix in NAME_SUFFIXES:
+            if normalized.endswith(suffix) and len(normalized) > len(suffix):
+                candidates.append(normalized[:-len(suffix)])
+    return list(dict.fromkeys(candidates))
+
+
+def build_index(outlets):
+    """
+    MediaOutlet 목록으로 조회용 인덱스를 만든다 (같은 키는 순서상 앞의 언론사가 우선)
+    Returns: {"by_domain": {도메인: 정보}, "by_name": {정규화된 이름/별칭: 정보},
+              "by_canonical": {정규화된 대표 이름: 정보} (앞/뒤 일치 검색용)}
+    """
+    by_domain, by_name, by_canonical = {}, {}, {}
+    for outlet in outlets:
+        info = {"name": outlet.name, "rank": outlet.rank, "score": outlet.score, "category": outlet.category}
+        if outlet.domain:
+            by_domain.setdefault(normalize_domain(outlet.domain), info)
+        canonical = normalize_publisher_name(outlet.name)
+        by_name.setdefault(canonical, info)
+        if len(canonical) >= PARTIAL_MATCH_MIN_LENGTH:
+            by_canonical.setdefault(canonical, info)
+        for alias in outlet.aliases or []:
+            if "." in alias:
+                by_domain.setdefault(normalize_domain(alias), info)
+            by_name.setdefault(normalize_publisher_name(alias), info)
+    return {"by_domain": by_domain, "by_name": by_name, "by_canonical": by_canonical}
+
+
+def _partial_match(normalized, by_canonical):
+    """정규화된 이름이 대표 이름으로 시작하거나 끝나면 그 중 가장 긴 것 (앞 일치 우선)"""
+    for length in range(len(normalized) - 1, PARTIAL_MATCH_MIN_LENGTH - 1, -1):
+        for part in (normalized[:length], normalized[-length:]):
+            if part in by_canonical:
+                return by_canonical[part]
+    return None
+
+
+class MediaRegistry:
+    """워커별 언론사 인덱스 (DB 변경 여부를 주기적으로 확인해 다시 만든다)"""
+
+    def __init__(self):
+        self._index = None
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def lookup(self, publisher_name, domain=None):
+        """
+        Returns: (언론사 정보 dict, "domain" | "name" | "partial") / 못 찾으면 (None, None)
+        """
+        index = self._current_index()
+        domains = [domain] if domain else []
+        if publisher_name and "." in publisher_name and " " not in publisher_name.strip():
+            domains.append(publisher_name)  # og:site_name 이 없으면 publisher_name 이 도메인
+        for d in domains:
+            for candidate in _domain_candidates(d):
+                if candidate in index["by_domain"]:
+                    return index["by_domain"][candidate], "domain"
+        for candidate in _name_candidates(publisher_name):
+            if candidate in index["by_name"]:
+                return index["by_name"][candidate], "name"
+        outlet = _partial_match(normalize_publisher_name(publisher_name), index["by_canonical"])
+        if outlet:
+            return outlet, "partial"
+        return None, None
+
+    def invalidate(self):
+        """다음 조회 때 DB 에서 다시 읽도록 표시"""
+        self._version = None
+        self._checked_at = 0.0
+
+    def stats(self):
+        index = self._current_index()
+        return {"domains": len(index["by_domain"]), "names": len(index["by_name"]), "version": str(self._version)}
+
+    def _current_index(self):
+        interval = float(getattr(settings, 'MEDIA_REGISTRY_CHECK_INTERVAL', 30))
+        if self._index is not None and time.monotonic() - self._checked_at < interval:
+            return self._index
+
+        with self._lock:
+            if self._index is not None and time.monotonic() - self._checked_at < interval:
+                return self._index
+            try:
+                stats = MediaOutlet.objects.aggregate(count=Count('id'), latest=Max('updated_at'))
+                version = (stats['count'], stats['latest'])
+                if version != self._version or self._index is None:
+                    outlets = MediaOutlet.objects.order_by(F('rank').asc(nulls_last=True), 'name')
+                    self._index = build_index(outlets)
+                    self._version = version
+                    print(f"📰 언론사 레지스트리 로딩 ({stats['count']}개)")
+            except DatabaseError as e:
+                if self._index is None:
+                    print(f"⚠️ 언론사 테이블을 읽지 못해 기본 목록 사용 (migrate 필요?): {e}")
+                    self._index = build_index(MediaOutlet(**outlet) for outlet in DEFAULT_MEDIA_OUTLETS)
+            self._checked_at = time.monotonic()
+            return self._index
+
+
+media_registry = MediaRegistry()
+
+
+@receiver([post_save, post_delete], sender=MediaOutlet)
+def _invalidate_media_registry(sender, **kwargs):
+    media_registry.invalidate()
@@ -0,0 +1,270 @@
+"""
+처리 시간/오류/캐시 적중 지표 (Prometheus 텍스트 형식, GET /api/metrics)
+
+느린 요청이 requests 수집, Playwright, GPT, 로컬 모델, 네이버/구글 검색, 크로스체크 중
+어디서 시간을 썼는지 보기 위한 지표를 모은다.
+
+- 각 프로세스(gunicorn 워커, 분석 작업 프로세스)는 지표를 메모리에 모으고, 값이 바뀌면
+  METRICS_FLUSH_SECONDS 안에 METRICS_DIR/<호스트>-<pid>.json 으로 저장한다 (임시 파일에 쓰고 os.replace).
+- /api/metrics 는 디렉터리의 파일을 모두 더해 응답하므로 어느 워커가 받아도 전체 합계가 나온다.
+- 끝난 워커의 파일도 지우지 않는다 (카운터가 줄어들지 않도록). gunicorn 마스터가 시작할 때 비운다.
+- 기록은 메모리만 건드리므로 요청 처리 중 파일 I/O 는 없다. 저장 실패 시 지표만 빠지고 분석은 계속된다.
+
+    metrics.observe("analysis_stage_duration_seconds", 1.2, stage="gpt")
+    metrics.inc("cache_requests_total", cache="llm", result="hit")
+"""
+import atexit
+import json
+import os
+import socket
+import threading
+
+from django.conf import settings
+
+PREFIX = "infomate_"
+
+# 이름 -> (종류, 설명)
+METRICS = {
+    "analysis_duration_seconds": ("histogram", "기사 수집부터 최종 점수까지 전체 분석 시간"),
+    "analysis_stage_duration_seconds": ("histogram", "분석 단계별 소요 시간 (extraction 은 기사 수집 + 추출)"),
+    "analysis_stage_errors_total": ("counter", "예외가 나거나 오류 결과를 낸 분석 단계 수"),
+    "analysis_stage_skipped_total": ("counter", "처리 시간 예산 때문에 건너뛴 선택 단계 (budget=시작 전, deadline=실행 중)"),
+    "article_fetch_duration_seconds": ("histogram", "기사 수집 방식별 소요 시간 (static=requests, browser=Playwright)"),
+    "article_fetch_total": ("counter", "최종적으로 본문을 얻은 수집 방식 (failed 는 수집 실패)"),
+    "cache_requests_total": ("counter", "캐시 조회 결과 (analysis, llm, http, near_duplicate)"),
+    "cross_check_total": ("counter", "크로스체크 판정 방식 (gpt, embedding, gpt_tiebreak=임베딩 점수가 애매해 GPT 재확인)"),
+    "http_cache_writes_total": ("counter", "HTTP 디스크 캐시 쓰기 (stored=저장, dropped=저장할 수 없는 새 응답이라 예전 항목 삭제)"),
+    "singleflight_calls_total": ("counter", "합치기 대상 호출 (leader=직접 실행, shared=다른 호출의 결과를 받음)"),
+}
+
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+
+def get_buckets():
+    value = getattr(settings, 'METRICS_BUCKETS', '')
+    if not value:
+        return DEFAULT_BUCKETS
+    return tuple(sorted(float(b) for b in value.split(',') if b.strip()))
+
+
+def _label_key(labels):
+    return json.dumps(sorted((k, str(v)) for k, v in labels.items()), ensure_ascii=False)
+
+
+class _Registry:
+    """한 프로세스의 지표 (JSON 으로 저장할 수 있는 dict 만 사용)"""
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.file_name = f"{socket.gethostname()}-{self.pid}.json"  # 컨테이너끼리 pid 가 겹칠 수 있음
+        self.buckets = get_buckets()
+        self._lock = threading.Lock()
+        self._data = {"counters": {}, "histograms": {}}
+        self._flush_timer = None
+        atexit.register(self.flush)  # 마지막 저장 이후 값도 남긴다
+
+    def inc(self, name, amount=1, **labels):
+        with self._lock:
+            series = self._data["counters"].setdefault(name, {})
+            key = _label_key(labels)
+            series[key] = series.get(key, 0) + amount
+            self._schedule_flush()
+
+    def observe(self, name, value, **labels):
+        with self._lock:
+            series = self._data["histograms"].setdefault(name, {})
+            hist = series.setdefault(_label_key(labels), {
+                "buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0,
+            })
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    hist["buckets"][i] += 1
+                    break
+            hist["sum"] += value
+            hist["count"] += 1
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        """값이 바뀐 뒤 METRICS_FLUSH_SECONDS 안에 한 번만 저장 (lock 안에서 호출)"""
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(getattr(settings, 'METRICS_FLUSH_SECONDS', 2), self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def snapshot(self):
+        with self._lock:
+            self._flush_timer = None
+            return json.loads(json.dumps({"buckets": self.buckets, **self._data}))
+
+    def flush(self):
+        directory = get_metrics_dir()
+        if not directory or self.pid != os.getpid():  # fork 된 자식이 부모 파일을 덮어쓰지 않도록
+            return
+        path = os.path.join(directory, self.file_name)
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.snapshot(), f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ 지표 저장 실패 ({path}): {e}")
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """프로세스별 지표 (fork 된 자식은 부모 값을 물려받지 않고 새로 시작)"""
+    global _registry
+    if _registry is None or _registry.pid != os.getpid():
+        with _registry_lock:
+            if _registry is None or _registry.pid != os.getpid():
+                _registry = _Registry()
+    return _registry
+
+
+def get_metrics_dir():
+    return getattr(settings, 'METRICS_DIR', '')
+
+
+def enabled():
+    return getattr(settings, 'METRICS_ENABLED', True)
+
+
+# --- 기록 ---
+def inc(name, amount=1, **labels):
+    if enabled():
+        get_registry().inc(name, amount, **labels)
+
+
+def observe(name, value, **labels):
+    if enabled():
+        get_registry().observe(name, value, **labels)
+
+
+def record_cache(cache, hit, result=None):
+    """cache: analysis / llm / http / near_duplicate, result 를 주면 hit/miss 대신 사용 (예: revalidated)"""
+    inc("cache_requests_total", cache=cache, result=result or ("hit" if hit else "miss"))
+
+
+def record_fetch_duration(method, elapsed_ms, ok):
+    observe("article_fetch_duration_seconds", elapsed_ms / 1000, method=method, outcome="ok" if ok else "fail")
+
+
+def record_analysis(run, timings, article, near_duplicate, mode):
+    """
+    분석 한 건의 단계별 시간/오류/건너뜀, 수집 방식, 유사 기사 조회 결과를 기록
+    (유사 기사에서 재사용했거나 예산 때문에 건너뛴 단계는 시간을 기록하지 않는다)
+    """
+    if not enabled():
+        return
+    observe("analysis_duration_seconds", timings["total"] / 1000, mode=mode)
+    observe("analysis_stage_duration_seconds", timings["extraction"] / 1000, stage="extraction")
+    for name, reason in run.skipped.items():
+        inc("analysis_stage_skipped_total", stage=name, reason=reason)
+    for name, elapsed_ms in run.timings.items():
+        if name not in run.seeded and name not in run.skipped:
+            observe("analysis_stage_duration_seconds", elapsed_ms / 1000, stage=name)
+        result = run.results.get(name)
+        if name in run.errors or (isinstance(result, dict) and "error" in result):
+            inc("analysis_stage_errors_total", stage=name)
+    inc("article_fetch_total", path=article["fetch_path"])
+    if not near_duplicate.skipped_reason:
+        record_cache("near_duplicate", near_duplicate.match is not None)
+
+
+def record_fetch_failure():
+    inc("article_fetch_total", path="failed")
+
+
+# --- 합계 / 출력 ---
+def collect():
+    """METRICS_DIR 의 모든 프로세스 파일 + 이 프로세스의 현재 값을 더한 {"counters", "histograms"}"""
+    registry = get_registry()
+    snapshots = []
+    directory = get_metrics_dir()
+    try:
+        names = [n for n in os.listdir(directory) if n.endswith('.json')] if directory else []
+    except OSError:
+        names = []
+    for name in names:
+        if name == registry.file_name:
+            continue
+        try:
+            with open(os.path.join(directory, name), encoding='utf-8') as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue  # 다른 워커가 교체하는 중이거나 깨진 파일
+    snapshots.append(registry.snapshot())
+
+    total = {"counters": {}, "histograms": {}}
+    buckets = list(registry.buckets)
+    for snap in snapshots:
+        for name, series in snap.get("counters", {}).items():
+            merged = total["counters"].setdefault(name, {})
+            for key, value in series.items():
+                merged[key] = merged.get(key, 0) + value
+        if snap.get("buckets") != buckets:
+            continue  # 버킷 설정이 바뀌기 전의 파일은 히스토그램을 합칠 수 없다
+        for name, series in snap.get("histograms", {}).items():
+            merged = total["histograms"].setdefault(name, {})
+            for key, hist in series.items():
+                into = merged.setdefault(key, {"buckets": [0] * len(buckets), "sum": 0.0, "count": 0})
+                into["buckets"] = [a + b for a, b in zip(into["buckets"], hist["buckets"])]
+                into["sum"] += hist["sum"]
+                into["count"] += hist["count"]
+    total["buckets"] = buckets
+    return total
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render():
+    """Prometheus 텍스트 형식 (text/plain; version=0.0.4)"""
+    total = collect()
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        full_name = PREFIX + name
+        lines.append(f"# HELP {full_name} {help_text}")
+        lines.append(f"# TYPE {full_name} {kind}")
+        if kind == "counter":
+            for key, value in sorted(total["counters"].get(name, {}).items()):
+                lines.append(f"{full_name}{_format_labels(json.loads(key))} {_format_number(value)}")
+            continue
+        for key, hist in sorted(total["histograms"].get(name, {}).items()):
+            pairs = json.loads(key)
+            cumulative = 0
+            for bound, count in zip(total["buckets"], hist["buckets"]):
+                cumulative += count
+                lines.append(f"{full_name}_bucket{_format_labels(pairs + [['le', _format_number(float(bound))]])} {cumulative}")
+            lines.append(f"{full_name}_bucket{_format_labels(pairs + [['le', '+Inf']])} {hist['count']}")
+            lines.append(f"{full_name}_sum{_format_labels(pairs)} {_format_number(float(hist['sum']))}")
+            lines.append(f"{full_name}_count{_format_labels(pairs)} {hist['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics_dir():
+    """gunicorn 마스터 시작 시: 이전 실행의 프로세스 파일 삭제"""
+    directory = get_metrics_dir()
+    if not directory or not os.path.isdir(directory):
+        return
+    for name in os.listdir(directory):
+        if name.endswith(('.json', '.tmp')):
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
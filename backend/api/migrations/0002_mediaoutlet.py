@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:30
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+# 기존 views.MEDIA_TRUST_DB 의 언론사 (+ 도메인/별칭)
+INITIAL_OUTLETS = [
+    ("KBS", "kbs.co.kr", ["한국방송"], 1, 95, "공영방송"),
+    ("MBC", "imbc.com", ["문화방송"], 2, 92, "공영방송"),
+    ("SBS", "sbs.co.kr", [], 3, 88, "지상파"),
+    ("YTN", "ytn.co.kr", [], 4, 85, "뉴스전문"),
+    ("JTBC", "jtbc.co.kr", ["jtbc.joins.com"], 5, 82, "종편"),
+    ("연합뉴스", "yna.co.kr", ["Yonhap"], 6, 90, "통신사"),
+    ("뉴스1", "news1.kr", ["News1"], 7, 80, "통신사"),
+    ("조선일보", "chosun.com", ["조선닷컴", "Chosun"], 8, 75, "종합일간지"),
+    ("중앙일보", "joongang.co.kr", ["JoongAng", "joins.com"], 9, 75, "종합일간지"),
+    ("동아일보", "donga.com", ["동아닷컴"], 10, 75, "종합일간지"),
+    ("한겨레", "hani.co.kr", ["한겨레신문"], 11, 75, "종합일간지"),
+    ("경향신문", "khan.co.kr", ["경향"], 12, 75, "종합일간지"),
+    ("한국경제", "hankyung.com", ["한경", "한국경제신문"], 13, 70, "경제지"),
+    ("매일경제", "mk.co.kr", ["매경", "매일경제신문"], 14, 70, "경제지"),
+]
+
+
+def normalize_publisher_name(name):
+    # api.media_registry.normalize_publisher_name 과 같은 규칙 (마이그레이션은 앱 코드에 의존하지 않도록 복사)
+    return re.sub(r"[\W_]+", "", unicodedata.normalize("NFKC", name).lower())
+
+
+def seed_outlets(apps, schema_editor):
+    MediaOutlet = apps.get_model('api', 'MediaOutlet')
+    MediaOutlet.objects.bulk_create([
+        MediaOutlet(
+            name=name, normalized_name=normalize_publisher_name(name), domain=domain,
+            aliases=aliases, rank=rank, score=score, category=category,
+        )
+        for name, domain, aliases, rank, score, category in INITIAL_OUTLETS
+    ], ignore_conflicts=True)
+
+
+def remove_outlets(apps, schema_editor):
+    MediaOutlet = apps.get_model('api', 'MediaOutlet')
+    MediaOutlet.objects.filter(name__in=[o[0] for o in INITIAL_OUTLETS]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaOutlet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('normalized_name', models.CharField(max_length=100, unique=True)),
+                ('domain', models.CharField(blank=True, db_index=True, max_length=255)),
+                ('aliases', models.JSONField(blank=True, default=list)),
+                ('rank', models.PositiveIntegerField(blank=True, null=True)),
+                ('score', models.PositiveSmallIntegerField(default=60)),
+                ('category', models.CharField(blank=True, max_length=50)),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+            options={
+                'ordering': ['rank', 'name'],
+            },
+        ),
+        migrations.RunPython(seed_outlets, remove_outlets),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_analysisjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DomainFetchStrategy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('domain', models.CharField(max_length=255, unique=True)),
+                ('static_success', models.FloatField(default=1.0)),
+                ('browser_success', models.FloatField(default=1.0)),
+                ('static_fail_ms', models.FloatField(default=0)),
+                ('static_attempts', models.PositiveIntegerField(default=0)),
+                ('static_successes', models.PositiveIntegerField(default=0)),
+                ('browser_attempts', models.PositiveIntegerField(default=0)),
+                ('browser_successes', models.PositiveIntegerField(default=0)),
+                ('static_skipped', models.PositiveIntegerField(default=0)),
+                ('time_saved_ms', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_domainfetchstrategy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleFingerprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('simhash', models.BigIntegerField()),
+                ('band0', models.PositiveIntegerField()),
+                ('band1', models.PositiveIntegerField()),
+                ('band2', models.PositiveIntegerField()),
+                ('band3', models.PositiveIntegerField()),
+                ('canonical_url', models.TextField()),
+                ('title', models.TextField(blank=True)),
+                ('results', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['band0'], name='fingerprint_band0_idx'), models.Index(fields=['band1'], name='fingerprint_band1_idx'), models.Index(fields=['band2'], name='fingerprint_band2_idx'), models.Index(fields=['band3'], name='fingerprint_band3_idx')],
+            },
+        ),
+    ]
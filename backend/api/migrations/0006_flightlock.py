@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_articlefingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FlightLock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('token', models.CharField(max_length=32)),
+                ('owner', models.CharField(blank=True, max_length=64)),
+                ('expires_at', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -1,3 +1,148 @@
+import uuid
+
 from django.db import models
 
-# Create your models here.
+
+class CacheEntry(models.Model):
+    """
+    gunicorn 워커들이 함께 쓰는 캐시 항목 (api/cache.py 참고)
+    namespace 별로 TTL(created_at 기준)과 LRU(accessed_at 기준) 정리를 한다.
+    """
+    namespace = models.CharField(max_length=32)
+    key = models.CharField(max_length=64)  # 원본 키의 sha256
+    value = models.JSONField()
+    created_at = models.DateTimeField()
+    accessed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['namespace', 'key'], name='uniq_cache_namespace_key'),
+        ]
+        indexes = [
+            models.Index(fields=['namespace', 'accessed_at'], name='cache_lru_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.namespace}:{self.key[:12]}"
+
+
+class MediaOutlet(models.Model):
+    """
+    언론사 신뢰도 레지스트리 (api/media_registry.py 참고)
+    대표 도메인, 정규화된 이름, 별칭(다른 표기/도메인)으로 조회한다.
+    """
+    name = models.CharField(max_length=100)
+    normalized_name = models.CharField(max_length=100, unique=True)  # normalize_publisher_name(name)
+    domain = models.CharField(max_length=255, blank=True, db_index=True)  # 예: kbs.co.kr (www. 제외)
+    aliases = models.JSONField(default=list, blank=True)  # 다른 표기나 추가 도메인
+    rank = models.PositiveIntegerField(null=True, blank=True)
+    score = models.PositiveSmallIntegerField(default=60)
+    category = models.CharField(max_length=50, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        ordering = ['rank', 'name']
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        from .media_registry import normalize_publisher_name
+        self.normalized_name = normalize_publisher_name(self.name)
+        super().save(*args, **kwargs)
+
+
+class AnalysisJob(models.Model):
+    """
+    비동기 분석 작업 큐의 항목 (api/jobs.py 참고)
+    웹 워커는 작업을 등록만 하고, run_analysis_workers 프로세스가 가져가서 실행한다.
+    """
+    QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+    STATUS_CHOICES = [(QUEUED, '대기'), (RUNNING, '실행 중'), (DONE, '완료'), (FAILED, '실패')]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    url = models.TextField()
+    canonical_url = models.TextField()  # 같은 기사 작업 중복 등록 방지용 (views.canonicalize_url)
+    force_refresh = models.BooleanField(default=False)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    partial = models.JSONField(default=dict, blank=True)  # 끝난 단계의 중간 결과 {단계 이름: 결과}
+    result = models.JSONField(null=True, blank=True)      # /api/analyze/ 응답의 data 와 같은 형식
+    error = models.TextField(blank=True)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    worker = models.CharField(max_length=64, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)  # 실행 중인 워커가 주기적으로 갱신
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='job_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.id} [{self.status}] {self.url[:60]}"
+
+
+class DomainFetchStrategy(models.Model):
+    """
+    도메인별 기사 수집 결과 기록 (api/fetch_strategy.py 참고)
+    성공률은 최근 결과에 가중치를 더 주는 지수 이동 평균(EMA)이라 사이트가 바뀌면 따라서 바뀐다.
+    """
+    domain = models.CharField(max_length=255, unique=True)
+    static_success = models.FloatField(default=1.0)   # requests 로 본문을 얻은 비율 (EMA)
+    browser_success = models.FloatField(default=1.0)  # Playwright 로 본문을 얻은 비율 (EMA)
+    static_fail_ms = models.FloatField(default=0)     # 실패한 requests 시도 한 번에 든 시간 (EMA)
+    static_attempts = models.PositiveIntegerField(default=0)
+    static_successes = models.PositiveIntegerField(default=0)
+    browser_attempts = models.PositiveIntegerField(default=0)
+    browser_successes = models.PositiveIntegerField(default=0)
+    static_skipped = models.PositiveIntegerField(default=0)  # requests 를 건너뛰고 바로 브라우저로 간 횟수
+    time_saved_ms = models.FloatField(default=0)             # 건너뛰어 아낀 시간 추정치 합계
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.domain
+
+
+class ArticleFingerprint(models.Model):
+    """
+    분석한 기사의 SimHash 지문 (api/near_duplicates.py 참고)
+    64비트 지문을 16비트씩 4개 밴드로 나눠 색인해 두고, 밴드가 하나라도 같은 기사만 후보로 비교한다.
+    """
+    simhash = models.BigIntegerField()  # 부호 있는 64비트로 저장
+    band0 = models.PositiveIntegerField()
+    band1 = models.PositiveIntegerField()
+    band2 = models.PositiveIntegerField()
+    band3 = models.PositiveIntegerField()
+    canonical_url = models.TextField()
+    title = models.TextField(blank=True)
+    results = models.JSONField()  # 재사용할 단계 결과 {단계 이름: 결과}
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['band0'], name='fingerprint_band0_idx'),
+            models.Index(fields=['band1'], name='fingerprint_band1_idx'),
+            models.Index(fields=['band2'], name='fingerprint_band2_idx'),
+            models.Index(fields=['band3'], name='fingerprint_band3_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.simhash & 0xFFFFFFFFFFFFFFFF:016x} {self.canonical_url[:60]}"
+
+
+class FlightLock(models.Model):
+    """
+    진행 중인 작업 표시 (api/singleflight.py 참고)
+    같은 키의 작업은 이 행을 먼저 만든 프로세스만 실행하고, 나머지는 결과가 저장되길 기다린다.
+    expires_at 이 지나면 실행하던 프로세스가 죽은 것으로 보고 다른 프로세스가 넘겨받는다.
+    """
+    key = models.CharField(max_length=64, unique=True)  # make_cache_key(namespace, 키)
+    token = models.CharField(max_length=32)             # 실행 회차 (결과 저장 키에 사용)
+    owner = models.CharField(max_length=64, blank=True)
+    expires_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.key[:12]} ({self.owner})"
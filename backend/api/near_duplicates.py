@@ -0,0 +1,204 @@
+"""
+유사 기사(근접 중복) 색인 - SimHash + 밴드 LSH
+
+같은 통신사 기사가 언론사마다 조금씩 고쳐져(제목 말머리, 기자 이름, 문단 한두 개) 올라오므로
+URL 이나 본문 해시가 달라도 내용이 거의 같으면 비싼 단계(GPT, 로컬 모델, 검색 + 크로스체크)의
+결과를 재사용한다. 언론사 신뢰도/발행일/자극적 표현/광고성처럼 기사마다 다르고 싼 단계는 다시 계산한다.
+관련 기사 검색(키워드/네이버/구글)은 원본 기사를 목록에서 빼는 처리가 기사마다 달라 재사용하지 않는다.
+
+- 지문: 정규화한 제목 + 본문의 글자 3-gram 을 64비트로 해시해 SimHash 를 만든다.
+  내용이 비슷할수록 지문의 다른 비트 수(해밍 거리)가 작다.
+- 색인: 64비트를 16비트씩 4개 밴드로 나눠 DB 인덱스 컬럼에 저장한다.
+  거리가 3 이하이면 적어도 한 밴드는 반드시 같으므로(비둘기집 원리) 밴드가 같은 행만
+  후보로 가져와 거리를 계산한다 -> 색인 크기와 무관하게 후보 몇 개만 비교한다.
+- NEAR_DUPLICATE_MAX_AGE 초 안에 분석한 기사만 재사용한다 (오래된 판단은 다시 계산).
+- 재사용한 결과는 다시 저장하지 않는다 (재사용이 이어져 결과가 계속 살아남지 않도록).
+"""
+import hashlib
+import re
+import time
+import unicodedata
+from collections import Counter
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ArticleFingerprint
+
+# 재사용하는 단계 (GPT 판정, 로컬 모델, 크로스체크)
+# 검색 단계 결과(related_articles)는 이전 기사 제목/URL 기준으로 걸러져 있어 지금 기사가 섞일 수 있으므로 새로 검색한다.
+REUSABLE_STAGES = ("gpt", "ai_model", "cross_check")
+
+SHINGLE_SIZE = 3
+MAX_FINGERPRINT_CHARS = 5000
+BAND_BITS = 16
+BANDS = 64 // BAND_BITS
+_BIT_SHIFTS = np.arange(64, dtype=np.uint64)
+
+
+def _normalize(text):
+    return re.sub(r"[\W_]+", "", unicodedata.normalize("NFKC", text or "").lower())
+
+
+def _hash64(shingle):
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def simhash(text):
+    """글자 3-gram 가중치(등장 횟수) SimHash, 글자가 너무 적으면 None"""
+    normalized = _normalize(text)[:MAX_FINGERPRINT_CHARS]
+    if len(normalized) < SHINGLE_SIZE:
+        return None
+    counts = Counter(normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1))
+    hashes = np.fromiter((_hash64(s) for s in counts), dtype=np.uint64, count=len(counts))
+    weights = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+
+    bits = ((hashes[:, None] >> _BIT_SHIFTS) & np.uint64(1)).astype(np.int64)  # (shingle 수, 64)
+    votes = weights @ (bits * 2 - 1)
+    return sum(1 << i for i in np.flatnonzero(votes > 0).tolist())
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count("1")
+
+
+def split_bands(fingerprint):
+    mask = (1 << BAND_BITS) - 1
+    return [(fingerprint >> (i * BAND_BITS)) & mask for i in range(BANDS)]
+
+
+def _to_signed(value):
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _to_unsigned(value):
+    return value & 0xFFFFFFFFFFFFFFFF
+
+
+class NearDuplicateLookup:
+    """기사 하나의 지문 + 찾은 유사 기사 (analyze_url 에서 한 번 만들어 조회/저장에 같이 쓴다)"""
+
+    def __init__(self, fingerprint=None, skipped_reason=None):
+        self.fingerprint = fingerprint
+        self.skipped_reason = skipped_reason  # 조회하지 않은 이유 (None 이면 조회함)
+        self.match = None  # {"url", "title", "distance", "age_seconds", "results"}
+        self.candidates = 0
+        self.lookup_ms = 0.0
+
+    @property
+    def seeded(self):
+        """파이프라인에 미리 넣을 단계 결과 (유사 기사가 없으면 빈 dict)"""
+        if not self.match:
+            return {}
+        # 예전에 검색 단계까지 저장한 지문이 있어도 재사용 단계만 넘긴다
+        return {name: value for name, value in self.match["results"].items() if name in REUSABLE_STAGES}
+
+    def stats(self):
+        """응답의 near_duplicate 항목"""
+        if self.skipped_reason:
+            return {"checked": False, "matched": False, "reason": self.skipped_reason}
+        stats = {
+            "checked": True,
+            "matched": self.match is not None,
+            "fingerprint": f"{self.fingerprint:016x}",
+            "candidates": self.candidates,
+            "lookup_ms": round(self.lookup_ms, 1),
+        }
+        if self.match:
+            distance = self.match["distance"]
+            stats.update({
+                "distance": distance,
+                "similarity": round(1 - distance / 64, 3),
+                "source_url": self.match["url"],
+                "source_title": self.match["title"],
+                "age_seconds": round(self.match["age_seconds"], 1),
+                "reused_stages": sorted(self.seeded),
+            })
+        return stats
+
+
+def find_near_duplicate(title, text, reuse=True):
+    """
+    최근 분석한 기사 중 지문 거리가 NEAR_DUPLICATE_MAX_DISTANCE 이하인 가장 가까운 기사를 찾는다
+    reuse=False (강제 새로고침) 이면 조회는 하지 않고 지문만 만든다 (새 결과는 저장됨)
+    Returns: NearDuplicateLookup (DB 오류 시에도 반환, match 는 None)
+    """
+    if not getattr(settings, 'NEAR_DUPLICATE_ENABLED', True):
+        return NearDuplicateLookup(skipped_reason="disabled")
+    if len(_normalize(text)) < getattr(settings, 'NEAR_DUPLICATE_MIN_CHARS', 200):
+        return NearDuplicateLookup(skipped_reason="too_short")
+
+    started = time.perf_counter()
+    lookup = NearDuplicateLookup(simhash(f"{title}\n{text}"))
+    if not reuse:
+        lookup.skipped_reason = "refresh"
+        return lookup
+    max_distance = getattr(settings, 'NEAR_DUPLICATE_MAX_DISTANCE', 3)
+    cutoff = timezone.now() - timedelta(seconds=getattr(settings, 'NEAR_DUPLICATE_MAX_AGE', 6 * 3600))
+
+    bands = split_bands(lookup.fingerprint)
+    same_band = Q()
+    for i, band in enumerate(bands):
+        same_band |= Q(**{f"band{i}": band})
+    try:
+        candidates = list(
+            ArticleFingerprint.objects.filter(same_band, created_at__gte=cutoff)
+            .order_by('-created_at')
+            .values_list('pk', 'simhash')[:getattr(settings, 'NEAR_DUPLICATE_MAX_CANDIDATES', 200)]
+        )
+        lookup.candidates = len(candidates)
+        scored = [(hamming_distance(lookup.fingerprint, _to_unsigned(h)), pk) for pk, h in candidates]
+        best = min(scored, default=None)
+        if best is not None and best[0] <= max_distance:
+            row = ArticleFingerprint.objects.get(pk=best[1])
+            lookup.match = {
+                "url": row.canonical_url,
+                "title": row.title,
+                "distance": best[0],
+                "age_seconds": (timezone.now() - row.created_at).total_seconds(),
+                "results": row.results,
+            }
+            print(f"♻️ 유사 기사 재사용: 거리 {best[0]} ({row.canonical_url})")
+    except DatabaseError as e:
+        print(f"⚠️ 유사 기사 조회 실패: {e}")
+    lookup.lookup_ms = (time.perf_counter() - started) * 1000
+    return lookup
+
+
+def remember_article(lookup, canonical_url, title, run):
+    """
+    분석이 끝난 기사의 지문과 재사용 가능한 단계 결과를 저장
+    재사용한 분석이거나, 재사용 단계가 실패/오류 결과이거나 예산 때문에 건너뛰었으면 저장하지 않는다.
+    """
+    if lookup.fingerprint is None or lookup.match is not None:
+        return
+    if any(name in run.errors or name in run.skipped for name in REUSABLE_STAGES):
+        return
+    results = {name: run.results[name] for name in REUSABLE_STAGES if name in run.results}
+    if len(results) != len(REUSABLE_STAGES) or "error" in results["gpt"]:
+        return
+
+    bands = split_bands(lookup.fingerprint)
+    try:
+        ArticleFingerprint.objects.create(
+            simhash=_to_signed(lookup.fingerprint),
+            band0=bands[0], band1=bands[1], band2=bands[2], band3=bands[3],
+            canonical_url=canonical_url, title=title or "", results=results,
+        )
+        _prune()
+    except DatabaseError as e:
+        print(f"⚠️ 유사 기사 지문 저장 실패: {e}")
+
+
+def _prune():
+    """재사용 기간이 지난 지문 삭제, NEAR_DUPLICATE_MAX_ENTRIES 를 넘으면 오래된 순으로 삭제"""
+    max_age = getattr(settings, 'NEAR_DUPLICATE_MAX_AGE', 6 * 3600)
+    ArticleFingerprint.objects.filter(created_at__lt=timezone.now() - timedelta(seconds=max_age)).delete()
+    overflow = ArticleFingerprint.objects.count() - getattr(settings, 'NEAR_DUPLICATE_MAX_ENTRIES', 20000)
+    if overflow > 0:
+        stale_ids = list(ArticleFingerprint.objects.order_by('created_at').values_list('pk', flat=True)[:overflow])
+        ArticleFingerprint.objects.filter(pk__in=stale_ids).delete()
@@ -0,0 +1,231 @@
+"""
+분석 단계 실행기 (의존 관계를 고려한 병렬 실행)
+
+각 단계(Stage)는 이름, 실행 함수, 의존하는 단계 이름 목록을 가진다.
+의존 단계가 모두 끝난 단계부터 스레드 풀에서 동시에 실행하고,
+실행 함수에는 의존 단계의 결과가 키워드 인자로 전달된다.
+
+    stages = [
+        Stage("gpt", lambda: get_gpt_prediction(title, text)),
+        Stage("keywords", lambda gpt: gpt.get("keywords", ""), deps=["gpt"]),
+    ]
+    run = run_stages(stages)
+    run.results["keywords"], run.timings["gpt"]
+
+on_stage_done(name, result, elapsed_ms, error) 를 넘기면 단계가 끝날 때마다 (호출한 스레드/루프에서)
+바로 호출되므로, 전체 분석이 끝나기 전에 중간 결과를 내보낼 수 있다.
+
+seeded={단계 이름: 결과} 를 넘기면 그 단계는 실행하지 않고 주어진 결과를 쓴다 (소요 시간 0,
+StageRun.seeded 에 기록). 이전 분석 결과를 재사용할 때 쓰며, 후속 단계는 평소처럼 실행된다.
+
+deadline(api/deadline.py)을 넘기면 optional=True 인 단계는 시작할 때 남은 예산이 min_budget 보다
+적으면 건너뛰고(default 결과), 실행 중 예산이 끝나면 기다리지 않는다 (StageRun.skipped 에 기록).
+단계 함수가 DeadlineExceeded 를 내도 건너뛴 것으로 본다. 필수 단계는 예산과 상관없이 끝까지 실행한다.
+
+비동기 뷰에서는 run_stages_async 를 쓴다. afunc(코루틴 함수)가 있는 단계는 이벤트 루프에서,
+없는 단계(CPU 작업 등)는 기본 스레드 풀에서 func 를 실행한다.
+"""
+import asyncio
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.db import connections
+
+from .deadline import DeadlineExceeded
+
+
+class Stage:
+    def __init__(self, name, func, deps=(), default=None, afunc=None, optional=False, min_budget=0.0):
+        self.name = name
+        self.func = func
+        self.afunc = afunc  # 비동기 실행 시 func 대신 사용할 코루틴 함수
+        self.deps = tuple(deps)
+        self.default = default  # 예외 발생 시 대신 쓸 결과 (후속 단계는 그대로 진행)
+        # 선택 단계: 남은 예산이 min_budget(초)보다 적으면 건너뛰고, 예산이 끝나면 기다리지 않는다
+        self.optional = optional
+        self.min_budget = min_budget
+
+    def __repr__(self):
+        return f"Stage({self.name!r}, deps={list(self.deps)})"
+
+
+class StageRun:
+    """실행 결과: 단계별 결과값, 소요 시간(ms), 예외 메시지"""
+
+    def __init__(self):
+        self.results = {}
+        self.timings = {}
+        self.errors = {}
+        self.seeded = []  # 실행하지 않고 주어진 결과를 쓴 단계
+        self.skipped = {}  # 예산 때문에 건너뛴 선택 단계 -> "budget"(시작 전) / "deadline"(실행 중 초과)
+
+
+def _execute(stage, kwargs):
+    started = time.perf_counter()
+    try:
+        return stage.func(**kwargs), None, (time.perf_counter() - started) * 1000
+    except Exception as e:
+        return stage.default, e, (time.perf_counter() - started) * 1000
+    finally:
+        # 풀 스레드에서 연 DB 연결은 요청 사이클이 정리해 주지 않으므로 직접 닫는다
+        connections.close_all()
+
+
+async def _execute_async(stage, kwargs):
+    if stage.afunc is None:
+        return await asyncio.to_thread(_execute, stage, kwargs)
+    started = time.perf_counter()
+    try:
+        return await stage.afunc(**kwargs), None, (time.perf_counter() - started) * 1000
+    except Exception as e:
+        return stage.default, e, (time.perf_counter() - started) * 1000
+
+
+def _check_graph(stages):
+    names = {s.name for s in stages}
+    if len(names) != len(stages):
+        raise ValueError("단계 이름이 중복되었습니다")
+    for s in stages:
+        missing = [d for d in s.deps if d not in names]
+        if missing:
+            raise ValueError(f"{s.name}: 존재하지 않는 의존 단계 {missing}")
+
+
+def run_stages(stages, max_workers=8, on_stage_done=None, seeded=None, deadline=None):
+    """의존 관계를 지키며 단계를 병렬 실행하고 StageRun 을 반환"""
+    _check_graph(stages)
+    run = StageRun()
+    pending = {s.name: s for s in stages}
+    running = {}  # future -> (단계, 시작 시각)
+    _seed(run, pending, seeded, on_stage_done)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stage")
+    abandoned = False
+    try:
+        while pending or running:
+            ready = _pop_ready(pending, run)
+            for stage in ready:
+                if _lacks_budget(stage, deadline):
+                    _skip(run, stage, "budget", 0.0, on_stage_done)
+                    continue
+                kwargs = {d: run.results[d] for d in stage.deps}
+                running[executor.submit(_execute, stage, kwargs)] = (stage, time.perf_counter())
+
+            if not running:
+                if ready:
+                    continue  # 건너뛴 단계 뒤의 단계가 준비되었을 수 있음
+                raise ValueError(f"의존 관계가 순환합니다: {list(pending)}")
+
+            done, _ = wait(running, timeout=_wait_timeout(running, deadline), return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, _ = running.pop(future)
+                _finish(run, stage, *future.result(), on_stage_done=on_stage_done)
+            if not done:
+                abandoned |= _abandon_optional(run, running, on_stage_done)
+    finally:
+        # 예산 때문에 버린 단계의 스레드는 기다리지 않는다 (각자 timeout 으로 곧 끝난다)
+        executor.shutdown(wait=not abandoned, cancel_futures=True)
+
+    return run
+
+
+async def run_stages_async(stages, on_stage_done=None, seeded=None, deadline=None):
+    """run_stages 의 asyncio 버전 (같은 StageRun 반환)"""
+    _check_graph(stages)
+    run = StageRun()
+    pending = {s.name: s for s in stages}
+    running = {}
+    _seed(run, pending, seeded, on_stage_done)
+
+    while pending or running:
+        ready = _pop_ready(pending, run)
+        for stage in ready:
+            if _lacks_budget(stage, deadline):
+                _skip(run, stage, "budget", 0.0, on_stage_done)
+                continue
+            kwargs = {d: run.results[d] for d in stage.deps}
+            running[asyncio.ensure_future(_execute_async(stage, kwargs))] = (stage, time.perf_counter())
+
+        if not running:
+            if ready:
+                continue
+            raise ValueError(f"의존 관계가 순환합니다: {list(pending)}")
+
+        done, _ = await asyncio.wait(
+            running, timeout=_wait_timeout(running, deadline), return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in done:
+            stage, _ = running.pop(task)
+            _finish(run, stage, *task.result(), on_stage_done=on_stage_done)
+        if not done:
+            _abandon_optional(run, running, on_stage_done)
+
+    return run
+
+
+def _seed(run, pending, seeded, on_stage_done):
+    """미리 주어진 결과를 실행 없이 기록 (없는 단계 이름은 무시)"""
+    for name, value in (seeded or {}).items():
+        stage = pending.pop(name, None)
+        if stage is None:
+            continue
+        run.seeded.append(name)
+        _record(run, stage, value, None, 0.0, on_stage_done=on_stage_done)
+
+
+def _pop_ready(pending, run):
+    """의존 단계가 모두 끝난 단계를 pending 에서 꺼내 반환"""
+    ready = [s for s in pending.values() if all(d in run.results for d in s.deps)]
+    for stage in ready:
+        del pending[stage.name]
+    return ready
+
+
+def _lacks_budget(stage, deadline):
+    return deadline is not None and stage.optional and deadline.remaining() < stage.min_budget
+
+
+def _wait_timeout(running, deadline):
+    """선택 단계가 실행 중이면 남은 예산까지만 기다린다 (필수 단계만 남으면 끝날 때까지)"""
+    if deadline is None or not any(stage.optional for stage, _ in running.values()):
+        return None
+    return deadline.remaining()
+
+
+def _abandon_optional(run, running, on_stage_done):
+    """예산이 끝났을 때 실행 중인 선택 단계를 기본값으로 기록하고 더 기다리지 않는다"""
+    abandoned = False
+    for future, (stage, started) in list(running.items()):
+        if stage.optional:
+            del running[future]
+            future.cancel()
+            _skip(run, stage, "deadline", (time.perf_counter() - started) * 1000, on_stage_done)
+            abandoned = True
+    return abandoned
+
+
+def _finish(run, stage, value, error, elapsed_ms, on_stage_done=None):
+    # 선택 단계가 예산 부족으로 중단한 것은 실패가 아니라 건너뛴 것
+    if isinstance(error, DeadlineExceeded) and stage.optional:
+        _skip(run, stage, "deadline", elapsed_ms, on_stage_done)
+    else:
+        _record(run, stage, value, error, elapsed_ms, on_stage_done=on_stage_done)
+
+
+def _skip(run, stage, reason, elapsed_ms, on_stage_done):
+    print(f"⏭️ 단계 건너뜀 [{stage.name}]: {'남은 예산 부족' if reason == 'budget' else '예산 초과로 중단'}")
+    run.skipped[stage.name] = reason
+    _record(run, stage, stage.default, None, elapsed_ms, on_stage_done=on_stage_done)
+
+
+def _record(run, stage, value, error, elapsed_ms, on_stage_done=None):
+    run.results[stage.name] = value
+    run.timings[stage.name] = round(elapsed_ms, 1)
+    if error is not None:
+        print(f"⚠️ 단계 실패 [{stage.name}]: {error}")
+        run.errors[stage.name] = str(error)
+    if on_stage_done is not None:
+        try:
+            on_stage_done(stage.name, value, run.timings[stage.name], run.errors.get(stage.name))
+        except Exception as e:
+            print(f"⚠️ 단계 완료 콜백 오류 [{stage.name}]: {e}")
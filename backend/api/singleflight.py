@@ -0,0 +1,286 @@
+"""
+같은 작업의 동시 실행 합치기 (singleflight)
+
+기사 링크가 퍼지면 같은 URL 분석 요청이 몇 초 안에 수십 번 들어오고, 같은 키워드로 네이버/구글
+검색도 반복된다. 같은 키의 작업이 이미 진행 중이면 새로 실행하지 않고 그 결과를 기다려 함께 쓴다.
+
+- 같은 프로세스: 먼저 온 호출이 Future 를 만들어 실행하고, 나머지 스레드는 그 Future 를 기다린다.
+- 프로세스 사이: FlightLock 행을 먼저 만든 프로세스가 실행하고 결과를 공유 캐시("flight")에
+  (키, 실행 회차 token) 으로 저장한다. 다른 프로세스는 그 결과가 생길 때까지 주기적으로 확인한다.
+  실행하는 동안 백그라운드 스레드(비동기는 태스크)가 SINGLEFLIGHT_LEASE_SECONDS 의 1/3 마다 lease 를
+  연장하므로 실행이 오래 걸려도 두 번째 실행이 시작되지 않는다.
+  실행하던 프로세스가 죽으면 연장이 멈추고, lease 가 지난 뒤 기다리던 쪽이 넘겨받아 실행한다.
+- 실행이 실패해 결과 없이 잠금이 풀리면 기다리던 쪽 중 하나가 다시 실행한다.
+- timeout 초 안에 결과를 못 받으면 기다리던 쪽이 직접 실행한다 (합치기보다 응답이 우선).
+  호출한 요청의 처리 시간 예산(deadline)을 넘기면 남은 예산까지만 기다린다.
+- 결과는 JSON 으로 저장할 수 있어야 한다. DB 오류 시에는 합치지 않고 그냥 실행한다.
+
+    value, shared = analysis_flight.do(canonical_url, lambda: analyze(...), deadline=deadline)
+"""
+import asyncio
+import os
+import socket
+import threading
+import time
+import uuid
+import weakref
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from django.utils import timezone
+
+from . import metrics
+from .cache import SharedLRUCache, make_cache_key
+from .models import FlightLock
+
+# 프로세스 사이에 결과를 넘겨주는 저장소 (기다리는 쪽이 바로 가져가므로 짧게 보관)
+flight_results = SharedLRUCache(
+    "flight",
+    ttl_setting="SINGLEFLIGHT_RESULT_TTL",
+    max_entries_setting="SINGLEFLIGHT_RESULT_MAX_ENTRIES",
+    default_ttl=60,
+    default_max_entries=1000,
+)
+
+_OWNER = f"{socket.gethostname()}:{os.getpid()}"
+
+
+class SingleFlight:
+    """
+    namespace 하나에 해당하는 합치기 (키는 namespace 안에서만 구분)
+    timeout_setting: 다른 호출의 결과를 기다리는 최대 시간 (초)
+    """
+
+    def __init__(self, namespace, timeout_setting, default_timeout):
+        self.namespace = namespace
+        self.timeout_setting = timeout_setting
+        self.default_timeout = default_timeout
+        self._lock = threading.Lock()
+        self._calls = {}  # 키 -> Future (이 프로세스에서 진행 중인 실행)
+        self._async_calls = weakref.WeakKeyDictionary()  # 이벤트 루프 -> {키: asyncio.Future}
+
+    @property
+    def timeout(self):
+        return float(getattr(settings, self.timeout_setting, self.default_timeout))
+
+    @property
+    def lease(self):
+        """잠금 유지 시간 (실행 중에는 계속 연장, 실행하던 프로세스가 죽으면 이 시간 뒤 넘겨받음)"""
+        return float(getattr(settings, 'SINGLEFLIGHT_LEASE_SECONDS', 15))
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'SINGLEFLIGHT_ENABLED', True)
+
+    def wait_timeout(self, deadline=None):
+        """다른 호출의 결과를 기다릴 시간: timeout 과 요청의 남은 예산 중 작은 값"""
+        return self.timeout if deadline is None else min(self.timeout, deadline.remaining())
+
+    def _count(self, shared):
+        metrics.inc("singleflight_calls_total", namespace=self.namespace, result="shared" if shared else "leader")
+
+    # --- 동기 ---
+    def do(self, key, func, deadline=None):
+        """
+        func() 를 키당 한 번만 실행하고 결과를 함께 쓴다
+        deadline: 호출한 요청의 처리 시간 예산 (다른 호출의 결과를 남은 예산까지만 기다림)
+        Returns: (결과, shared) - shared 는 다른 호출이 실행한 결과를 받았는지
+        """
+        value, shared = self._do(key, func, self.wait_timeout(deadline))
+        self._count(shared)
+        return value, shared
+
+    def _do(self, key, func, wait_timeout):
+        if not self.enabled:
+            return func(), False
+
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            try:
+                return future.result(timeout=wait_timeout)[0], True
+            except FutureTimeoutError:
+                print(f"⏱️ 합치기 대기 시간 초과, 직접 실행 [{self.namespace}] {key}")
+                return func(), False
+
+        try:
+            value, shared = self._run_across_processes(key, func, wait_timeout)
+            future.set_result((value, shared))
+            return value, shared
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def _run_across_processes(self, key, func, wait_timeout):
+        deadline = time.monotonic() + wait_timeout
+        poll = getattr(settings, 'SINGLEFLIGHT_POLL_SECONDS', 0.25)
+        waiting_for = None
+        while True:
+            if waiting_for:
+                hit = flight_results.get(self._result_key(key, waiting_for))
+                if hit:
+                    return hit[0]["value"], True
+            try:
+                acquired, token = self._acquire(key)
+            except DatabaseError as e:
+                print(f"⚠️ 합치기 잠금 실패, 그냥 실행 [{self.namespace}]: {e}")
+                return func(), False
+            if acquired:
+                return self._lead(key, token, func), False
+            waiting_for = token
+            if time.monotonic() >= deadline:
+                print(f"⏱️ 다른 프로세스의 결과를 기다리다 시간 초과, 직접 실행 [{self.namespace}] {key}")
+                return func(), False
+            time.sleep(poll)
+
+    def _lead(self, key, token, func):
+        stop = threading.Event()
+        threading.Thread(
+            target=self._keep_lease, args=(key, token, stop), name="singleflight-lease", daemon=True
+        ).start()
+        try:
+            value = func()
+            flight_results.set(self._result_key(key, token), {"value": value})
+            return value
+        finally:
+            stop.set()
+            self._release(key, token)
+
+    def _keep_lease(self, key, token, stop):
+        """실행이 끝날 때까지 lease 연장 (잠금을 잃으면 그만둠)"""
+        try:
+            while not stop.wait(self.lease / 3):
+                if not self._renew(key, token):
+                    break
+        finally:
+            connection.close()  # 이 스레드의 DB 연결 정리
+
+    # --- 비동기 (이벤트 루프 안에서 같은 키 합치기 + 프로세스 사이 잠금) ---
+    async def do_async(self, key, afunc, deadline=None):
+        """do() 의 비동기 버전 (afunc 는 코루틴 함수)"""
+        value, shared = await self._do_async(key, afunc, self.wait_timeout(deadline))
+        self._count(shared)
+        return value, shared
+
+    async def _do_async(self, key, afunc, wait_timeout):
+        if not self.enabled:
+            return await afunc(), False
+
+        calls = self._async_calls.setdefault(asyncio.get_running_loop(), {})
+        future = calls.get(key)
+        if future is not None:
+            try:
+                return (await asyncio.wait_for(asyncio.shield(future), wait_timeout))[0], True
+            except asyncio.TimeoutError:
+                return await afunc(), False
+
+        future = calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            value, shared = await self._run_across_processes_async(key, afunc, wait_timeout)
+            future.set_result((value, shared))
+            return value, shared
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # 기다리는 쪽이 없어도 "never retrieved" 경고를 남기지 않도록
+            raise
+        finally:
+            calls.pop(key, None)
+
+    async def _run_across_processes_async(self, key, afunc, wait_timeout):
+        deadline = time.monotonic() + wait_timeout
+        poll = getattr(settings, 'SINGLEFLIGHT_POLL_SECONDS', 0.25)
+        waiting_for = None
+        while True:
+            if waiting_for:
+                hit = await sync_to_async(flight_results.get)(self._result_key(key, waiting_for))
+                if hit:
+                    return hit[0]["value"], True
+            try:
+                acquired, token = await sync_to_async(self._acquire)(key)
+            except DatabaseError as e:
+                print(f"⚠️ 합치기 잠금 실패, 그냥 실행 [{self.namespace}]: {e}")
+                return await afunc(), False
+            if acquired:
+                keeper = asyncio.ensure_future(self._keep_lease_async(key, token))
+                try:
+                    value = await afunc()
+                    await sync_to_async(flight_results.set)(self._result_key(key, token), {"value": value})
+                    return value, False
+                finally:
+                    keeper.cancel()
+                    await sync_to_async(self._release)(key, token)
+            waiting_for = token
+            if time.monotonic() >= deadline:
+                return await afunc(), False
+            await asyncio.sleep(poll)
+
+    async def _keep_lease_async(self, key, token):
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            if not await sync_to_async(self._renew)(key, token):
+                return
+
+    # --- FlightLock ---
+    def _lock_key(self, key):
+        return make_cache_key(self.namespace, key)
+
+    def _result_key(self, key, token):
+        return (self.namespace, key, token)
+
+    def _acquire(self, key):
+        """
+        Returns: (True, 새 token) - 이 프로세스가 실행
+                 (False, 실행 중인 token) - 다른 프로세스가 실행 중
+        """
+        lock_key = self._lock_key(key)
+        now = timezone.now()
+        token = uuid.uuid4().hex
+        expires_at = now + timedelta(seconds=self.lease)
+        try:
+            with transaction.atomic():
+                FlightLock.objects.create(key=lock_key, token=token, owner=_OWNER, expires_at=expires_at)
+            return True, token
+        except IntegrityError:
+            pass
+        # lease 가 지난 잠금은 실행하던 프로세스가 죽은 것으로 보고 넘겨받는다
+        taken = FlightLock.objects.filter(key=lock_key, expires_at__lt=now).update(
+            token=token, owner=_OWNER, expires_at=expires_at
+        )
+        if taken:
+            return True, token
+        holder = FlightLock.objects.filter(key=lock_key).values_list('token', flat=True).first()
+        if holder is None:  # 그 사이 풀렸으면 다시 시도
+            return self._acquire(key)
+        return False, holder
+
+    def _renew(self, key, token):
+        """lease 연장, 잠금이 아직 이 실행(token)의 것이면 True"""
+        try:
+            return bool(FlightLock.objects.filter(key=self._lock_key(key), token=token).update(
+                expires_at=timezone.now() + timedelta(seconds=self.lease)
+            ))
+        except DatabaseError as e:
+            print(f"⚠️ 합치기 잠금 연장 실패 [{self.namespace}]: {e}")
+            return True  # 일시적인 오류일 수 있으니 다음 주기에 다시 시도
+
+    def _release(self, key, token):
+        try:
+            FlightLock.objects.filter(key=self._lock_key(key), token=token).delete()
+        except DatabaseError as e:
+            print(f"⚠️ 합치기 잠금 해제 실패 [{self.namespace}]: {e}")
+
+
+# URL 분석 (정규화된 URL 기준, gunicorn timeout 보다 짧게)
+analysis_flight = SingleFlight("analysis", timeout_setting="SINGLEFLIGHT_ANALYSIS_TIMEOUT", default_timeout=90)
+# 관련 기사 검색 (검색 엔진 + 키워드 기준)
+search_flight = SingleFlight("search", timeout_setting="SINGLEFLIGHT_SEARCH_TIMEOUT", default_timeout=20)
@@ -1,3 +1,478 @@
-from django.test import TestCase
+import re
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import mock
 
-# Create your tests here.
+import torch
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from requests.structures import CaseInsensitiveDict
+
+from .cache import SharedLRUCache, make_cache_key
+from .deadline import Deadline, DeadlineExceeded, make_deadline, timeout_for
+from .fetch_strategy import record_fetch
+from .http_client import _is_storable, _max_age, cached_get, get_http_cache
+from .inference import BatchingClassifier, aggregate_chunk_probs
+from .jobs import claim_next_job, requeue_stale_jobs
+from .media_registry import DEFAULT_MEDIA_OUTLETS, MediaRegistry, build_index
+from .models import AnalysisJob, CacheEntry, DomainFetchStrategy, FlightLock, MediaOutlet
+from .near_duplicates import NearDuplicateLookup
+from .patterns import COMMERCIAL_PATTERNS, SENSATIONAL_WORDS, PatternMatcher
+from .pipeline import Stage, run_stages
+from .singleflight import SingleFlight, analysis_flight
+from .views import analysis_flight_key, analyze_with_cache, calculate_final_score, canonicalize_url
+
+
+class CanonicalizeUrlTests(SimpleTestCase):
+    def test_same_article_links_share_a_key(self):
+        variants = [
+            "https://www.Example.com/news/1/?b=2&a=1",
+            "http://example.com/news/1?a=1&b=2#comments",
+            "https://example.com:443/news/1?utm_source=kakao&a=1&fbclid=xyz&b=2",
+        ]
+        self.assertEqual({canonicalize_url(u) for u in variants}, {"example.com/news/1?a=1&b=2"})
+
+    def test_keeps_meaningful_differences(self):
+        self.assertEqual(canonicalize_url("http://example.com:8080/"), "example.com:8080/")
+        self.assertNotEqual(canonicalize_url("https://example.com/news?id=1"),
+                            canonicalize_url("https://example.com/news?id=2"))
+
+
+@override_settings(TEST_CACHE_TTL=60, TEST_CACHE_MAX_ENTRIES=2, CACHE_EVICT_EVERY=1, CACHE_TOUCH_INTERVAL=0)
+class SharedLRUCacheTests(TestCase):
+    def setUp(self):
+        self.cache = SharedLRUCache("test", ttl_setting="TEST_CACHE_TTL", max_entries_setting="TEST_CACHE_MAX_ENTRIES")
+
+    def _age(self, key, seconds, field="created_at"):
+        CacheEntry.objects.filter(namespace="test", key=make_cache_key(key)).update(
+            **{field: timezone.now() - timedelta(seconds=seconds)}
+        )
+
+    def test_get_returns_value_and_age(self):
+        self.cache.set("a", {"x": 1})
+        value, age = self.cache.get("a")
+        self.assertEqual(value, {"x": 1})
+        self.assertLess(age, 5)
+
+    def test_expired_entry_is_a_miss_and_removed(self):
+        self.cache.set("a", 1)
+        self._age("a", 120)
+        self.assertIsNone(self.cache.get("a"))
+        self.assertFalse(CacheEntry.objects.filter(namespace="test").exists())
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self._age("a", 30, "accessed_at")
+        self._age("b", 20, "accessed_at")
+        self.cache.get("a")  # a 가 가장 최근에 조회됨
+        self.cache.set("c", 3)
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("c"))
+
+    @override_settings(CACHE_EVICT_EVERY=3, TEST_CACHE_MAX_ENTRIES=1)
+    def test_eviction_runs_every_n_sets(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.assertEqual(CacheEntry.objects.filter(namespace="test").count(), 2)
+        self.cache.set("c", 3)
+        self.assertEqual(CacheEntry.objects.filter(namespace="test").count(), 1)
+
+    @override_settings(CACHE_TOUCH_INTERVAL=60)
+    def test_recent_hit_does_not_rewrite_accessed_at(self):
+        self.cache.set("a", 1)
+        before = CacheEntry.objects.get(namespace="test").accessed_at
+        self.cache.get("a")
+        self.assertEqual(CacheEntry.objects.get(namespace="test").accessed_at, before)
+
+
+class RunStagesTests(SimpleTestCase):
+    def test_runs_in_dependency_order(self):
+        order = []
+        stages = [
+            Stage("total", lambda a, b: a + b, deps=["a", "b"]),
+            Stage("b", lambda a: a * 10, deps=["a"]),
+            Stage("a", lambda: 1),
+        ]
+        run = run_stages(stages, on_stage_done=lambda name, *_: order.append(name))
+        self.assertEqual(order, ["a", "b", "total"])
+        self.assertEqual(run.results["total"], 11)
+
+    def test_failed_stage_uses_default(self):
+        def broken():
+            raise RuntimeError("boom")
+
+        run = run_stages([Stage("a", broken, default=0), Stage("b", lambda a: a + 1, deps=["a"])])
+        self.assertEqual(run.results, {"a": 0, "b": 1})
+        self.assertIn("boom", run.errors["a"])
+
+
+class WindowBatchTests(SimpleTestCase):
+    class FakeTokenizer:
+        def pad(self, encodings, padding=True, return_tensors=None):
+            return encodings
+
+    def _classifier(self, max_batch_size):
+        forwards = []
+
+        def backend(rows):
+            forwards.append(len(rows))
+            return torch.zeros(len(rows), 2)
+
+        classifier = BatchingClassifier(backend, self.FakeTokenizer(), max_batch_size=max_batch_size, max_wait_ms=50)
+        return classifier, forwards
+
+    def test_batches_never_exceed_row_limit(self):
+        classifier, forwards = self._classifier(4)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(classifier.predict_proba([0, 1, 2]))) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+        self.assertEqual([len(r) for r in results], [3, 3, 3])
+        self.assertTrue(forwards and max(forwards) <= 4, forwards)
+
+    def test_article_with_many_windows_is_split(self):
+        for max_batch_size in (1, 4):
+            classifier, forwards = self._classifier(max_batch_size)
+            self.assertEqual(len(classifier.predict_proba(list(range(6)))), 6)
+            self.assertTrue(max(forwards) <= max_batch_size, forwards)
+
+    def test_confidence_aggregation_favours_confident_windows(self):
+        prob_true, prob_fake = aggregate_chunk_probs([[0.9, 0.1], [0.4, 0.6]], "confidence")
+        self.assertGreater(prob_true, aggregate_chunk_probs([[0.9, 0.1], [0.4, 0.6]], "mean")[0])
+        self.assertAlmostEqual(prob_true + prob_fake, 1)
+
+
+class PatternMatcherTests(SimpleTestCase):
+    TEXT = (
+        "[속보] 충격 실화! 역대급 반전 끝에 결국 논란... 단독보도에 네티즌 경악, 헐 미쳤다. "
+        "지금 바로 할인 쿠폰 받고 회원 가입하면 포인트 혜택, 구매하기 클릭 https://bit.ly/abc AD 제공: coupang.com"
+    )
+
+    def _baseline(self, patterns, flags=0, literal=False):
+        found = {}
+        for p in patterns:
+            positions = [m.start() for m in re.finditer(re.escape(p) if literal else p, self.TEXT, flags)]
+            if positions:
+                found[p] = positions
+        return found
+
+    def test_sensational_matches_baseline(self):
+        matcher = PatternMatcher(SENSATIONAL_WORDS, literal=True)
+        self.assertEqual(matcher.scan(self.TEXT), self._baseline(SENSATIONAL_WORDS, literal=True))
+
+    def test_commercial_matches_baseline(self):
+        matcher = PatternMatcher(COMMERCIAL_PATTERNS, flags=re.IGNORECASE)
+        self.assertEqual(matcher.scan(self.TEXT), self._baseline(COMMERCIAL_PATTERNS, flags=re.IGNORECASE))
+
+    def test_patterns_starting_at_same_position(self):
+        matcher = PatternMatcher(["단독", "단독보도"], literal=True)
+        self.assertEqual(matcher.scan("오늘 단독보도"), {"단독": [3], "단독보도": [3]})
+        self.assertFalse(matcher.search("보도"))
+
+
+@override_settings(MEDIA_REGISTRY_CHECK_INTERVAL=3600)
+class MediaRegistryTests(SimpleTestCase):
+    def setUp(self):
+        self.registry = MediaRegistry()
+        self.registry._index = build_index(MediaOutlet(**outlet) for outlet in DEFAULT_MEDIA_OUTLETS)
+        self.registry._checked_at = time.monotonic()
+
+    def _lookup(self, name, domain=None):
+        outlet, matched_by = self.registry.lookup(name, domain)
+        return (outlet["name"] if outlet else None), matched_by
+
+    def test_domain_and_name_lookup(self):
+        self.assertEqual(self._lookup("", "news.kbs.co.kr"), ("KBS", "domain"))
+        self.assertEqual(self._lookup("조선일보 | 뉴스"), ("조선일보", "name"))
+        self.assertEqual(self._lookup("한경"), ("한국경제", "name"))
+
+    def test_variants_of_canonical_names(self):
+        self.assertEqual(self._lookup("연합뉴스TV"), ("연합뉴스", "partial"))
+        self.assertEqual(self._lookup("KBS World"), ("KBS", "partial"))
+        self.assertEqual(self._lookup("부산MBC"), ("MBC", "partial"))
+
+    def test_unrelated_outlets_do_not_match_aliases(self):
+        for name in ("대한경제", "경향게임스", "한경비즈니스", "매경이코노미", "이상한신문"):
+            self.assertEqual(self._lookup(name), (None, None), name)
+
+
+@override_settings(JOB_STALE_SECONDS=300, JOB_MAX_ATTEMPTS=2)
+class JobQueueTests(TestCase):
+    def _job(self, minutes_ago, **fields):
+        job = AnalysisJob.objects.create(url="https://example.com/a", canonical_url="example.com/a", **fields)
+        AnalysisJob.objects.filter(pk=job.pk).update(created_at=timezone.now() - timedelta(minutes=minutes_ago))
+        return job
+
+    def test_claims_oldest_queued_job_once(self):
+        newer = self._job(1)
+        older = self._job(5)
+        first = claim_next_job("w1")
+        self.assertEqual(first.pk, older.pk)
+        self.assertEqual((first.status, first.worker, first.attempts), (AnalysisJob.RUNNING, "w1", 1))
+        self.assertEqual(claim_next_job("w2").pk, newer.pk)
+        self.assertIsNone(claim_next_job("w3"))
+
+    def test_requeues_or_fails_stale_jobs(self):
+        old = timezone.now() - timedelta(seconds=600)
+        retry = self._job(10, status=AnalysisJob.RUNNING, attempts=1, heartbeat_at=old)
+        give_up = self._job(10, status=AnalysisJob.RUNNING, attempts=2, heartbeat_at=old)
+        alive = self._job(10, status=AnalysisJob.RUNNING, attempts=1, heartbeat_at=timezone.now())
+        requeue_stale_jobs()
+        statuses = dict(AnalysisJob.objects.values_list("pk", "status"))
+        self.assertEqual(statuses[retry.pk], AnalysisJob.QUEUED)
+        self.assertEqual(statuses[give_up.pk], AnalysisJob.FAILED)
+        self.assertEqual(statuses[alive.pk], AnalysisJob.RUNNING)
+
+
+class HttpCacheHeaderTests(SimpleTestCase):
+    def _response(self, status=200, **headers):
+        response = type("Response", (), {})()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict({k.replace("_", "-"): v for k, v in headers.items()})
+        return response
+
+    def test_freshness_subtracts_age_and_ignores_no_cache(self):
+        self.assertEqual(_max_age({"Cache-Control": "public, max-age=300"}), 300)
+        self.assertEqual(_max_age({"Cache-Control": "max-age=300", "Age": "120"}), 180)
+        self.assertEqual(_max_age({"Cache-Control": "no-cache, max-age=300"}), 0)
+
+    def test_private_and_vary_star_are_not_stored(self):
+        self.assertTrue(_is_storable(self._response(Cache_Control="max-age=60")))
+        self.assertTrue(_is_storable(self._response(Cache_Control="no-cache", ETag='"v1"')))
+        self.assertFalse(_is_storable(self._response(Cache_Control="private, max-age=60")))
+        self.assertFalse(_is_storable(self._response(Cache_Control="max-age=60", Vary="*")))
+        self.assertFalse(_is_storable(self._response(Cache_Control="no-store", ETag='"v1"')))
+
+
+@override_settings(METRICS_ENABLED=False, HTTP_CACHE_ENABLED=True)
+class CachedGetTests(SimpleTestCase):
+    def setUp(self):
+        responses = self.responses = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, headers = responses.pop(0)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                if status == 200:
+                    self.wfile.write(b"ok")
+
+            def log_message(self, *args):
+                pass
+
+        self.server = HTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/article"
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        settings_override = override_settings(HTTP_CACHE_DIR=cache_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def _stored(self):
+        return get_http_cache().load(f"{self.url}\x1f")
+
+    def test_no_cache_entry_is_revalidated(self):
+        self.responses += [(200, {"Cache-Control": "no-cache, max-age=600", "ETag": '"v1"'}), (304, {"ETag": '"v1"'})]
+        cached_get(self.url)
+        self.assertEqual(cached_get(self.url).text, "ok")
+        self.assertEqual(self.responses, [])  # 두 번 다 서버에 물어봄
+
+    def test_unstorable_response_drops_old_entry(self):
+        self.responses += [(200, {"ETag": '"v1"'}), (200, {"Cache-Control": "no-store"})]
+        cached_get(self.url)
+        self.assertIsNotNone(self._stored())
+        cached_get(self.url)
+        self.assertIsNone(self._stored())
+
+
+class FetchStrategyTests(TestCase):
+    def test_counts_saving_only_when_browser_succeeds(self):
+        record_fetch("example.com", static_ok=False, static_ms=4000.0, browser_ok=True)
+        record_fetch("example.com", static_ok=None, browser_ok=False)
+        row = DomainFetchStrategy.objects.get(domain="example.com")
+        self.assertEqual((row.static_skipped, row.time_saved_ms), (0, 0))
+
+        record_fetch("example.com", static_ok=None, browser_ok=True)
+        row.refresh_from_db()
+        self.assertEqual((row.static_attempts, row.browser_attempts), (1, 3))
+        self.assertEqual((row.static_skipped, row.time_saved_ms), (1, 4000.0))
+
+
+class NearDuplicateReuseTests(SimpleTestCase):
+    def test_only_reusable_stages_are_seeded(self):
+        lookup = NearDuplicateLookup(fingerprint=1)
+        lookup.match = {
+            "url": "example.com/a", "title": "원본", "distance": 1, "age_seconds": 1.0,
+            "results": {"gpt": {}, "ai_model": {}, "cross_check": {}, "related_articles": [{"title": "원본"}]},
+        }
+        self.assertEqual(sorted(lookup.seeded), ["ai_model", "cross_check", "gpt"])
+
+    def test_seeded_stage_is_not_executed(self):
+        def must_not_run():
+            raise AssertionError("seeded stage ran")
+
+        run = run_stages([Stage("a", must_not_run), Stage("b", lambda a: a + 1, deps=["a"])], seeded={"a": 41})
+        self.assertEqual(run.results["b"], 42)
+        self.assertEqual(run.seeded, ["a"])
+
+
+class SingleFlightTests(TestCase):
+    def setUp(self):
+        self.flight = SingleFlight("test", timeout_setting="TEST_FLIGHT_TIMEOUT", default_timeout=5)
+
+    def test_concurrent_calls_share_one_execution(self):
+        calls = []
+        followers = []
+        shared_results = []
+
+        def follow():
+            shared_results.append(self.flight.do("k", lambda: calls.append("follower") or "own"))
+
+        def lead():
+            calls.append("leader")
+            followers.extend(threading.Thread(target=follow) for _ in range(3))
+            for t in followers:
+                t.start()
+            time.sleep(0.3)  # 뒤따르는 호출이 진행 중인 실행을 기다리도록
+            return "value"
+
+        self.assertEqual(self.flight.do("k", lead), ("value", False))
+        for t in followers:
+            t.join(5)
+        self.assertEqual(calls, ["leader"])
+        self.assertEqual(shared_results, [("value", True)] * 3)
+        self.assertFalse(FlightLock.objects.exists())
+
+    def test_follower_waits_only_for_its_own_budget(self):
+        results = []
+
+        def lead():
+            follower = threading.Thread(
+                target=lambda: results.append(self.flight.do("k", lambda: "own", deadline=Deadline(0.2)))
+            )
+            started = time.monotonic()
+            follower.start()
+            follower.join(5)
+            results.append(time.monotonic() - started)
+            return "value"
+
+        self.assertEqual(self.flight.do("k", lead), ("value", False))
+        self.assertEqual(results[0], ("own", False))
+        self.assertLess(results[1], 1)
+
+    def test_refresh_requests_use_their_own_flight(self):
+        self.assertNotEqual(analysis_flight_key("example.com/a", True), analysis_flight_key("example.com/a", False))
+
+    @override_settings(SINGLEFLIGHT_LEASE_SECONDS=30)
+    def test_other_process_waits_until_lease_expires(self):
+        other = SingleFlight("test", timeout_setting="TEST_FLIGHT_TIMEOUT", default_timeout=5)
+        acquired, token = self.flight._acquire("k")
+        self.assertTrue(acquired)
+        self.assertEqual(other._acquire("k"), (False, token))
+
+        FlightLock.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertTrue(self.flight._renew("k", token))  # 실행 중이면 연장되어 넘겨주지 않는다
+        self.assertEqual(other._acquire("k"), (False, token))
+
+        FlightLock.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        taken, new_token = other._acquire("k")
+        self.assertTrue(taken)
+        self.assertNotEqual(new_token, token)
+        self.assertFalse(self.flight._renew("k", token))
+
+
+class DeadlineStageTests(SimpleTestCase):
+    def test_optional_stage_skipped_without_budget(self):
+        stages = [
+            Stage("slow", lambda: "ran", default="skipped", optional=True, min_budget=10),
+            Stage("after", lambda slow: slow, deps=["slow"]),
+        ]
+        run = run_stages(stages, deadline=Deadline(1))
+        self.assertEqual(run.skipped, {"slow": "budget"})
+        self.assertEqual(run.results["after"], "skipped")
+
+    def test_running_optional_stage_abandoned_at_deadline(self):
+        release = threading.Event()
+        stages = [
+            Stage("slow", lambda: release.wait(5), default=None, optional=True),
+            Stage("fast", lambda: "ok"),
+        ]
+        started = time.monotonic()
+        try:
+            run = run_stages(stages, deadline=Deadline(0.2))
+        finally:
+            release.set()
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(run.skipped, {"slow": "deadline"})
+        self.assertEqual(run.results["fast"], "ok")
+
+
+class AnalysisDeadlineTests(TestCase):
+    @override_settings(ANALYSIS_DEADLINE_MIN_SECONDS=0.1)
+    def test_waiting_for_running_analysis_shares_the_request_budget(self):
+        results = []
+
+        def follow():
+            started = time.monotonic()
+            results.append(analyze_with_cache("https://example.com/a", force_refresh=True, deadline_seconds=0.2))
+            results.append(time.monotonic() - started)
+
+        def lead():
+            follower = threading.Thread(target=follow)
+            follower.start()
+            follower.join(5)
+            return [200, {"success": True, "data": {}}]
+
+        with mock.patch("api.views.analyze_url", return_value={"skipped_stages": ["gpt"]}):
+            analysis_flight.do(analysis_flight_key("example.com/a", True), lead)
+        self.assertEqual(results[0], (200, {"success": True, "data": {"skipped_stages": ["gpt"]}}))
+        self.assertLess(results[1], 1)
+
+
+@override_settings(ANALYSIS_DEADLINE_SECONDS=45, ANALYSIS_DEADLINE_MIN_SECONDS=5, ANALYSIS_DEADLINE_MAX_SECONDS=90)
+class MakeDeadlineTests(SimpleTestCase):
+    def test_request_budget_is_clamped(self):
+        self.assertEqual(make_deadline().budget, 45)
+        self.assertEqual(make_deadline("1").budget, 5)
+        self.assertEqual(make_deadline(600).budget, 90)
+        self.assertEqual(make_deadline("nan").budget, 45)
+
+    def test_timeout_is_capped_by_remaining_budget(self):
+        deadline = Deadline(2)
+        self.assertEqual(timeout_for(None, 5), 5)
+        self.assertLessEqual(timeout_for(deadline, 5), 2)
+        deadline.expires_at = time.monotonic() - 1
+        with self.assertRaises(DeadlineExceeded):
+            timeout_for(deadline, 5)
+
+
+class FinalScoreTests(SimpleTestCase):
+    SCORES = {
+        "gpt_score": 0, "ai_model_score": 100, "media_trust_score": 100, "cross_check_score": 100,
+        "sensational_score": 100, "commercial_score": 100, "date_freshness_score": 100,
+    }
+
+    def test_excluded_scores_are_renormalized(self):
+        result = calculate_final_score(self.SCORES, excluded=("gpt_score",))
+        self.assertNotIn("gpt_score", result["weights"])
+        self.assertAlmostEqual(sum(result["weights"].values()), 1.0, places=3)
+        self.assertAlmostEqual(result["final_score"], 100, places=1)
+        self.assertEqual(result["grade"], "A")
+
+    def test_without_exclusions_uses_base_weights(self):
+        result = calculate_final_score(self.SCORES)
+        self.assertEqual(result["weights"]["gpt_score"], 0.25)
+        self.assertEqual(result["final_score"], 75)
@@ -1,10 +1,28 @@
 # api/urls.py (새로 만드는 파일)
 
+from django.conf import settings
 from django.urls import path
 from . import views  # views.py 파일 import
+from . import async_views
 
 
 urlpatterns = [
     # ★★★ /api/analyze/ 요청을 views.AnalyzeView로 연결합니다. ★★★
     path('analyze/', views.AnalyzeView.as_view(), name='analyze_api'),
-]
\ No newline at end of file
+    # 여러 URL 을 한 번에 분석하고 결과를 NDJSON 으로 스트리밍
+    path('analyze/batch/', views.AnalyzeBatchView.as_view(), name='analyze_batch_api'),
+    # 단계가 끝날 때마다 결과를 Server-Sent Events 로 전송
+    path('analyze/stream/', views.AnalyzeStreamView.as_view(), name='analyze_stream_api'),
+    # 작업 큐: 등록 후 바로 작업 id 반환, 결과는 폴링으로 조회 (python manage.py run_analysis_workers)
+    path('jobs/', views.JobCreateView.as_view(), name='job_create_api'),
+    path('jobs/<uuid:job_id>/', views.JobDetailView.as_view(), name='job_detail_api'),
+    # 도메인별 기사 수집 전략(requests/브라우저) 통계
+    path('fetch-strategies/', views.FetchStrategyStatsView.as_view(), name='fetch_strategy_stats_api'),
+    # 단계별 처리 시간/오류/캐시 적중 지표 (Prometheus 수집 경로)
+    path('metrics', views.MetricsView.as_view(), name='metrics_api'),
+]
+
+# 같은 기능의 비동기 버전 (ASGI 서버에서만 등록)
+# WSGI 에서는 요청마다 새 이벤트 루프가 생겨 루프별 브라우저/HTTP 클라이언트가 닫히지 않고 쌓인다.
+if settings.SERVER_INTERFACE == 'asgi':
+    urlpatterns.append(path('analyze/async/', async_views.AsyncAnalyzeView.as_view(), name='analyze_async_api'))
\ No newline at end of file
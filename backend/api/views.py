@@ -1,20 +1,24 @@
 import os 
 import json
-from urllib.parse import urlparse
-import requests
-from bs4 import BeautifulSoup
+import unicodedata
+from urllib.parse import urlparse, parse_qsl, urlencode
 from dateutil import parser as date_parser
 import re
-import torch 
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
 # dotenv 로드
 load_dotenv() 
 
-# Playwright
-from playwright.sync_api import sync_playwright
+# Playwright (워커별 브라우저 풀)
+from .browser_pool import block_resources, get_browser_pool, wait_for_content
 
-from django.http import JsonResponse
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from rest_framework.views import APIView 
 from rest_framework.throttling import AnonRateThrottle
 from django.utils.decorators import method_decorator
@@ -22,6 +26,22 @@ from django.views.decorators.csrf import csrf_exempt
 
 from openai import OpenAI
 
+from . import metrics
+from .cache import analysis_cache, llm_cache, make_cache_key
+from .deadline import DeadlineExceeded, make_deadline, raise_if_expired, timeout_for
+from .embeddings import embedding_cross_check
+from .extractors import extract_article, get_extractor, make_soup
+from .keywords import extract_keywords
+from .fetch_strategy import plan_fetch, record_fetch, strategy_stats
+from .http_client import cached_get
+from .jobs import QueueFullError, job_payload, record_cached_job, submit_job
+from .media_registry import media_registry
+from .models import AnalysisJob
+from .near_duplicates import find_near_duplicate, remember_article
+from .patterns import get_pattern_matchers, summarize_matches
+from .pipeline import Stage, run_stages
+from .singleflight import analysis_flight, search_flight
+
 # API 키 설정 (지연 초기화)
 _client = None
 
@@ -31,7 +51,8 @@ def get_openai_client():
     if _client is None:
         api_key = os.environ.get("OPENAI_API_KEY")
         if api_key:
-            _client = OpenAI(api_key=api_key)
+            # OPENAI_BASE_URL: OpenAI 호환 서버 주소 (벤치마크용 로컬 대체 서버 등, 비우면 기본 주소)
+            _client = OpenAI(api_key=api_key, base_url=getattr(settings, 'OPENAI_BASE_URL', '') or None)
         else:
             _client = None  # API 키가 없으면 None 반환
     return _client
@@ -46,310 +67,301 @@ def normalize_text(text):
     return re.sub(r'\s+|[^\w]', '', text)
 
 
-def get_gpt_prediction(title, text):
-    """GPT 모델 분석 + 키워드 추출"""
+# --- 헬퍼 함수: LLM 결과 캐시 (api/cache.py 의 llm_cache) ---
+def normalize_llm_input(text):
+    """전각/반각과 공백 차이만 다른 같은 기사가 같은 요청(= 같은 캐시 키)이 되도록 정리"""
+    return " ".join(unicodedata.normalize("NFKC", text or "").split())
+
+
+def llm_cache_key(kind, prompt_version, request):
+    """모델 + 프롬프트 버전 + 실제로 보내는 메시지(정규화된 입력 포함) 의 해시"""
+    return make_cache_key(
+        kind, prompt_version, request["model"], request.get("temperature"),
+        json.dumps(request["messages"], ensure_ascii=False),
+    )
+
+
+def llm_timeout(deadline):
+    """OpenAI 호출 timeout(초): OPENAI_TIMEOUT_SECONDS 와 남은 예산 중 작은 값"""
+    return timeout_for(deadline, getattr(settings, 'OPENAI_TIMEOUT_SECONDS', 30))
+
+
+def get_cached_llm_result(key):
+    """캐시에 있으면 결과에 cached=True 를 붙여 반환 (없으면 None)"""
+    hit = llm_cache.get(key)
+    metrics.record_cache("llm", hit is not None)
+    if hit is None:
+        return None
+    return dict(hit[0], cached=True)
+
+
+# 프롬프트나 결과 파싱을 바꾸면 올려서 이전 캐시를 쓰지 않게 한다
+GPT_PROMPT_VERSION = 1
+
+GPT_SYSTEM_PROMPT = """
+당신은 뉴스 기사의 신뢰도를 평가하는 '팩트체크 AI'입니다.
+제공된 기사를 분석하여 JSON 형식으로 답하세요.
+
+[응답 형식]
+{
+    "prediction": "True" 또는 "Fake",
+    "score": 0~100 (높을수록 진실, 정확한 숫자로),
+    "reason": "판단 이유를 한국어로 2문장 요약",
+    "keywords": "검색용 핵심 키워드 2~3개를 띄어쓰기로 구분하여 한 줄로 작성 (예: 비트코인 폭락 전망)" 
+}
+"""
+
+
+def build_gpt_request(title, text):
+    """GPT 분석 요청 파라미터 (동기/비동기 클라이언트 공용)"""
+    truncated_text = normalize_llm_input(text)[:3000]
+    title = normalize_llm_input(title)
+    return {
+        "model": "gpt-4o-mini",
+        "messages": [
+            {"role": "system", "content": GPT_SYSTEM_PROMPT},
+            {"role": "user", "content": f"제목: {title}\n본문: {truncated_text}"}
+        ],
+        "response_format": {"type": "json_object"},
+        "temperature": 0.1,
+    }
+
+
+def parse_gpt_result(content):
+    result = json.loads(content)
+    result["model_type"] = "GPT-4o-mini"
+    
+    # score가 없거나 잘못된 경우 기본값 설정
+    if "score" not in result or not isinstance(result["score"], (int, float)):
+        result["score"] = 50
+        
+    return result
+
+
+def get_gpt_prediction(title, text, deadline=None):
+    """GPT 모델 분석 + 키워드 추출 (예산이 끝나 응답을 못 받으면 DeadlineExceeded)"""
     client = get_openai_client()
     if not client:
         return {"error": "API 키 설정 오류", "prediction": "Error", "score": 0}
         
+    request = build_gpt_request(title, text)
+    cache_key = llm_cache_key("gpt", GPT_PROMPT_VERSION, request)
+    cached = get_cached_llm_result(cache_key)
+    if cached:
+        return cached
+
     try:
-        truncated_text = text[:3000]
-        
-        system_prompt = """
-        당신은 뉴스 기사의 신뢰도를 평가하는 '팩트체크 AI'입니다.
-        제공된 기사를 분석하여 JSON 형식으로 답하세요.
-        
-        [응답 형식]
-        {
-            "prediction": "True" 또는 "Fake",
-            "score": 0~100 (높을수록 진실, 정확한 숫자로),
-            "reason": "판단 이유를 한국어로 2문장 요약",
-            "keywords": "검색용 핵심 키워드 2~3개를 띄어쓰기로 구분하여 한 줄로 작성 (예: 비트코인 폭락 전망)" 
-        }
-        """
-        
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"제목: {title}\n본문: {truncated_text}"}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.1
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        result["model_type"] = "GPT-4o-mini"
-        
-        # score가 없거나 잘못된 경우 기본값 설정
-        if "score" not in result or not isinstance(result["score"], (int, float)):
-            result["score"] = 50
-            
+        response = client.chat.completions.create(**request, timeout=llm_timeout(deadline))
+        result = parse_gpt_result(response.choices[0].message.content)
+        llm_cache.set(cache_key, result)
         return result
         
     except Exception as e:
+        raise_if_expired(deadline, e)
         print(f"GPT Error: {e}")
         return {"error": str(e), "prediction": "Error", "score": 0}
 
 
 # 관련 기사 추출 (네이버)
-def get_related_articles(keyword):
+NAVER_HEADERS = {"User-Agent": "Mozilla/5.0"}
+NAVER_SNIPPET_SELECTORS = "div.news_dsc, a.api_txt_lines.dsc_txt_wrap"
+
+
+def naver_search_url(keyword):
+    base_url = getattr(settings, 'NAVER_SEARCH_URL', 'https://search.naver.com/search.naver')
+    return f"{base_url}?where=news&query={keyword}&sm=tab_opt&sort=1&photo=0&field=0&pd=0&ds=&de=&docid=&related=0&mynews=0&office_type=0&office_section_code=0&news_office_checked=&nso=so%3Add%2Cp%3Aall&is_sug_officeid=0"
+
+
+def parse_naver_results(html):
+    """네이버 뉴스 검색 결과 HTML -> 기사 목록 (최대 5개)"""
+    soup = make_soup(html)
+    
+    articles = []
+    news_items = soup.select("div.news_wrap.api_ani_send")
+    
+    for item in news_items[:5]:
+        try:
+            title_tag = item.select_one("a.news_tit")
+            if not title_tag: continue
+            
+            link = title_tag['href']
+            title = title_tag.get_text().strip()
+            
+            img_tag = item.select_one("img.thumb")
+            img_url = img_tag['data-lazysrc'] if img_tag and 'data-lazysrc' in img_tag.attrs else None
+            if not img_url and img_tag: img_url = img_tag.get('src')
+
+            press_tag = item.select_one("a.info.press")
+            press = press_tag.get_text().strip() if press_tag else "알수없음"
+
+            # 검색 결과 요약 (임베딩 크로스체크에 제목과 함께 사용)
+            snippet_tag = item.select_one(NAVER_SNIPPET_SELECTORS)
+            snippet = snippet_tag.get_text(separator=" ").strip() if snippet_tag else ""
+
+            articles.append({
+                "title": title,
+                "link": link,
+                "press": press,
+                "thumbnail": img_url,
+                "snippet": snippet,
+                "source": "Naver"
+            })
+        except: continue     
+    return articles
+
+
+def get_related_articles(keyword, deadline=None):
     if not keyword: return []
 
-    try:
-        search_url = f"https://search.naver.com/search.naver?where=news&query={keyword}&sm=tab_opt&sort=1&photo=0&field=0&pd=0&ds=&de=&docid=&related=0&mynews=0&office_type=0&office_section_code=0&news_office_checked=&nso=so%3Add%2Cp%3Aall&is_sug_officeid=0"
-        headers = {"User-Agent": "Mozilla/5.0"}
-        
-        response = requests.get(search_url, headers=headers, timeout=5)
-        soup = BeautifulSoup(response.text, "html.parser")
-        
-        articles = []
-        news_items = soup.select("div.news_wrap.api_ani_send")
-        
-        for item in news_items[:5]:
-            try:
-                title_tag = item.select_one("a.news_tit")
-                if not title_tag: continue
-                
-                link = title_tag['href']
-                title = title_tag.get_text().strip()
-                
-                img_tag = item.select_one("img.thumb")
-                img_url = img_tag['data-lazysrc'] if img_tag and 'data-lazysrc' in img_tag.attrs else None
-                if not img_url and img_tag: img_url = img_tag.get('src')
-
-                press_tag = item.select_one("a.info.press")
-                press = press_tag.get_text().strip() if press_tag else "알수없음"
-
-                articles.append({
-                    "title": title,
-                    "link": link,
-                    "press": press,
-                    "thumbnail": img_url,
-                    "source": "Naver"
-                })
-            except: continue     
-        return articles
+    def search():
+        try:
+            # 남은 예산이 5초보다 적으면 그만큼만 기다린다 (예산이 없으면 빈 결과)
+            response = cached_get(naver_search_url(keyword), headers=NAVER_HEADERS, timeout=timeout_for(deadline, 5))
+            return parse_naver_results(response.text)
 
-    except Exception as e:
-        print(f"관련 기사 검색 실패: {e}")
-        return []
+        except Exception as e:
+            print(f"관련 기사 검색 실패: {e}")
+            return []
+
+    # 같은 키워드 검색이 이미 진행 중이면 그 결과를 함께 쓴다 (워커 간 포함)
+    articles, _ = search_flight.do(f"naver:{keyword}", search, deadline=deadline)
+    return articles
 
 
 # 관련 기사 추출 (구글)
-def get_google_news(keyword):
-    """Playwright를 사용하여 구글 뉴스 탭 검색 결과를 가져옵니다."""
-    if not keyword:
-        return []
+GOOGLE_CONTEXT_OPTIONS = {
+    "user_agent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36',
+    "viewport": {'width': 1280, 'height': 800},
+}
+
+
+def google_news_url(keyword):
+    base_url = getattr(settings, 'GOOGLE_SEARCH_URL', 'https://www.google.com/search')
+    return f"{base_url}?q={keyword}&tbm=nws&hl=ko&gl=KR"
+
+
+# 구글 뉴스 탭 검색 결과 항목 선택자 (브라우저 대기 조건으로도 사용)
+GOOGLE_RESULT_SELECTORS = ('div.SoaBEf', 'div.MjjYud')
+GOOGLE_SNIPPET_SELECTORS = '.GI74Re, .Y3v8qd'  # 검색 결과 요약
+
+
+def ready_timeout_ms(deadline):
+    """브라우저 선택자 대기 상한(ms): PLAYWRIGHT_READY_TIMEOUT_MS 와 남은 예산 중 작은 값"""
+    return timeout_for(deadline, getattr(settings, 'PLAYWRIGHT_READY_TIMEOUT_MS', 3000) / 1000) * 1000
+
+
+def parse_google_results(html):
+    """구글 뉴스 탭 HTML -> 기사 목록 (최대 5개)"""
+    soup = make_soup(html)
 
     articles = []
-    browser = None
-    try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True, args=["--disable-blink-features=AutomationControlled"])
-            context = browser.new_context(
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36',
-                viewport={'width': 1280, 'height': 800}
-            )
-            page = context.new_page()
+    news_elements = soup.select(', '.join(GOOGLE_RESULT_SELECTORS))
+
+    for item in news_elements:
+        if len(articles) >= 5: break
+        
+        try:
+            link_tag = item.select_one('a')
+            if not link_tag: continue
+            
+            link = link_tag.get('href') or ""
+            if not link.startswith('http'): continue
+
+            title_div = item.select_one('div[role="heading"]')
+            title = (title_div or link_tag).get_text(separator=" ").strip()
             
-            url = f"https://www.google.com/search?q={keyword}&tbm=nws&hl=ko&gl=KR"
-            page.goto(url, wait_until='domcontentloaded', timeout=10000)
-            page.wait_for_timeout(3000) 
+            if not title: continue
+
+            press_div = item.select_one('.MgUUmf span')
+            press = press_div.get_text().strip() if press_div else "Google News"
+
+            img_tag = item.select_one('img')
+            img = img_tag.get('src') if img_tag else None
+
+            snippet_div = item.select_one(GOOGLE_SNIPPET_SELECTORS)
+            snippet = snippet_div.get_text(separator=" ").strip() if snippet_div else ""
+
+            articles.append({
+                "title": title,
+                "link": link,
+                "press": press,
+                "thumbnail": img,
+                "snippet": snippet,
+                "source": "Google"
+            })
+        except:
+            continue
+    return articles
 
-            news_elements = page.query_selector_all('div.SoaBEf, div.MjjYud')
 
-            count = 0
-            for item in news_elements:
-                if count >= 5: break
-                
-                try:
-                    link_tag = item.query_selector('a')
-                    if not link_tag: continue
-                    
-                    link = link_tag.get_attribute('href')
-                    if not link.startswith('http'): continue
-
-                    title_div = item.query_selector('div[role="heading"]')
-                    title = title_div.inner_text() if title_div else link_tag.inner_text()
-                    
-                    if not title: continue
-
-                    press_div = item.query_selector('.MgUUmf span')
-                    press = press_div.inner_text() if press_div else "Google News"
-
-                    img_tag = item.query_selector('img')
-                    img = img_tag.get_attribute('src') if img_tag else None
-
-                    articles.append({
-                        "title": title,
-                        "link": link,
-                        "press": press,
-                        "thumbnail": img,
-                        "source": "Google"
-                    })
-                    count += 1
-                except:
-                    continue
-                    
-    except Exception as e:
-        print(f"⚠️ 구글 검색 건너뜀 (사유: {e})")
+def get_google_news(keyword, deadline=None):
+    """Playwright를 사용하여 구글 뉴스 탭 검색 결과를 가져옵니다. (예산이 끝나면 DeadlineExceeded)"""
+    if not keyword:
         return []
-        
-    finally:
-        if browser:
-            try: browser.close()
-            except: pass
-            
+
+    url = google_news_url(keyword)
+
+    def scrape(page):
+        block_resources(page)
+        page.goto(url, wait_until='domcontentloaded', timeout=timeout_for(deadline, 10) * 1000)
+        # 고정 3초 대기 대신 검색 결과가 뜨는 즉시 진행 (PLAYWRIGHT_READY_TIMEOUT_MS 상한)
+        wait_for_content(page, GOOGLE_RESULT_SELECTORS, timeout_ms=ready_timeout_ms(deadline))
+        return page.content()
+
+    def search():
+        try:
+            # 워커에 떠 있는 브라우저를 재사용 (context 는 작업마다 새로 생성)
+            html = get_browser_pool().run(scrape, context_options=GOOGLE_CONTEXT_OPTIONS, timeout=timeout_for(deadline, 30))
+            return parse_google_results(html)
+        except Exception as e:
+            raise_if_expired(deadline, e)
+            print(f"⚠️ 구글 검색 건너뜀 (사유: {e})")
+            return []
+
+    articles, _ = search_flight.do(f"google:{keyword}", search, deadline=deadline)
     return articles
 
 
 # --- 1. AI 모델 로딩 (로컬) ---
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-MODEL_PATH = os.environ.get("MODEL_DIRECTORY", "./my_fake_news_model") 
-
-try:
-    tokenizer = AutoTokenizer.from_pretrained(MODEL_PATH)
-    model = AutoModelForSequenceClassification.from_pretrained(MODEL_PATH)
-    model.eval()
-    print(f"✅ AI 모델 로딩 성공 ({MODEL_PATH})")
-except Exception as e:
-    print(f"❌ AI 모델 로딩 실패: {e}")
-    tokenizer = None
-    model = None
-
-
-# --- 2. 언론사 신뢰도 DB (확장 버전) ---
-MEDIA_TRUST_DB = {
-    "KBS": {"rank": 1, "score": 95, "category": "공영방송"},
-    "MBC": {"rank": 2, "score": 92, "category": "공영방송"},
-    "SBS": {"rank": 3, "score": 88, "category": "지상파"},
-    "YTN": {"rank": 4, "score": 85, "category": "뉴스전문"},
-    "JTBC": {"rank": 5, "score": 82, "category": "종편"},
-    "연합뉴스": {"rank": 6, "score": 90, "category": "통신사"},
-    "뉴스1": {"rank": 7, "score": 80, "category": "통신사"},
-    "조선일보": {"rank": 8, "score": 75, "category": "종합일간지"},
-    "중앙일보": {"rank": 9, "score": 75, "category": "종합일간지"},
-    "동아일보": {"rank": 10, "score": 75, "category": "종합일간지"},
-    "한겨레": {"rank": 11, "score": 75, "category": "종합일간지"},
-    "경향신문": {"rank": 12, "score": 75, "category": "종합일간지"},
-    "한국경제": {"rank": 13, "score": 70, "category": "경제지"},
-    "매일경제": {"rank": 14, "score": 70, "category": "경제지"},
-}
+# 모델 로딩과 배치 추론은 api/inference.py 에서 처리
+from .inference import get_fake_news_prediction
 
-def get_media_trust_score(publisher_name):
-    """언론사 신뢰도 점수 (0~100)"""
-    for key, value in MEDIA_TRUST_DB.items():
-        if key in publisher_name:
-            return {
-                "rank": value["rank"],
-                "score": value["score"],
-                "category": value["category"]
-            }
+
+# --- 2. 언론사 신뢰도 DB (api/media_registry.py, MediaOutlet 테이블) ---
+def get_media_trust_score(publisher_name, domain=None):
+    """언론사 신뢰도 점수 (0~100), 기사 도메인 -> 언론사 이름/별칭 순서로 조회"""
+    outlet, matched_by = media_registry.lookup(publisher_name, domain)
+    if outlet:
+        return {
+            "rank": outlet["rank"],
+            "score": outlet["score"],
+            "category": outlet["category"],
+            "outlet": outlet["name"],
+            "matched_by": matched_by
+        }
     # 순위권 외 언론사는 중간 점수
     return {"rank": None, "score": 60, "category": "순위권 외"}
 
 
-def extract_date_from_url(url):
-    match = re.search(r'(\d{4})[/-](\d{1,2})[/-](\d{1,2})', url)
-    if match: return f"{match.group(1)}-{match.group(2)}-{match.group(3)}"
-    match_compact = re.search(r'/(\d{4})(\d{2})(\d{2})/', url)
-    if match_compact: return f"{match_compact.group(1)}-{match_compact.group(2)}-{match_compact.group(3)}"
-    return None
-
-
 # --- 3. 기사 제목/본문 크롤링 ---
-def find_article_content(soup):
-    title = ""
-    text = ""
-    
-    # 1. 제목 추출 (조선일보 및 일반 사이트 호환성 강화)
-    # 조선일보는 보통 h1 태그를 씁니다.
-    if soup.find('h1'): 
-        title = soup.find('h1').get_text().strip()
-    
-    if not title:
-        title_tag = soup.select_one('h2.media_end_head_headline') or soup.select_one('h3.tit_view')
-        if title_tag: title = title_tag.get_text().strip()
-        
-    if not title:
-        og_title = soup.find('meta', {'property': 'og:title'})
-        if og_title and og_title.get('content'): title = og_title['content'].strip()
-
-    # 2. 본문 추출 (조선일보 선택자 추가)
-    # 우선순위: 네이버 -> 다음 -> 조선일보(section.article-body) -> 일반 article
-    article_body = (
-        soup.select_one('div#dic_area') or       # 네이버
-        soup.select_one('div.article_view') or   # 다음
-        soup.select_one('section.article-body') or # 조선일보 (핵심!)
-        soup.select_one('div.news_body_id') or   # 일부 언론사
-        soup.find('article')                     # 일반적인 HTML5 사이트
-    )
-
-    if article_body:
-        # 불필요한 스크립트나 스타일 제거
-        for script in article_body(["script", "style", "iframe"]):
-            script.decompose()
-        text = article_body.get_text(separator=" ").strip()
-    else:
-        # 만약 위의 container를 다 못 찾으면, 본문이라고 추정되는 긴 p 태그들을 긁어모음
-        paragraphs = soup.find_all('p')
-        # 너무 짧은 문장(메뉴 등)은 제외하고 50자 이상인 것만 수집
-        text = " ".join(p.get_text().strip() for p in paragraphs if len(p.get_text().strip()) > 30)
+# 파서 선택과 도메인별 추출기는 api/extractors.py 에서 처리 (extract_article)
 
-    return title, text
 
 # --- 4. AI 예측 (로컬) ---
-def get_fake_news_prediction(title, text):
-    """로컬 AI 모델 예측 (0~100 점수로 변환)"""
-    if not tokenizer or not model: 
-        return {
-            "error": "AI 모델 로딩 실패",
-            "score": 50,  # 기본값
-            "prediction": "Unknown"
-        }
-    
-    input_text = f"{title} [SEP] {text}"
-    inputs = tokenizer(input_text, return_tensors="pt", truncation=True, max_length=512, padding="max_length")
-    
-    with torch.no_grad(): 
-        outputs = model(**inputs)
-    
-    probs = torch.nn.functional.softmax(outputs.logits, dim=-1)
-    prob_true = probs[0][0].item()
-    prob_fake = probs[0][1].item()
-    
-    # True 확률을 점수로 변환 (높을수록 진실)
-    score = round(prob_true * 100, 2)
-    
-    return {
-        "prediction": "Fake" if prob_fake > prob_true else "True",
-        "score": score,  # 진실 점수
-        "fake_percentage": round(prob_fake * 100, 2),
-        "true_percentage": round(prob_true * 100, 2)
-    }
+# get_fake_news_prediction: api/inference.py (마이크로 배칭)
 
 
 # --- 5. 자극적인 단어 체크 (신규 구현) ---
 def check_sensational_words(title, text):
     """
-    클릭베이트/자극적 표현 탐지
-    Returns: {"score": 0~100, "detected_words": [...], "count": N}
+    클릭베이트/자극적 표현 탐지 (api/patterns.py 의 컴파일된 매처로 한 번에 스캔)
+    Returns: {"score": 0~100, "detected_words": [...], "count": N, "matches": {단어: {"count", "positions"}}}
+    positions 는 "제목 + 공백 + 본문 앞 500자" 기준 위치
     """
-    clickbait_keywords = [
-        '충격', '경악', '발칵', '긴급', '속보', '대박', '실화',
-        '폭로', '논란', '역대급', '초유', '사상최대', '최악',
-        '반전', '결국', '드디어', '불법', '파문', '진실',
-        '헐', '미쳤', '실제상황', '끝판왕', '레전드'
-    ]
-    
-    detected = []
     full_text = title + " " + text[:500]  # 제목+본문 앞부분만
-    
-    for word in clickbait_keywords:
-        if word in full_text:
-            detected.append(word)
-    
+    found = get_pattern_matchers()["sensational"].scan(full_text)
+
+    detected = list(found)
     count = len(detected)
     
     # 패널티: 1개당 -10점 (최대 -50점)
@@ -360,6 +372,7 @@ def check_sensational_words(title, text):
         "score": score,
         "detected_words": detected,
         "count": count,
+        "matches": summarize_matches(found),
         "description": f"자극적 표현 {count}개 감지" if count > 0 else "정상"
     }
 
@@ -367,24 +380,15 @@ def check_sensational_words(title, text):
 # --- 6. 광고성/상업성 체크 (신규 구현) ---
 def check_commercial_content(text, url):
     """
-    광고/홍보성 콘텐츠 탐지
-    Returns: {"score": 0~100, "detected_patterns": [...], "is_commercial": bool}
+    광고/홍보성 콘텐츠 탐지 (본문 전체를 한 번만 스캔)
+    Returns: {"score": 0~100, "detected_patterns": [...], "is_commercial": bool, "matches": {패턴: {"count", "positions"}}}
     """
-    commercial_patterns = [
-        r'구매하[기는]', r'할인', r'이벤트', r'쿠폰', r'\bAD\b',
-        r'협찬', r'제공:', r'바로가기', r'클릭', r'지금\s?바로',
-        r'무료\s?체험', r'가입', r'회원', r'포인트', r'혜택',
-        r'http[s]?://bit\.ly', r'http[s]?://smartstore', r'coupang\.com'
-    ]
-    
-    detected = []
-    for pattern in commercial_patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            detected.append(pattern)
+    matchers = get_pattern_matchers()
+    found = matchers["commercial"].scan(text)
+    detected = list(found)
     
     # URL에 쇼핑몰/광고 도메인 포함 여부
-    ad_domains = ['smartstore', 'coupang', 'gmarket', '11st', 'auction']
-    url_commercial = any(domain in url.lower() for domain in ad_domains)
+    url_commercial = matchers["ad_domains"].search(url.lower())
     
     is_commercial = len(detected) >= 3 or url_commercial
     
@@ -400,29 +404,22 @@ def check_commercial_content(text, url):
         "score": score,
         "detected_patterns": detected,
         "is_commercial": is_commercial,
+        "matches": summarize_matches(found),
         "description": "광고성 콘텐츠" if is_commercial else "정상"
     }
 
 
 # --- 7. 크로스체크 (관련 기사와 사실 대조) ---
-def cross_check_with_related_articles(title, text, related_articles):
-    """
-    관련 기사와 내용 일치도를 GPT로 검증
-    Returns: {"score": 0~100, "consistency": "높음/보통/낮음", "reason": "..."}
-    """
-    client = get_openai_client()
-    if not client or not related_articles:
-        return {
-            "score": 70,  # 기본값 (검증 불가)
-            "consistency": "검증불가",
-            "reason": "관련 기사가 없거나 API 오류"
-        }
+CROSS_CHECK_PROMPT_VERSION = 1
+
+
+def build_cross_check_request(title, text, related_articles):
+    """크로스체크 요청 파라미터 (동기/비동기 클라이언트 공용)"""
+    # 관련 기사 제목들 요약
+    related_titles = "\n".join([f"- {normalize_llm_input(art['title'])}" for art in related_articles[:5]])
+    title, text = normalize_llm_input(title), normalize_llm_input(text)
     
-    try:
-        # 관련 기사 제목들 요약
-        related_titles = "\n".join([f"- {art['title']}" for art in related_articles[:5]])
-        
-        prompt = f"""
+    prompt = f"""
 당신은 팩트체크 전문가입니다. 
 원본 기사와 관련 기사들의 내용 일치도를 평가하세요.
 
@@ -440,27 +437,53 @@ def cross_check_with_related_articles(title, text, related_articles):
     "reason": "판단 근거 1문장"
 }}
 """
-        
-        client = get_openai_client()
-        if not client:
-            return {"consistency_score": 50, "consistency_level": "보통", "reason": "GPT API 키가 설정되지 않아 기본값 반환"}
-        
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"},
-            temperature=0.2
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        
+    return {
+        "model": "gpt-4o-mini",
+        "messages": [{"role": "user", "content": prompt}],
+        "response_format": {"type": "json_object"},
+        "temperature": 0.2,
+    }
+
+
+def parse_cross_check_result(content):
+    result = json.loads(content)
+    
+    return {
+        "score": result.get("consistency_score", 70),
+        "consistency": result.get("consistency_level", "보통"),
+        "reason": result.get("reason", "검증 완료"),
+        "method": "gpt",
+    }
+
+
+def cross_check_with_gpt(title, text, related_articles, deadline=None):
+    """
+    관련 기사와 내용 일치도를 GPT로 검증
+    Returns: {"score": 0~100, "consistency": "높음/보통/낮음", "reason": "..."}
+    Raises: DeadlineExceeded (예산이 끝나 응답을 못 받음)
+    """
+    client = get_openai_client()
+    if not client or not related_articles:
         return {
-            "score": result.get("consistency_score", 70),
-            "consistency": result.get("consistency_level", "보통"),
-            "reason": result.get("reason", "검증 완료")
+            "score": 70,  # 기본값 (검증 불가)
+            "consistency": "검증불가",
+            "reason": "관련 기사가 없거나 API 오류"
         }
+    
+    request = build_cross_check_request(title, text, related_articles)
+    cache_key = llm_cache_key("cross_check", CROSS_CHECK_PROMPT_VERSION, request)
+    cached = get_cached_llm_result(cache_key)
+    if cached:
+        return cached
+
+    try:
+        response = client.chat.completions.create(**request, timeout=llm_timeout(deadline))
+        result = parse_cross_check_result(response.choices[0].message.content)
+        llm_cache.set(cache_key, result)
+        return result
         
     except Exception as e:
+        raise_if_expired(deadline, e)
         print(f"크로스체크 오류: {e}")
         return {
             "score": 70,
@@ -469,6 +492,59 @@ def cross_check_with_related_articles(title, text, related_articles):
         }
 
 
+# 크로스체크 방식 (CROSS_CHECK_MODE)
+# - gpt      : 관련 기사 제목을 gpt-4o-mini 에 보내 일치도 판정 (기존 방식)
+# - embedding: 로컬 문장 임베딩 유사도만 사용 (api/embeddings.py, GPT 호출 없음)
+# - hybrid   : 임베딩 점수가 애매한 구간(CROSS_CHECK_TIEBREAK_LOW~HIGH)일 때만 GPT 에게 다시 묻는다
+# EMBEDDING_MODEL 이 없거나 임베딩 모델을 불러올 수 없으면 gpt 로 동작한다.
+CROSS_CHECK_MODES = ("gpt", "embedding", "hybrid")
+GPT_CROSS_CHECK_FAILURES = ("검증불가", "검증실패")
+
+
+def get_cross_check_mode():
+    mode = getattr(settings, 'CROSS_CHECK_MODE', 'gpt')
+    if mode not in CROSS_CHECK_MODES or not getattr(settings, 'EMBEDDING_MODEL', ''):
+        return "gpt"
+    return mode
+
+
+def needs_gpt_tiebreak(result, deadline=None):
+    """hybrid: 임베딩 점수가 애매하고, GPT 를 기다릴 예산이 남아 있는지"""
+    low = float(getattr(settings, 'CROSS_CHECK_TIEBREAK_LOW', 40))
+    high = float(getattr(settings, 'CROSS_CHECK_TIEBREAK_HIGH', 70))
+    if not low <= result["score"] < high:
+        return False
+    return deadline is None or deadline.remaining() >= OPTIONAL_STAGE_BUDGETS["cross_check"]
+
+
+def merge_tiebreak(embedding_result, gpt_result):
+    """GPT 판정을 쓰되, GPT 가 실패했으면 임베딩 결과를 그대로 쓴다"""
+    if gpt_result.get("consistency") in GPT_CROSS_CHECK_FAILURES:
+        return embedding_result
+    return {**gpt_result, "method": "gpt_tiebreak", "embedding_score": embedding_result["score"]}
+
+
+def cross_check_with_related_articles(title, text, related_articles, deadline=None):
+    """
+    관련 기사와 내용 일치도 검증 (CROSS_CHECK_MODE 에 따라 GPT / 로컬 임베딩 / 둘 다)
+    Returns: {"score": 0~100, "consistency": "높음/보통/낮음", "reason": "...", "method": ...}
+    Raises: DeadlineExceeded (gpt 방식에서 예산이 끝나 응답을 못 받음)
+    """
+    mode = get_cross_check_mode()
+    result = None
+    if mode != "gpt" and related_articles:
+        result = embedding_cross_check(title, text, related_articles)
+    if result is None:
+        result = cross_check_with_gpt(title, text, related_articles, deadline=deadline)
+    elif mode == "hybrid" and needs_gpt_tiebreak(result, deadline):
+        try:
+            result = merge_tiebreak(result, cross_check_with_gpt(title, text, related_articles, deadline=deadline))
+        except DeadlineExceeded:
+            pass  # 임베딩 결과로 충분
+    metrics.inc("cross_check_total", method=result.get("method", "gpt"))
+    return result
+
+
 # --- 8. 발행일 신선도 점수 (신규) ---
 def calculate_date_freshness(publish_date):
     """
@@ -535,33 +611,44 @@ def get_domain_from_url(url):
     except: return None
 
 
-def find_publisher_name(soup, domain):
-    try:
-        og = soup.find('meta', {'property': 'og:site_name'})
-        if og and og.get('content'): return og['content'].strip()
-    except: pass
-    return domain
+# 캐시 키에서 제외할 추적용 쿼리 파라미터
+TRACKING_PARAMS = {'fbclid', 'gclid', 'igshid', 'ref', 'ref_src', 'cmpid', 'ncid'}
 
 
-def find_publish_date(soup, url):
-    meta_targets = ['article:published_time', 'og:published_time', 'pubdate']
-    for attr in meta_targets:
-        tag = soup.find('meta', attrs={'property': attr}) or \
-              soup.find('meta', attrs={'name': attr})
-            
-        if tag and tag.get('content'):
-            try: return date_parser.parse(tag['content']).isoformat()
-            except: continue
-            
-    url_date = extract_date_from_url(url)
-    if url_date: return url_date
-    return "날짜 찾기 실패"
+def canonicalize_url(url):
+    """
+    캐시 키용 URL 정규화
+    같은 기사를 가리키는 링크가 같은 키가 되도록 스킴/www/기본 포트/프래그먼트/
+    추적용 파라미터(utm_* 등) 차이를 없애고 쿼리 순서를 정렬한다.
+    """
+    parsed = urlparse(url.strip())
+    host = (parsed.hostname or "").lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parsed.port and parsed.port not in (80, 443):
+        host = f"{host}:{parsed.port}"
+
+    path = parsed.path or "/"
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    query = [
+        (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if not k.lower().startswith('utm_') and k.lower() not in TRACKING_PARAMS
+    ]
+    query.sort()
+
+    canonical = f"{host}{path}"
+    if query:
+        canonical += "?" + urlencode(query)
+    return canonical
 
 
 # --- 10. 최종 점수 계산 함수 ---
-def calculate_final_score(scores_dict):
+def calculate_final_score(scores_dict, excluded=()):
     """
     각 지표별 점수를 가중 평균하여 최종 점수 산출
+    excluded: 점수에서 뺄 지표 키 (예산 부족으로 건너뛴 단계) -> 나머지 가중치 합이 1 이 되도록 다시 맞춤
     
     가중치:
     - GPT 분석: 25%
@@ -582,6 +669,11 @@ def calculate_final_score(scores_dict):
         "date_freshness_score": 0.05
     }
     
+    if excluded:
+        kept = {key: weight for key, weight in weights.items() if key not in excluded}
+        total_weight = sum(kept.values()) or 1
+        weights = {key: round(weight / total_weight, 4) for key, weight in kept.items()}
+
     # 가중 합계
     final = 0
     for key, weight in weights.items():
@@ -609,235 +701,801 @@ def calculate_final_score(scores_dict):
     }
 
 
-# --- 11. Django View ---
-@method_decorator(csrf_exempt, name='dispatch')
-class AnalyzeView(APIView):
-    throttle_classes = [AnonRateThrottle]
+# --- 11. 기사 수집 (requests -> Playwright) ---
+DESKTOP_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+MOBILE_USER_AGENT = 'Mozilla/5.0 (iPhone; CPU iPhone OS 15_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.0 Mobile/15E148 Safari/604.1'
 
-    def post(self, request, *args, **kwargs):
-        # 1. URL 파싱
-        try:
-            data = json.loads(request.body)
-            url_to_check = data.get('url')
-        except: 
-            return JsonResponse({"success": False, "error": {"message": "잘못된 요청"}}, status=400)
 
-        domain = get_domain_from_url(url_to_check)
-        
-# [수정 1] 변수 미리 초기화 (이 부분이 빠져서 에러가 난 겁니다!)
-        # ==========================================
-        title = ""
-        text_content = ""
-        html = None
-        publisher_name = domain  # 기본값으로 도메인 설정
-        publish_date = None
-        # ==========================================
-
-        # =========================================================
-        # 1단계: 가벼운 requests 먼저 시도
-        # =========================================================
+def parse_article_html(html, url_to_check, domain):
+    """HTML -> (제목, 본문, 언론사, 발행일), 도메인별 추출기로 한 번만 파싱"""
+    return extract_article(html, url_to_check, domain)
+
+
+def needs_browser(title, text_content):
+    """정적 HTML 에서 본문을 충분히 얻지 못해 브라우저 렌더링이 필요한지"""
+    return not title or len(text_content) < 50
+
+
+class ArticleFetchError(Exception):
+    """기사 수집/본문 추출 실패 (응답에 쓸 메시지와 HTTP 상태 코드를 함께 전달)"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def fetch_article(url_to_check, deadline=None):
+    """
+    기사 HTML 을 가져와 제목/본문/언론사/발행일을 추출
+    deadline: requests/Playwright timeout 을 남은 예산 안으로 줄인다 (예산을 다 쓰면 504)
+    Returns: {"title", "text", "publisher_name", "publish_date"}
+    Raises: ArticleFetchError
+    """
+    domain = get_domain_from_url(url_to_check)
+    
+    # [수정 1] 변수 미리 초기화 (이 부분이 빠져서 에러가 난 겁니다!)
+    # ==========================================
+    title = ""
+    text_content = ""
+    html = None
+    publisher_name = domain  # 기본값으로 도메인 설정
+    publish_date = None
+    # ==========================================
+
+    # 도메인별 학습 결과: requests 가 늘 실패하는 도메인은 바로 Playwright 로
+    plan = plan_fetch(domain)
+    static_ok, static_ms, browser_ok = None, 0.0, None
+
+    # =========================================================
+    # 1단계: 가벼운 requests 먼저 시도
+    # =========================================================
+    if plan["try_static"]:
         print(f"Attempting requests for: {url_to_check}")
+        static_started = time.perf_counter()
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            }
-            response = requests.get(url_to_check, headers=headers, timeout=5) # 타임아웃 짧게 (안되면 빨리 포기하게)
+            headers = {'User-Agent': DESKTOP_USER_AGENT}
+            response = cached_get(url_to_check, headers=headers, timeout=timeout_for(deadline, 5)) # 타임아웃 짧게 (안되면 빨리 포기하게), 공유 세션 + 디스크 캐시
             
             if response.status_code == 200:
                 html = response.text
-                soup = BeautifulSoup(html, "html.parser")
                 # 여기서 한 번 추출 시도해봄
-                title, text_content = find_article_content(soup)
-                publisher_name = find_publisher_name(soup, domain)
-                publish_date = find_publish_date(soup, url_to_check)
+                title, text_content, publisher_name, publish_date = parse_article_html(html, url_to_check, domain)
                 print(f"Requests 결과: 제목={bool(title)}, 본문길이={len(text_content)}")
         except Exception as e:
             print(f"Requests 접속 에러 (무시하고 Playwright로 이동): {e}")
-
-        # =========================================================
-        # 2단계: requests가 실패했거나, '본문이 비어있으면' Playwright 출동 (핵심 변경!)
-        # =========================================================
-        if not title or len(text_content) < 50:
-            print("🚀 Requests로 본문 확보 실패 (동적 페이지 또는 차단). Playwright 가동!")
-            
-            try:
-                with sync_playwright() as p:
-                    # 봇 탐지 우회 옵션들
-                    browser = p.chromium.launch(
-                        headless=True, 
-                        args=["--disable-blink-features=AutomationControlled"]
-                    )
-                    
-                    # 모바일 User-Agent 사용 (PC보다 보안이 널널할 때가 많음)
-                    context = browser.new_context(
-                        user_agent='Mozilla/5.0 (iPhone; CPU iPhone OS 15_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.0 Mobile/15E148 Safari/604.1'
-                    )
-                    page = context.new_page()
-                    
-                    print("Playwright: 페이지 접속 중...")
-                    # 타임아웃 60초
-                    page.goto(url_to_check, wait_until='domcontentloaded', timeout=60000)
-                    
-                    # ★★★ JS 실행 대기 (가장 중요) ★★★
-                    # 그냥 3초 멍때리면서 뉴스 본문이 로딩되길 기다림
-                    page.wait_for_timeout(3000)
-                    
-                    html = page.content()
-                    print("Playwright: HTML 확보 완료")
-                    browser.close()
-                    
-                    # 다시 파싱 (이제 진짜 데이터가 들어있음)
-                    soup = BeautifulSoup(html, "html.parser")
-                    publisher_name = find_publisher_name(soup, domain) 
-                    publish_date = find_publish_date(soup, url_to_check)
-                    title, text_content = find_article_content(soup)
-                    
-                    
-            except Exception as e:
-                print(f"Playwright Error: {e}")
-                return JsonResponse({"success": False, "error": {"message": f"크롤링 최종 실패: {str(e)}"}}, status=500)
-
-        # 3. 최종 검사 (Playwright까지 썼는데도 없으면 진짜 없는 거임)
-        if not title or len(text_content) < 50:
-            return JsonResponse({"success": False, "error": {"message": "본문 추출 실패 (봇 차단이 강력하거나 HTML 구조가 특이함)"}}, status=400)
-
-        # 4. 모든 지표 분석 실행
-        print("📊 분석 시작...")
-        
-        # 4-1. GPT 분석
-        gpt_result = get_gpt_prediction(title, text_content)
-        gpt_score = gpt_result.get("score", 50)
-        
-        # 4-2. AI 모델 분석
-        ai_result = get_fake_news_prediction(title, text_content)
-        ai_score = ai_result.get("score", 50)
-        
-        # 4-3. 언론사 신뢰도
-        media_trust = get_media_trust_score(publisher_name)
-        media_score = media_trust.get("score", 60)
-        
-        # 4-4. 자극적 표현
-        sensational = check_sensational_words(title, text_content)
-        sensational_score = sensational.get("score", 100)
-        
-        # 4-5. 광고성
-        commercial = check_commercial_content(text_content, url_to_check)
-        commercial_score = commercial.get("score", 100)
-        
-        # 4-6. 발행일 신선도
-        date_freshness = calculate_date_freshness(publish_date)
-        date_score = date_freshness.get("score", 70)
-        
-        # 4-7. 관련 기사 검색 및 크로스체크
-        related_articles = []
-        cross_check_result = {"score": 70, "consistency": "검증불가"}
+        static_ok = not needs_browser(title, text_content)
+        static_ms = (time.perf_counter() - static_started) * 1000
+        metrics.record_fetch_duration("static", static_ms, static_ok)
+    else:
+        print(f"⏭️ {domain}: requests 건너뜀 (학습된 전략: {plan['strategy']})")
+
+    # =========================================================
+    # 2단계: requests가 실패했거나, '본문이 비어있으면' Playwright 출동 (핵심 변경!)
+    # =========================================================
+    if needs_browser(title, text_content):
+        print("🚀 Requests로 본문 확보 실패 (동적 페이지 또는 차단). Playwright 가동!")
+        if deadline is not None and deadline.expired():
+            record_fetch(domain, static_ok, static_ms, browser_ok=None)
+            raise ArticleFetchError("처리 시간 예산을 모두 써서 브라우저 수집을 하지 못함", status=504)
         
-        keywords = gpt_result.get("keywords", "")
-        if keywords:
-            print(f"🔎 검색 키워드: {keywords}")
-            naver_raw = get_related_articles(keywords)
-            google_raw = get_google_news(keywords)
-            all_articles = naver_raw + google_raw
-            
-            # 중복 제거
-            current_title_norm = normalize_text(title)
-            filtered_list = []
-            
-            for item in all_articles:
-                item_title_norm = normalize_text(item['title'])
-                if len(item_title_norm) < 2: continue
-                if current_title_norm in item_title_norm or item_title_norm in current_title_norm:
-                    continue
-                filtered_list.append(item)
-            
-            related_articles = filtered_list[:5]
+        def render(page):
+            print("Playwright: 페이지 접속 중...")
+            # 이미지/폰트/미디어/CSS 와 광고·분석 스크립트는 받지 않는다
+            requests_seen = block_resources(page)
+            # 타임아웃 60초
+            page.goto(url_to_check, wait_until='domcontentloaded', timeout=timeout_for(deadline, 60) * 1000)
+
+            # ★★★ JS 실행 대기 (가장 중요) ★★★
+            # 본문 영역에 글이 채워지는 즉시 진행 (못 찾으면 PLAYWRIGHT_READY_TIMEOUT_MS 후 그대로 진행)
+            ready = wait_for_content(
+                page, get_extractor(domain).body_selectors, min_text_length=50, timeout_ms=ready_timeout_ms(deadline)
+            )
+            print(f"Playwright: 본문 {'감지' if ready else '대기 시간 초과'} "
+                  f"(요청 차단 {requests_seen['blocked']} / 허용 {requests_seen['allowed']})")
+            return page.content()
+
+        browser_started = time.perf_counter()
+        try:
+            # 미리 띄워 둔 브라우저 사용 (봇 탐지 우회 옵션은 풀에서 적용)
+            # 모바일 User-Agent 사용 (PC보다 보안이 널널할 때가 많음)
+            html = get_browser_pool().run(
+                render, context_options={"user_agent": MOBILE_USER_AGENT}, timeout=timeout_for(deadline, 75)
+            )
+            print("Playwright: HTML 확보 완료")
             
-            # 크로스체크 실행
-            if related_articles:
-                cross_check_result = cross_check_with_related_articles(title, text_content, related_articles)
+            # 다시 파싱 (이제 진짜 데이터가 들어있음)
+            title, text_content, publisher_name, publish_date = parse_article_html(html, url_to_check, domain)
+            browser_ok = not needs_browser(title, text_content)
+            metrics.record_fetch_duration("browser", (time.perf_counter() - browser_started) * 1000, browser_ok)
+                
+        except Exception as e:
+            print(f"Playwright Error: {e}")
+            metrics.record_fetch_duration("browser", (time.perf_counter() - browser_started) * 1000, False)
+            record_fetch(domain, static_ok, static_ms, browser_ok=False)
+            if deadline is not None and deadline.expired():
+                raise ArticleFetchError(f"처리 시간 예산 초과 (기사 수집): {str(e)}", status=504)
+            raise ArticleFetchError(f"크롤링 최종 실패: {str(e)}", status=500)
+
+    record_fetch(domain, static_ok, static_ms, browser_ok)
+
+    # 3. 최종 검사 (Playwright까지 썼는데도 없으면 진짜 없는 거임)
+    if needs_browser(title, text_content):
+        raise ArticleFetchError("본문 추출 실패 (봇 차단이 강력하거나 HTML 구조가 특이함)", status=400)
+
+    return {
+        "title": title,
+        "text": text_content,
+        "publisher_name": publisher_name,
+        "publish_date": publish_date,
+        "fetch_path": "static" if static_ok else "browser",
+        "fetch_strategy": plan["strategy"],
+    }
+
+
+# --- 12. 분석 파이프라인 ---
+DEFAULT_CROSS_CHECK = {"score": 70, "consistency": "검증불가"}
+
+
+def filter_related_articles(title, articles):
+    """원본 기사와 제목이 (거의) 같은 기사를 빼고 최대 5개 반환"""
+    current_title_norm = normalize_text(title)
+    filtered_list = []
+    
+    for item in articles:
+        item_title_norm = normalize_text(item['title'])
+        if len(item_title_norm) < 2: continue
+        if current_title_norm in item_title_norm or item_title_norm in current_title_norm:
+            continue
+        filtered_list.append(item)
+    
+    return filtered_list[:5]
+
+
+def search_related(keywords, search_func, deadline=None):
+    if keywords:
+        print(f"🔎 검색 키워드: {keywords} ({search_func.__name__})")
+    return search_func(keywords, deadline=deadline)
+
+
+# 검색 키워드 출처 (KEYWORD_SOURCE)
+# - local: 추출 직후 로컬 TF-IDF 키워드로 바로 검색 (GPT 와 동시에 진행)
+# - gpt  : GPT 응답의 keywords 로 검색 (GPT 가 실패하거나 건너뛰면 로컬 키워드)
+# - merge: local 처럼 바로 검색하고, GPT 키워드가 오면 새 단어가 있을 때 네이버를 한 번 더 검색해 합친다
+KEYWORD_SOURCES = ("local", "gpt", "merge")
+
+
+def get_keyword_source():
+    source = getattr(settings, 'KEYWORD_SOURCE', 'local')
+    return source if source in KEYWORD_SOURCES else "local"
+
+
+def gpt_only_keywords(gpt, keywords):
+    """GPT 키워드에 로컬 키워드에 없는 단어가 있으면 GPT 키워드, 아니면 "" (다시 검색할 필요 없음)"""
+    gpt_keywords = gpt.get("keywords") or ""
+    return gpt_keywords if set(gpt_keywords.split()) - set(keywords.split()) else ""
+
+
+def merge_related(*article_lists):
+    """검색 결과 목록들을 링크 기준으로 중복 없이 합침 (앞의 목록 우선)"""
+    seen, merged = set(), []
+    for articles in article_lists:
+        for item in articles:
+            if item.get("link") in seen:
+                continue
+            seen.add(item.get("link"))
+            merged.append(item)
+    return merged
+
+
+# 예산이 부족하면 건너뛰는 선택 단계 -> 시작하는 데 필요한 최소 남은 예산(초)
+OPTIONAL_STAGE_BUDGETS = {"gpt": 4.0, "google_search": 5.0, "cross_check": 3.0}
+EMBEDDING_CROSS_CHECK_BUDGET = 0.5
+
+# 단계 이름 -> calculate_final_score 의 지표 키 (건너뛴 단계는 점수에서 뺀다)
+STAGE_SCORE_KEYS = {
+    "gpt": "gpt_score",
+    "ai_model": "ai_model_score",
+    "media_trust": "media_trust_score",
+    "cross_check": "cross_check_score",
+    "sensational": "sensational_score",
+    "commercial": "commercial_score",
+    "date_freshness": "date_freshness_score",
+}
+
+
+def build_analysis_stages(url_to_check, article, deadline=None):
+    """
+    분석 단계 목록 (실제 의존 관계만 연결)
+    로컬 키워드 -> 네이버/구글 검색(동시) -> 관련 기사 정리 -> 크로스체크 (KEYWORD_SOURCE=gpt 면 GPT -> 키워드)
+    나머지 지표는 서로 독립이라 처음부터 동시에 실행된다.
+    GPT/구글 검색/크로스체크는 선택 단계라 예산(deadline)이 부족하면 건너뛴다.
+    """
+    title = article["title"]
+    text_content = article["text"]
+    keyword_source = get_keyword_source()
+
+    def cross_check(related_articles):
+        if not related_articles:
+            return DEFAULT_CROSS_CHECK
+        return cross_check_with_related_articles(title, text_content, related_articles, deadline=deadline)
+
+    def optional(name):
+        min_budget = OPTIONAL_STAGE_BUDGETS[name]
+        if name == "cross_check" and get_cross_check_mode() != "gpt":
+            min_budget = EMBEDDING_CROSS_CHECK_BUDGET  # 로컬 임베딩은 금방 끝난다 (GPT 재확인은 따로 예산 확인)
+        return {"optional": True, "min_budget": min_budget}
+
+    if keyword_source == "gpt":
+        keywords_stage = Stage("keywords", lambda gpt, local_keywords: gpt.get("keywords") or local_keywords,
+                               deps=["gpt", "local_keywords"], default="")
+    else:
+        keywords_stage = Stage("keywords", lambda local_keywords: local_keywords, deps=["local_keywords"], default="")
+
+    # merge: GPT 키워드로 한 번 더 검색 (관련 기사 정리는 이 검색까지 기다린다)
+    search_stages = []
+    if keyword_source == "merge":
+        search_stages.append(Stage(
+            "gpt_search", lambda gpt, keywords: search_related(gpt_only_keywords(gpt, keywords), get_related_articles, deadline),
+            deps=["gpt", "keywords"], default=[],
+        ))
+    search_names = ["naver_search", "google_search"] + [stage.name for stage in search_stages]
+
+    return [
+        Stage("gpt", lambda: get_gpt_prediction(title, text_content, deadline=deadline),
+              default={"prediction": "Error", "score": 0}, **optional("gpt")),
+        Stage("ai_model", lambda: get_fake_news_prediction(title, text_content),
+              default={"score": 50, "prediction": "Unknown"}),
+        Stage("media_trust", lambda: get_media_trust_score(article["publisher_name"], get_domain_from_url(url_to_check)),
+              default={"rank": None, "score": 60, "category": "순위권 외"}),
+        Stage("sensational", lambda: check_sensational_words(title, text_content),
+              default={"score": 100}),
+        Stage("commercial", lambda: check_commercial_content(text_content, url_to_check),
+              default={"score": 100}),
+        Stage("date_freshness", lambda: calculate_date_freshness(article["publish_date"]),
+              default={"score": 70}),
+        Stage("local_keywords", lambda: extract_keywords(title, text_content), default=""),
+        keywords_stage,
+        Stage("naver_search", lambda keywords: search_related(keywords, get_related_articles, deadline),
+              deps=["keywords"], default=[]),
+        Stage("google_search", lambda keywords: search_related(keywords, get_google_news, deadline),
+              deps=["keywords"], default=[], **optional("google_search")),
+        *search_stages,
+        Stage("related_articles", lambda **searches: filter_related_articles(title, merge_related(*searches.values())),
+              deps=[*search_names], default=[]),
+        Stage("cross_check", cross_check, deps=["related_articles"], default=DEFAULT_CROSS_CHECK,
+              **optional("cross_check")),
+    ]
+
+
+def build_response_data(url_to_check, article, results, timings, near_duplicate=None, skipped=None, deadline=None):
+    """
+    단계별 결과를 모아 최종 점수를 계산하고 /api/analyze/ 응답 data 를 만든다
+    skipped: 예산 때문에 건너뛴 단계 {이름: 이유} -> 최종 점수 가중치에서 제외
+    """
+    skipped = skipped or {}
+    gpt_result = results["gpt"]
+    gpt_score = gpt_result.get("score", 50)
+    ai_result = results["ai_model"]
+    ai_score = ai_result.get("score", 50)
+    media_trust = results["media_trust"]
+    media_score = media_trust.get("score", 60)
+    sensational = results["sensational"]
+    sensational_score = sensational.get("score", 100)
+    commercial = results["commercial"]
+    commercial_score = commercial.get("score", 100)
+    date_freshness = results["date_freshness"]
+    date_score = date_freshness.get("score", 70)
+    cross_check_result = results["cross_check"]
+    cross_check_score = cross_check_result.get("score", 70)
+    related_articles = results["related_articles"]
+    keywords = results["keywords"]
+    text_content = article["text"]
+
+    # 최종 점수 계산
+    scores_dict = {
+        "gpt_score": gpt_score,
+        "ai_model_score": ai_score,
+        "media_trust_score": media_score,
+        "cross_check_score": cross_check_score,
+        "sensational_score": sensational_score,
+        "commercial_score": commercial_score,
+        "date_freshness_score": date_score
+    }
+    
+    final_result = calculate_final_score(
+        scores_dict, excluded={STAGE_SCORE_KEYS[name] for name in skipped if name in STAGE_SCORE_KEYS}
+    )
+
+    return {
+        "requested_url": url_to_check,
+        "publisher_name": article["publisher_name"],
+        "published_date": article["publish_date"],
+        "scraped_title": article["title"],
+        "scraped_content": text_content[:5000] if text_content else "",  # 본문 내용 추가 (최대 5000자)
         
-        cross_check_score = cross_check_result.get("score", 70)
+        # 개별 지표 점수들
+        "detailed_scores": {
+            "gpt_analysis": {
+                "score": gpt_score,
+                "prediction": gpt_result.get("prediction", "Unknown"),
+                "reason": gpt_result.get("reason", ""),
+                "model_type": gpt_result.get("model_type", "GPT-4o-mini")
+            },
+            "ai_model": {
+                "score": ai_score,
+                "prediction": ai_result.get("prediction", "Unknown"),
+                "fake_percentage": ai_result.get("fake_percentage", 0),
+                "true_percentage": ai_result.get("true_percentage", 0),
+                "chunks_scored": ai_result.get("chunks_scored", 1),  # 긴 기사를 나눠 추론한 창 개수
+                "chunks_total": ai_result.get("chunks_total", 1)
+            },
+            "media_trust": {
+                "score": media_score,
+                "rank": media_trust.get("rank"),
+                "category": media_trust.get("category", "순위권 외"),
+                "outlet": media_trust.get("outlet")  # 레지스트리에서 찾은 언론사 이름
+            },
+            "sensational_check": {
+                "score": sensational_score,
+                "detected_words": sensational.get("detected_words", []),
+                "count": sensational.get("count", 0),
+                "matches": sensational.get("matches", {}),  # 단어별 등장 횟수/위치
+                "description": sensational.get("description", "정상")
+            },
+            "commercial_check": {
+                "score": commercial_score,
+                "is_commercial": commercial.get("is_commercial", False),
+                "detected_patterns": commercial.get("detected_patterns", []),
+                "matches": commercial.get("matches", {}),
+                "description": commercial.get("description", "정상")
+            },
+            "date_freshness": {
+                "score": date_score,
+                "days_ago": date_freshness.get("days_ago"),
+                "freshness": date_freshness.get("freshness", "불명")
+            },
+            "cross_check": {
+                "score": cross_check_score,
+                "consistency": cross_check_result.get("consistency", "검증불가"),
+                "reason": cross_check_result.get("reason", ""),
+                "method": cross_check_result.get("method", "gpt")  # gpt / embedding / gpt_tiebreak
+            }
+        },
         
-        # 5. 최종 점수 계산
-        scores_dict = {
-            "gpt_score": gpt_score,
-            "ai_model_score": ai_score,
-            "media_trust_score": media_score,
-            "cross_check_score": cross_check_score,
-            "sensational_score": sensational_score,
-            "commercial_score": commercial_score,
-            "date_freshness_score": date_score
-        }
+        # 최종 종합 점수
+        "final_analysis": {
+            "final_score": final_result["final_score"],
+            "grade": final_result["grade"],
+            "reliability": final_result["reliability"],
+            "weights_used": final_result["weights"]
+        },
         
-        final_result = calculate_final_score(scores_dict)
+        # 관련 기사
+        "related_articles": related_articles,
+        "search_keywords": keywords,
         
-        print(f"✅ 분석 완료 - 최종 점수: {final_result['final_score']}")
+        "stage_timings": timings,  # 단계별 소요 시간 (ms)
+        # 처리 시간 예산 때문에 건너뛴 단계 (reason: budget=시작 전 예산 부족, deadline=실행 중 예산 초과)
+        "skipped_stages": [{"stage": name, "reason": reason} for name, reason in skipped.items()],
+        "deadline": deadline.stats() if deadline else None,
+        # 유사 기사 분석 결과 재사용 여부 (api/near_duplicates.py)
+        "near_duplicate": near_duplicate or {"checked": False, "matched": False},
         
-        # 6. 응답 반환
-        return JsonResponse({
-            "success": True,
-            "data": {
-                "requested_url": url_to_check,
-                "publisher_name": publisher_name,
-                "published_date": publish_date,
-                "scraped_title": title,
-                "scraped_content": text_content[:5000] if text_content else "",  # 본문 내용 추가 (최대 5000자)
-                
-                # 개별 지표 점수들
-                "detailed_scores": {
-                    "gpt_analysis": {
-                        "score": gpt_score,
-                        "prediction": gpt_result.get("prediction", "Unknown"),
-                        "reason": gpt_result.get("reason", ""),
-                        "model_type": gpt_result.get("model_type", "GPT-4o-mini")
-                    },
-                    "ai_model": {
-                        "score": ai_score,
-                        "prediction": ai_result.get("prediction", "Unknown"),
-                        "fake_percentage": ai_result.get("fake_percentage", 0),
-                        "true_percentage": ai_result.get("true_percentage", 0)
-                    },
-                    "media_trust": {
-                        "score": media_score,
-                        "rank": media_trust.get("rank"),
-                        "category": media_trust.get("category", "순위권 외")
-                    },
-                    "sensational_check": {
-                        "score": sensational_score,
-                        "detected_words": sensational.get("detected_words", []),
-                        "count": sensational.get("count", 0),
-                        "description": sensational.get("description", "정상")
-                    },
-                    "commercial_check": {
-                        "score": commercial_score,
-                        "is_commercial": commercial.get("is_commercial", False),
-                        "detected_patterns": commercial.get("detected_patterns", []),
-                        "description": commercial.get("description", "정상")
-                    },
-                    "date_freshness": {
-                        "score": date_score,
-                        "days_ago": date_freshness.get("days_ago"),
-                        "freshness": date_freshness.get("freshness", "불명")
-                    },
-                    "cross_check": {
-                        "score": cross_check_score,
-                        "consistency": cross_check_result.get("consistency", "검증불가"),
-                        "reason": cross_check_result.get("reason", "")
-                    }
-                },
-                
-                # 최종 종합 점수
-                "final_analysis": {
-                    "final_score": final_result["final_score"],
-                    "grade": final_result["grade"],
-                    "reliability": final_result["reliability"],
-                    "weights_used": final_result["weights"]
-                },
-                
-                # 관련 기사
-                "related_articles": related_articles,
-                "search_keywords": keywords,
-                
-                "cached": False
-            }
-        }, status=200)
\ No newline at end of file
+        "cached": False
+    }
+
+
+def analyze_url(url_to_check, on_progress=None, reuse_near_duplicates=True, deadline=None):
+    """
+    기사 수집부터 최종 점수까지 전체 분석 (캐시는 호출하는 쪽에서 처리)
+    on_progress(event, data): 기사 수집("extraction")과 각 단계("stage")가 끝날 때마다 호출
+    reuse_near_duplicates: 최근 분석한 거의 같은 기사가 있으면 GPT/모델/크로스체크 결과 재사용
+    deadline: 처리 시간 예산 (api/deadline.py, 없으면 ANALYSIS_DEADLINE_SECONDS)
+    Raises: ArticleFetchError
+    """
+    deadline = deadline or make_deadline()
+    started = time.perf_counter()
+    try:
+        article = fetch_article(url_to_check, deadline=deadline)
+    except ArticleFetchError:
+        metrics.record_fetch_failure()
+        raise
+    extraction_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    on_stage_done = None
+    if on_progress:
+        on_progress("extraction", {
+            "title": article["title"],
+            "publisher_name": article["publisher_name"],
+            "publish_date": article["publish_date"],
+            "text_length": len(article["text"] or ""),
+            "elapsed_ms": extraction_ms,
+        })
+        on_stage_done = lambda name, result, elapsed_ms, error: on_progress(
+            "stage", {"stage": name, "result": result, "elapsed_ms": elapsed_ms, "error": error}
+        )
+
+    near_duplicate = find_near_duplicate(article["title"], article["text"], reuse=reuse_near_duplicates)
+
+    # 4. 모든 지표 분석 실행 (독립 단계는 병렬, 유사 기사 결과가 있으면 해당 단계는 건너뜀)
+    print("📊 분석 시작...")
+    run = run_stages(
+        build_analysis_stages(url_to_check, article, deadline),
+        max_workers=getattr(settings, 'ANALYSIS_STAGE_WORKERS', 8),
+        on_stage_done=on_stage_done,
+        seeded=near_duplicate.seeded,
+        deadline=deadline,
+    )
+    remember_article(near_duplicate, canonicalize_url(url_to_check), article["title"], run)
+    timings = {
+        "extraction": extraction_ms,
+        **run.timings,
+        "total": round((time.perf_counter() - started) * 1000, 1),
+    }
+    metrics.record_analysis(run, timings, article, near_duplicate, mode="sync")
+
+    response_data = build_response_data(
+        url_to_check, article, run.results, timings, near_duplicate.stats(), skipped=run.skipped, deadline=deadline
+    )
+    print(f"✅ 분석 완료 - 최종 점수: {response_data['final_analysis']['final_score']} ({timings['total']:.0f}ms)")
+    return response_data
+
+
+# --- 13. Django View ---
+def read_analyze_request(request):
+    """
+    요청 본문에서 분석할 URL 과 강제 새로고침 여부를 읽는다 (refresh=true 이면 캐시 무시)
+    Returns: (url, force_refresh) / 잘못된 요청이면 (None, False)
+    """
+    try:
+        data = json.loads(request.body)
+        url_to_check = data.get('url')
+    except: 
+        return None, False
+
+    if not url_to_check or not isinstance(url_to_check, str):
+        return None, False
+
+    force_refresh = bool(data.get('refresh')) or request.GET.get('refresh') in ('1', 'true')
+    return url_to_check, force_refresh
+
+
+def read_deadline_seconds(request):
+    """요청 본문의 deadline 또는 ?deadline= (초), 없으면 None (= 설정 기본값)"""
+    try:
+        data = json.loads(request.body)
+    except Exception:
+        data = {}
+    value = data.get('deadline') if isinstance(data, dict) else None
+    return value if value is not None else request.GET.get('deadline')
+
+
+def get_cached_analysis(cache_key):
+    """캐시된 분석 결과(cached/cache_age 표시 포함) 또는 None"""
+    cached = analysis_cache.get(cache_key)
+    metrics.record_cache("analysis", bool(cached))
+    if not cached:
+        return None
+    cached_data, cache_age = cached
+    print(f"⚡ 캐시 적중: {cache_key} ({cache_age:.0f}초 전 분석)")
+    cached_data.update({"cached": True, "cache_age": round(cache_age, 1)})
+    return cached_data
+
+
+def analyze_with_cache(url_to_check, force_refresh=False, on_progress=None, deadline_seconds=None):
+    """
+    캐시 확인 -> 기사 수집 + 분석 -> 캐시 저장 (on_progress 는 analyze_url 참고)
+    deadline_seconds: 요청별 처리 시간 예산 (없으면 ANALYSIS_DEADLINE_SECONDS)
+                      진행 중인 같은 분석을 기다리는 시간과 직접 분석하는 시간이 이 예산 하나를 나눠 쓴다.
+    예산 때문에 단계를 건너뛴 결과는 캐시하지 않는다 (다음 요청은 전체 분석을 다시 시도).
+    같은 기사의 분석이 이미 진행 중이면(다른 워커 포함) 새로 분석하지 않고 그 결과를 받는다
+    (이 경우 on_progress 는 호출되지 않고 data 에 coalesced=True 가 붙는다, 새로고침은 새로고침끼리만 합친다).
+    Returns: (HTTP 상태 코드, 응답 본문 dict)
+    """
+    deadline = make_deadline(deadline_seconds)
+    cache_key = canonicalize_url(url_to_check)
+    if not force_refresh:
+        cached_data = get_cached_analysis(cache_key)
+        if cached_data:
+            return 200, {"success": True, "data": cached_data}
+
+    def analyze():
+        try:
+            response_data = analyze_url(
+                url_to_check, on_progress=on_progress, reuse_near_duplicates=not force_refresh, deadline=deadline
+            )
+        except ArticleFetchError as e:
+            return [e.status, {"success": False, "error": {"message": e.message}}]
+        if not response_data["skipped_stages"]:
+            analysis_cache.set(cache_key, response_data)
+        return [200, {"success": True, "data": response_data}]
+
+    flight_key = analysis_flight_key(cache_key, force_refresh)
+    (status, payload), shared = analysis_flight.do(flight_key, analyze, deadline=deadline)
+    return status, mark_coalesced(payload) if shared else payload
+
+
+def analysis_flight_key(cache_key, force_refresh):
+    """새로고침 요청은 캐시/유사 기사 결과를 쓰는 진행 중인 분석에 합류하지 않도록 따로 합친다"""
+    return f"refresh:{cache_key}" if force_refresh else cache_key
+
+
+def mark_coalesced(payload):
+    """다른 요청이 실행한 분석 결과를 받은 경우 표시 (공유 객체를 고치지 않도록 복사)"""
+    if not payload["success"]:
+        return payload
+    print(f"🤝 진행 중이던 분석 결과 공유: {payload['data']['requested_url']}")
+    return {**payload, "data": {**payload["data"], "coalesced": True}}
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AnalyzeView(APIView):
+    throttle_classes = [AnonRateThrottle]
+
+    def post(self, request, *args, **kwargs):
+        # 1. URL 파싱
+        url_to_check, force_refresh = read_analyze_request(request)
+        if not url_to_check:
+            return JsonResponse({"success": False, "error": {"message": "잘못된 요청"}}, status=400)
+
+        # 2~6. 캐시 확인 -> 수집 + 분석 -> 캐시 저장 (요청별 처리 시간 예산 적용)
+        status, payload = analyze_with_cache(url_to_check, force_refresh, deadline_seconds=read_deadline_seconds(request))
+        return JsonResponse(payload, status=status)
+
+
+# --- 14. 일괄 분석 (NDJSON 스트리밍) ---
+def read_batch_request(request):
+    """
+    요청 본문 {"urls": [...], "refresh": bool} 을 읽는다
+    Returns: (urls, force_refresh, 오류 메시지) - 오류가 없으면 메시지는 None
+    """
+    try:
+        data = json.loads(request.body)
+        urls = data.get('urls')
+    except Exception:
+        return None, False, "잘못된 요청"
+
+    if not isinstance(urls, list) or not urls or not all(isinstance(u, str) and u.strip() for u in urls):
+        return None, False, "urls 는 비어 있지 않은 URL 문자열 목록이어야 합니다"
+
+    max_urls = getattr(settings, 'ANALYZE_BATCH_MAX_URLS', 200)
+    if len(urls) > max_urls:
+        return None, False, f"한 번에 최대 {max_urls}개까지 요청할 수 있습니다"
+
+    force_refresh = bool(data.get('refresh')) or request.GET.get('refresh') in ('1', 'true')
+    return [u.strip() for u in urls], force_refresh, None
+
+
+def dedupe_urls(urls):
+    """
+    정규화된 URL 기준으로 중복 제거 (먼저 나온 URL 유지)
+    Returns: (고유 URL 목록, {중복 URL: 대표 URL})
+    """
+    unique, duplicates, seen = [], {}, {}
+    for url in urls:
+        key = canonicalize_url(url)
+        if key in seen:
+            duplicates[url] = seen[key]
+        else:
+            seen[key] = url
+            unique.append(url)
+    return unique, duplicates
+
+
+def _analyze_batch_item(url_to_check, force_refresh):
+    try:
+        return analyze_with_cache(url_to_check, force_refresh)
+    except Exception as e:
+        print(f"⚠️ 일괄 분석 실패 [{url_to_check}]: {e}")
+        return 500, {"success": False, "error": {"message": f"분석 중 오류: {str(e)}"}}
+    finally:
+        connections.close_all()  # 풀 스레드에서 연 DB 연결 정리
+
+
+def _ndjson(obj):
+    return json.dumps(obj, ensure_ascii=False) + "\n"
+
+
+def stream_batch_analysis(urls, duplicates, force_refresh):
+    """
+    URL 들을 최대 ANALYZE_BATCH_CONCURRENCY 개씩 동시에 분석하고, 끝나는 순서대로 NDJSON 한 줄씩 내보낸다
+    (같은 워커의 브라우저 풀 / 모델 배칭 / DB 캐시를 함께 쓰므로 동시에 분석할수록 배치가 커진다)
+    """
+    started = time.perf_counter()
+    yield _ndjson({"type": "start", "total": len(urls), "duplicates": duplicates})
+
+    succeeded = 0
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, getattr(settings, 'ANALYZE_BATCH_CONCURRENCY', 4)), thread_name_prefix="batch"
+    )
+    try:
+        futures = {executor.submit(_analyze_batch_item, url, force_refresh): (i, url) for i, url in enumerate(urls)}
+        for future in as_completed(futures):
+            index, url = futures[future]
+            status, payload = future.result()
+            succeeded += 1 if payload["success"] else 0
+            yield _ndjson({"type": "result", "index": index, "url": url, "status": status, **payload})
+    finally:
+        # 클라이언트가 연결을 끊으면 아직 시작하지 않은 분석은 취소
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    yield _ndjson({
+        "type": "end",
+        "total": len(urls),
+        "succeeded": succeeded,
+        "failed": len(urls) - succeeded,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    })
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AnalyzeBatchView(APIView):
+    """
+    POST /api/analyze/batch/  {"urls": [...], "refresh": false}
+    응답은 application/x-ndjson 스트림:
+        {"type": "start", "total": N, "duplicates": {...}}
+        {"type": "result", "index": i, "url": ..., "status": 200, "success": true, "data": {...}}  (끝나는 순서대로)
+        {"type": "end", "total": N, "succeeded": n, "failed": m, "elapsed_ms": ...}
+    요청 제한(AnonRateThrottle)은 URL 개수와 관계없이 요청 1회로 계산된다.
+    """
+    throttle_classes = [AnonRateThrottle]
+
+    def post(self, request, *args, **kwargs):
+        urls, force_refresh, error = read_batch_request(request)
+        if error:
+            return JsonResponse({"success": False, "error": {"message": error}}, status=400)
+
+        unique_urls, duplicates = dedupe_urls(urls)
+        print(f"📦 일괄 분석 시작: {len(unique_urls)}개 (중복 {len(duplicates)}개 제외)")
+        response = StreamingHttpResponse(
+            stream_batch_analysis(unique_urls, duplicates, force_refresh),
+            content_type="application/x-ndjson; charset=utf-8",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"  # nginx 가 줄 단위 응답을 모아 두지 않도록
+        return response
+
+
+# --- 15. 단계별 진행 상황 스트리밍 (SSE) ---
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def stream_analysis_events(url_to_check, force_refresh):
+    """
+    분석을 백그라운드 스레드에서 실행하면서 단계가 끝날 때마다 SSE 이벤트를 내보낸다
+        start -> extraction -> stage (단계마다) -> final  (실패 시 error)
+    이벤트가 SSE_HEARTBEAT_SECONDS 동안 없으면 주석 줄(": keep-alive")을 보내 프록시 유휴 타임아웃을 막는다.
+    클라이언트가 중간에 끊어도 분석은 끝까지 진행되어 캐시에 저장된다.
+    """
+    events = queue.Queue()
+
+    def on_progress(event, data):
+        events.put((event, data))
+
+    def worker():
+        try:
+            status, payload = analyze_with_cache(url_to_check, force_refresh, on_progress=on_progress)
+            if payload["success"]:
+                events.put(("final", payload["data"]))
+            else:
+                events.put(("error", {"status": status, **payload["error"]}))
+        except Exception as e:
+            print(f"⚠️ 스트리밍 분석 실패 [{url_to_check}]: {e}")
+            events.put(("error", {"status": 500, "message": f"분석 중 오류: {str(e)}"}))
+        finally:
+            connections.close_all()
+
+    threading.Thread(target=worker, name="analysis-stream", daemon=True).start()
+    yield _sse("start", {"url": url_to_check})
+
+    heartbeat = getattr(settings, 'SSE_HEARTBEAT_SECONDS', 15)
+    while True:
+        try:
+            event, data = events.get(timeout=heartbeat)
+        except queue.Empty:
+            yield ": keep-alive\n\n"
+            continue
+        yield _sse(event, data)
+        if event in ("final", "error"):
+            break
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AnalyzeStreamView(APIView):
+    """
+    /api/analyze/stream/ : /api/analyze/ 와 같은 분석을 text/event-stream 으로 단계별 전송
+    - POST {"url": ..., "refresh": false}
+    - GET ?url=...&refresh=1  (브라우저 EventSource 용)
+    마지막 final 이벤트의 data 는 /api/analyze/ 응답의 data 와 같다.
+    """
+    throttle_classes = [AnonRateThrottle]
+
+    def get(self, request, *args, **kwargs):
+        url_to_check = request.GET.get('url')
+        if not url_to_check:
+            return JsonResponse({"success": False, "error": {"message": "잘못된 요청"}}, status=400)
+        return self._stream(url_to_check, request.GET.get('refresh') in ('1', 'true'))
+
+    def post(self, request, *args, **kwargs):
+        url_to_check, force_refresh = read_analyze_request(request)
+        if not url_to_check:
+            return JsonResponse({"success": False, "error": {"message": "잘못된 요청"}}, status=400)
+        return self._stream(url_to_check, force_refresh)
+
+    def _stream(self, url_to_check, force_refresh):
+        response = StreamingHttpResponse(
+            stream_analysis_events(url_to_check, force_refresh),
+            content_type="text/event-stream; charset=utf-8",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"  # nginx 가 이벤트를 모아 두지 않도록
+        return response
+
+
+# --- 16. 비동기 작업 큐 (api/jobs.py) ---
+@method_decorator(csrf_exempt, name='dispatch')
+class JobCreateView(APIView):
+    """
+    POST /api/jobs/  {"url": ..., "refresh": false}
+    - 202: 대기열에 등록 (같은 기사 작업이 이미 있으면 그 작업)
+    - 200: 캐시에 결과가 있어 바로 완료
+    - 503: 대기열이 가득 참 (Retry-After 후 다시 시도)
+    """
+    throttle_classes = [AnonRateThrottle]
+
+    def post(self, request, *args, **kwargs):
+        url_to_check, force_refresh = read_analyze_request(request)
+        if not url_to_check:
+            return JsonResponse({"success": False, "error": {"message": "잘못된 요청"}}, status=400)
+
+        cache_key = canonicalize_url(url_to_check)
+        if not force_refresh:
+            cached_data = get_cached_analysis(cache_key)
+            if cached_data:
+                job = record_cached_job(url_to_check, cache_key, cached_data)
+                return JsonResponse({"success": True, "job": job_payload(job)}, status=200)
+
+        try:
+            job, created = submit_job(url_to_check, cache_key, force_refresh)
+        except QueueFullError as e:
+            response = JsonResponse({"success": False, "error": {"message": str(e)}}, status=503)
+            response["Retry-After"] = str(getattr(settings, 'JOB_RETRY_AFTER_SECONDS', 30))
+            return response
+
+        response = JsonResponse({"success": True, "job": job_payload(job)}, status=202)
+        response["Location"] = f"/api/jobs/{job.pk}/"
+        return response
+
+
+class JobDetailView(APIView):
+    """GET /api/jobs/<id>/ : 작업 상태와 중간/최종 결과 (폴링용이라 요청 제한 없음)"""
+    throttle_classes = []
+
+    def get(self, request, job_id, *args, **kwargs):
+        job = AnalysisJob.objects.filter(pk=job_id).first()
+        if job is None:
+            return JsonResponse({"success": False, "error": {"message": "작업을 찾을 수 없습니다"}}, status=404)
+        return JsonResponse({"success": True, "job": job_payload(job)}, status=200)
+
+
+# --- 17. 도메인별 수집 전략 통계 ---
+class FetchStrategyStatsView(APIView):
+    """GET /api/fetch-strategies/ : 도메인별 requests/브라우저 성공률과 requests 를 건너뛰어 아낀 시간"""
+
+    def get(self, request, *args, **kwargs):
+        try:
+            limit = min(int(request.GET.get('limit', 100)), 1000)
+        except ValueError:
+            limit = 100
+        return JsonResponse({"success": True, "data": strategy_stats(limit)}, status=200)
+
+
+# --- 18. 처리 시간/오류/캐시 지표 (api/metrics.py) ---
+class MetricsView(APIView):
+    """GET /api/metrics : 모든 워커의 지표를 합친 Prometheus 텍스트 (수집기가 주기적으로 호출하므로 요청 제한 없음)"""
+    throttle_classes = []
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
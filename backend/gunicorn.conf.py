@@ -0,0 +1,68 @@
+# gunicorn 설정 (gunicorn 실행 시 현재 디렉토리의 이 파일을 자동으로 읽습니다)
+# 명령줄 옵션(--bind, --timeout 등)은 docker-compose.yml 에서 지정합니다.
+import os
+import sys
+
+# 로컬 분류 모델 로딩 방식 (MODEL_LOAD_MODE)
+# - worker (기본): 워커가 시작할 때 각자 로딩 -> 워커 수만큼 가중치 사본
+# - preload      : 마스터가 fork 전에 한 번 로딩 -> 워커들이 copy-on-write 로 같은 메모리를 공유
+#   워커별 RSS/PSS 비교는 `python manage.py model_memory_report` 로 확인할 수 있습니다.
+# --reload 와 preload 는 함께 쓸 수 없다: reload 는 워커마다 앱을 다시 import 하므로 공유 사본이 깨지고
+# 메모리가 두 배가 된다. --reload 로 실행하면 preload 를 끄고 worker 방식으로 로딩한다.
+MODEL_LOAD_MODE = os.environ.get('MODEL_LOAD_MODE', 'worker')
+RELOAD_REQUESTED = '--reload' in sys.argv or '--reload' in os.environ.get('GUNICORN_CMD_ARGS', '')
+if MODEL_LOAD_MODE == 'preload' and RELOAD_REQUESTED:
+    print("⚠️ MODEL_LOAD_MODE=preload 는 --reload 와 함께 쓸 수 없어 worker 방식으로 로딩합니다.")
+preload_app = MODEL_LOAD_MODE == 'preload' and not RELOAD_REQUESTED
+
+
+def load_embedding_model():
+    """크로스체크에 임베딩을 쓰고 EMBEDDING_MODEL 을 지정했으면 임베딩 모델도 미리 로딩 (api/embeddings.py)"""
+    from django.conf import settings
+    if getattr(settings, 'CROSS_CHECK_MODE', 'gpt') != 'gpt' and getattr(settings, 'EMBEDDING_MODEL', ''):
+        from api.embeddings import load_model
+        load_model()
+
+
+def when_ready(server):
+    """마스터 준비 완료 (워커 fork 직전): preload 모드면 여기서 모델을 올린다"""
+    # 이전 실행의 워커별 지표 파일 정리 (카운터는 재시작 시 0부터)
+    # worker 모드에서는 마스터가 앱을 불러오지 않으므로 설정 모듈을 직접 지정
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
+    from api.metrics import reset_metrics_dir
+    reset_metrics_dir()
+
+    if preload_app and not server.cfg.reload:
+        from api.inference import prepare_for_fork, process_memory_mb
+        load_embedding_model()
+        prepare_for_fork()
+        server.log.info(f"모델 preload 완료 (master 메모리: {process_memory_mb()})")
+
+
+def post_worker_init(worker):
+    """워커가 Django 앱을 불러온 직후"""
+    from django.conf import settings
+    from api.inference import load_model, process_memory_mb
+
+    # preload 모드에서는 이미 올라와 있으므로 바로 반환된다
+    load_model()
+    load_embedding_model()
+    worker.log.info(f"워커 {worker.pid} 메모리 (MB): {process_memory_mb()}")
+
+    # 자극적 표현/광고성 패턴을 첫 요청 전에 컴파일
+    from api.patterns import get_pattern_matchers
+    get_pattern_matchers()
+
+    # 키워드 추출용 IDF 통계 파일을 첫 요청 전에 읽는다
+    from api.keywords import get_idf_stats
+    get_idf_stats()
+
+    # 브라우저 풀을 미리 띄워 첫 요청의 Chromium 실행 시간을 없앤다
+    if getattr(settings, 'PLAYWRIGHT_POOL_PREWARM', True):
+        from api.browser_pool import get_browser_pool
+        get_browser_pool()
+
+
+def worker_exit(server, worker):
+    from api.browser_pool import close_browser_pool
+    close_browser_pool()
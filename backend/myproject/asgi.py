@@ -12,5 +12,22 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
+# /api/analyze/async/ 는 ASGI 에서만 등록 (api/urls.py)
+os.environ.setdefault('SERVER_INTERFACE', 'asgi')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+
+async def application(scope, receive, send):
+    """Django ASGI 앱 + lifespan 처리 (종료 시 이벤트 루프별 브라우저/HTTP 클라이언트 정리)"""
+    if scope["type"] != "lifespan":
+        return await django_application(scope, receive, send)
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            from api.async_views import close_loop_resources
+            await close_loop_resources()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
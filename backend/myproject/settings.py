@@ -91,10 +91,200 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # 웹 워커와 분석 작업 프로세스가 동시에 쓰므로 잠금 대기 시간을 늘림 (기본 5초)
+        'OPTIONS': {'timeout': 20},
     }
 }
 
 
+# ----------------------------------------------------------------------
+# 분석 결과 캐시 (api/cache.py)
+# 같은 URL(정규화 기준)은 TTL 동안 DB 캐시에서 바로 응답합니다.
+# 모든 gunicorn 워커가 같은 DB를 보므로 워커 간에 공유됩니다.
+# ----------------------------------------------------------------------
+ANALYSIS_CACHE_TTL = int(os.environ.get('ANALYSIS_CACHE_TTL', 6 * 3600))          # 초, 0이면 캐시 끔
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.environ.get('ANALYSIS_CACHE_MAX_ENTRIES', 5000))  # 초과 시 LRU 삭제
+# 모든 캐시 공통: 조회 시각 갱신 최소 간격(초), 만료/초과 정리 주기(프로세스당 저장 N번마다)
+CACHE_TOUCH_INTERVAL = int(os.environ.get('CACHE_TOUCH_INTERVAL', 60))
+CACHE_EVICT_EVERY = int(os.environ.get('CACHE_EVICT_EVERY', 50))
+# GPT 판정/크로스체크 결과 캐시: URL 이 달라도 제목/본문이 같으면 재사용
+LLM_CACHE_TTL = int(os.environ.get('LLM_CACHE_TTL', 7 * 86400))                    # 초, 0이면 캐시 끔
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get('LLM_CACHE_MAX_ENTRIES', 20000))
+# 유사 기사 재사용 (api/near_duplicates.py): SimHash 거리가 이 이하인 최근 분석의 GPT/모델/크로스체크 결과 사용
+NEAR_DUPLICATE_ENABLED = os.environ.get('NEAR_DUPLICATE_ENABLED', 'true').lower() == 'true'
+NEAR_DUPLICATE_MAX_DISTANCE = int(os.environ.get('NEAR_DUPLICATE_MAX_DISTANCE', 3))   # 64비트 중 다른 비트 수 (3 이하 권장)
+NEAR_DUPLICATE_MAX_AGE = int(os.environ.get('NEAR_DUPLICATE_MAX_AGE', 6 * 3600))      # 초, 이보다 오래된 분석은 재사용 안 함
+NEAR_DUPLICATE_MIN_CHARS = int(os.environ.get('NEAR_DUPLICATE_MIN_CHARS', 200))       # 본문이 이보다 짧으면 지문을 만들지 않음
+NEAR_DUPLICATE_MAX_ENTRIES = int(os.environ.get('NEAR_DUPLICATE_MAX_ENTRIES', 20000))
+
+
+# ----------------------------------------------------------------------
+# 동시 요청 합치기 (api/singleflight.py)
+# 같은 URL 분석 / 같은 키워드 검색이 진행 중이면(다른 워커 포함) 새로 실행하지 않고 결과를 기다립니다.
+# 기다리는 시간이 TIMEOUT 을 넘으면 직접 실행합니다.
+# 실행 중인 쪽은 LEASE 의 1/3 마다 잠금을 연장하고, 워커가 죽으면 LEASE 가 지난 뒤 다른 워커가 넘겨받습니다.
+# ----------------------------------------------------------------------
+SINGLEFLIGHT_ENABLED = os.environ.get('SINGLEFLIGHT_ENABLED', 'true').lower() == 'true'
+SINGLEFLIGHT_ANALYSIS_TIMEOUT = float(os.environ.get('SINGLEFLIGHT_ANALYSIS_TIMEOUT', 90))  # gunicorn timeout(120) 보다 짧게
+SINGLEFLIGHT_SEARCH_TIMEOUT = float(os.environ.get('SINGLEFLIGHT_SEARCH_TIMEOUT', 20))
+SINGLEFLIGHT_LEASE_SECONDS = float(os.environ.get('SINGLEFLIGHT_LEASE_SECONDS', 15))
+SINGLEFLIGHT_POLL_SECONDS = float(os.environ.get('SINGLEFLIGHT_POLL_SECONDS', 0.25))       # 다른 워커의 결과 확인 간격
+SINGLEFLIGHT_RESULT_TTL = int(os.environ.get('SINGLEFLIGHT_RESULT_TTL', 60))
+
+# ----------------------------------------------------------------------
+# 요청별 처리 시간 예산 (api/deadline.py)
+# 요청 본문/쿼리의 deadline(초)이 없으면 기본값, MIN~MAX 범위로 제한합니다. 작업 큐는 MAX 를 씁니다.
+# 예산이 부족하면 GPT/구글 검색/크로스체크를 건너뛰고 나머지 지표로 점수를 계산합니다.
+# ----------------------------------------------------------------------
+ANALYSIS_DEADLINE_SECONDS = float(os.environ.get('ANALYSIS_DEADLINE_SECONDS', 45))
+ANALYSIS_DEADLINE_MIN_SECONDS = float(os.environ.get('ANALYSIS_DEADLINE_MIN_SECONDS', 5))
+ANALYSIS_DEADLINE_MAX_SECONDS = float(os.environ.get('ANALYSIS_DEADLINE_MAX_SECONDS', 90))   # SINGLEFLIGHT_ANALYSIS_TIMEOUT 이하로
+OPENAI_TIMEOUT_SECONDS = float(os.environ.get('OPENAI_TIMEOUT_SECONDS', 30))                # 예산과 별개로 OpenAI 호출 1회 상한
+
+# 실행 방식: myproject/asgi.py 가 asgi 로 설정 (wsgi 에서는 /api/analyze/async/ 를 등록하지 않음)
+SERVER_INTERFACE = os.environ.get('SERVER_INTERFACE', 'wsgi')
+
+# 분석 단계 병렬 실행 스레드 수 (api/pipeline.py)
+ANALYSIS_STAGE_WORKERS = int(os.environ.get('ANALYSIS_STAGE_WORKERS', 8))
+
+# 일괄 분석 (/api/analyze/batch/): 요청당 최대 URL 수, 동시에 분석하는 기사 수
+ANALYZE_BATCH_MAX_URLS = int(os.environ.get('ANALYZE_BATCH_MAX_URLS', 200))
+ANALYZE_BATCH_CONCURRENCY = int(os.environ.get('ANALYZE_BATCH_CONCURRENCY', 4))
+
+# 단계별 스트리밍 (/api/analyze/stream/): 이벤트가 없을 때 keep-alive 를 보내는 간격(초)
+SSE_HEARTBEAT_SECONDS = float(os.environ.get('SSE_HEARTBEAT_SECONDS', 15))
+
+
+# ----------------------------------------------------------------------
+# 비동기 분석 작업 큐 (api/jobs.py, python manage.py run_analysis_workers)
+# ----------------------------------------------------------------------
+JOB_QUEUE_MAX_DEPTH = int(os.environ.get('JOB_QUEUE_MAX_DEPTH', 100))        # 대기 작업이 이만큼 쌓이면 503
+JOB_RETRY_AFTER_SECONDS = int(os.environ.get('JOB_RETRY_AFTER_SECONDS', 30))
+JOB_WORKER_PROCESSES = int(os.environ.get('JOB_WORKER_PROCESSES', 2))
+JOB_STALE_SECONDS = int(os.environ.get('JOB_STALE_SECONDS', 300))            # heartbeat 없으면 다시 대기열로
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 2))
+JOB_RETENTION_SECONDS = int(os.environ.get('JOB_RETENTION_SECONDS', 86400))  # 끝난 작업 보관 기간
+
+
+# ----------------------------------------------------------------------
+# 외부 서비스 주소 (python manage.py bench_pipeline 은 로컬 대체 서버로 바꿔 실행합니다)
+# ----------------------------------------------------------------------
+OPENAI_BASE_URL = os.environ.get('OPENAI_BASE_URL', '')                                      # 비우면 OpenAI 기본 주소
+NAVER_SEARCH_URL = os.environ.get('NAVER_SEARCH_URL', 'https://search.naver.com/search.naver')
+GOOGLE_SEARCH_URL = os.environ.get('GOOGLE_SEARCH_URL', 'https://www.google.com/search')
+
+
+# ----------------------------------------------------------------------
+# 기사/검색 HTTP 요청 (api/http_client.py)
+# 워커마다 keep-alive 연결 풀을 재사용하고, 응답을 디스크에 저장해 조건부 GET(304)으로 다시 확인합니다.
+# ----------------------------------------------------------------------
+HTTP_POOL_CONNECTIONS = int(os.environ.get('HTTP_POOL_CONNECTIONS', 32))   # 연결 풀을 유지할 호스트 수
+HTTP_POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE', 16))           # 호스트당 keep-alive 연결 수
+HTTP_CACHE_ENABLED = os.environ.get('HTTP_CACHE_ENABLED', 'true').lower() == 'true'
+HTTP_CACHE_DIR = os.environ.get('HTTP_CACHE_DIR', str(BASE_DIR / 'http_cache'))
+HTTP_CACHE_MAX_ENTRIES = int(os.environ.get('HTTP_CACHE_MAX_ENTRIES', 2000))
+
+# 도메인별 수집 전략 학습 (api/fetch_strategy.py)
+# requests 성공률(EMA)이 임계값 미만인 도메인은 requests 를 건너뛰고 바로 Playwright 로 수집합니다.
+FETCH_STRATEGY_MIN_SAMPLES = int(os.environ.get('FETCH_STRATEGY_MIN_SAMPLES', 3))         # 판단에 필요한 최소 시도 수
+FETCH_STRATEGY_SKIP_THRESHOLD = float(os.environ.get('FETCH_STRATEGY_SKIP_THRESHOLD', 0.3))
+FETCH_STRATEGY_ALPHA = float(os.environ.get('FETCH_STRATEGY_ALPHA', 0.3))                 # EMA 반영 비율 (클수록 최근 결과 중시)
+FETCH_STRATEGY_EXPLORE_RATE = float(os.environ.get('FETCH_STRATEGY_EXPLORE_RATE', 0.05))  # 건너뛰는 도메인도 가끔 requests 재시도
+
+
+# ----------------------------------------------------------------------
+# Playwright 브라우저 풀 (api/browser_pool.py)
+# 워커마다 Chromium 을 미리 띄워 두고 재사용합니다.
+# ----------------------------------------------------------------------
+PLAYWRIGHT_POOL_SIZE = int(os.environ.get('PLAYWRIGHT_POOL_SIZE', 2))                          # 워커당 동시 페이지 수
+PLAYWRIGHT_MAX_PAGES_PER_BROWSER = int(os.environ.get('PLAYWRIGHT_MAX_PAGES_PER_BROWSER', 50))  # N페이지마다 브라우저 재시작
+PLAYWRIGHT_MAX_RSS_MB = int(os.environ.get('PLAYWRIGHT_MAX_RSS_MB', 1500))                      # 슬롯(Chromium 하나)별 프로세스 트리 RSS 상한 (0이면 끔)
+PLAYWRIGHT_POOL_PREWARM = os.environ.get('PLAYWRIGHT_POOL_PREWARM', 'true').lower() == 'true'   # 워커 시작 시 미리 실행
+PLAYWRIGHT_BLOCK_RESOURCES = os.environ.get('PLAYWRIGHT_BLOCK_RESOURCES', 'true').lower() == 'true'  # 불필요한 리소스/광고 요청 차단
+PLAYWRIGHT_BLOCKED_RESOURCE_TYPES = os.environ.get('PLAYWRIGHT_BLOCKED_RESOURCE_TYPES', 'image,media,font,stylesheet')
+PLAYWRIGHT_READY_TIMEOUT_MS = int(os.environ.get('PLAYWRIGHT_READY_TIMEOUT_MS', 3000))            # 본문 선택자 대기 상한
+
+
+# ----------------------------------------------------------------------
+# 로컬 분류 모델 추론 (api/inference.py)
+# 동시 요청을 최대 INFERENCE_MAX_WAIT_MS 동안 모아 하나의 배치로 실행합니다.
+# ----------------------------------------------------------------------
+INFERENCE_MAX_BATCH_SIZE = int(os.environ.get('INFERENCE_MAX_BATCH_SIZE', 16))   # 1이면 배칭 안 함
+INFERENCE_MAX_WAIT_MS = float(os.environ.get('INFERENCE_MAX_WAIT_MS', 10))       # 배치를 모으는 최대 대기 시간
+INFERENCE_TORCH_THREADS = int(os.environ.get('INFERENCE_TORCH_THREADS', 0))      # 워커당 torch 스레드 수 (0이면 기본값)
+# 추론 백엔드: torch(fp32) / int8(torch 동적 양자화) / onnx / onnx-int8
+# onnx 계열은 먼저 `python manage.py convert_model [--quantize]` 로 변환이 필요합니다.
+INFERENCE_BACKEND = os.environ.get('INFERENCE_BACKEND', 'torch')
+# 모델 로딩 방식(MODEL_LOAD_MODE=worker|preload)은 gunicorn.conf.py 에서 읽습니다.
+# 긴 기사: truncate(512 토큰에서 자름) / window(겹치는 창으로 나눠 모두 추론 후 합산)
+INFERENCE_CHUNK_MODE = os.environ.get('INFERENCE_CHUNK_MODE', 'truncate')
+INFERENCE_MAX_CHUNKS = int(os.environ.get('INFERENCE_MAX_CHUNKS', 4))                  # 기사당 최대 창 개수
+INFERENCE_WINDOW_OVERLAP = int(os.environ.get('INFERENCE_WINDOW_OVERLAP', 128))        # 창끼리 겹치는 토큰 수
+INFERENCE_CHUNK_AGGREGATION = os.environ.get('INFERENCE_CHUNK_AGGREGATION', 'mean')   # mean / max / confidence
+
+# ----------------------------------------------------------------------
+# 크로스체크 방식 (api/embeddings.py)
+# gpt: 관련 기사 제목을 GPT 에 보내 판정 / embedding: 로컬 문장 임베딩 유사도만 사용 (GPT 호출 없음)
+# hybrid: 임베딩 점수가 TIEBREAK_LOW~HIGH 구간일 때만 GPT 로 다시 판정
+# embedding/hybrid 는 EMBEDDING_MODEL 을 지정해야 하며, 비어 있거나 모델을 불러올 수 없으면 gpt 로 동작합니다.
+# ----------------------------------------------------------------------
+CROSS_CHECK_MODE = os.environ.get('CROSS_CHECK_MODE', 'gpt')
+CROSS_CHECK_TIEBREAK_LOW = float(os.environ.get('CROSS_CHECK_TIEBREAK_LOW', 40))
+CROSS_CHECK_TIEBREAK_HIGH = float(os.environ.get('CROSS_CHECK_TIEBREAK_HIGH', 70))
+# sentence-transformers 형식 모델을 저장한 로컬 디렉터리 (내려받지 않음, 한국어 포함 다국어 모델 권장)
+# 비어 있으면 임베딩 모델을 미리 로딩하지 않습니다.
+EMBEDDING_MODEL = os.environ.get('EMBEDDING_MODEL', '')
+EMBEDDING_MAX_LENGTH = int(os.environ.get('EMBEDDING_MAX_LENGTH', 256))    # 문장당 최대 토큰 수
+EMBEDDING_SIM_LOW = float(os.environ.get('EMBEDDING_SIM_LOW', 0.2))        # 이 유사도 이하는 0점
+EMBEDDING_SIM_HIGH = float(os.environ.get('EMBEDDING_SIM_HIGH', 0.8))      # 이 유사도 이상은 100점
+EMBEDDING_HIGH_SCORE = float(os.environ.get('EMBEDDING_HIGH_SCORE', 70))   # 이 점수 이상이면 일치도 "높음"
+EMBEDDING_LOW_SCORE = float(os.environ.get('EMBEDDING_LOW_SCORE', 40))     # 이 점수 미만이면 일치도 "낮음"
+
+# ----------------------------------------------------------------------
+# 관련 기사 검색 키워드 (api/keywords.py)
+# local: 로컬 TF-IDF 키워드로 GPT 를 기다리지 않고 바로 검색 / gpt: GPT 키워드로 검색 (실패 시 로컬)
+# merge: local 로 바로 검색하고, GPT 키워드에 새 단어가 있으면 네이버를 한 번 더 검색해 합칩니다.
+# IDF 통계 파일은 `python manage.py build_keyword_idf <말뭉치>` 로 만듭니다 (없으면 TF 만 사용).
+# ----------------------------------------------------------------------
+KEYWORD_SOURCE = os.environ.get('KEYWORD_SOURCE', 'local')
+KEYWORD_IDF_PATH = os.environ.get('KEYWORD_IDF_PATH', '')
+KEYWORD_MAX_TERMS = int(os.environ.get('KEYWORD_MAX_TERMS', 3))          # 검색어 단어 수 (GPT 프롬프트와 같은 2~3개)
+KEYWORD_TITLE_WEIGHT = float(os.environ.get('KEYWORD_TITLE_WEIGHT', 3))  # 제목 단어의 TF 가중치
+KEYWORD_MAX_CHARS = int(os.environ.get('KEYWORD_MAX_CHARS', 3000))       # 본문 앞부분만 사용
+
+
+# ----------------------------------------------------------------------
+# 자극적 표현 / 광고성 패턴 (api/patterns.py)
+# JSON 파일로 단어/정규식 목록을 추가할 수 있습니다 (형식은 api/patterns.py 참고).
+# ----------------------------------------------------------------------
+PATTERN_CONFIG_PATH = os.environ.get('PATTERN_CONFIG_PATH', '')
+
+
+# ----------------------------------------------------------------------
+# 기사 HTML 추출 (api/extractors.py)
+# auto: lxml 이 설치되어 있으면 lxml, 없으면 html.parser / lxml / html.parser 로 고정 가능
+# ----------------------------------------------------------------------
+HTML_PARSER = os.environ.get('HTML_PARSER', 'auto')
+
+
+# ----------------------------------------------------------------------
+# 언론사 신뢰도 레지스트리 (api/media_registry.py)
+# 워커가 이 간격(초)마다 MediaOutlet 테이블 변경 여부를 확인해 메모리 인덱스를 갱신합니다.
+# ----------------------------------------------------------------------
+MEDIA_REGISTRY_CHECK_INTERVAL = float(os.environ.get('MEDIA_REGISTRY_CHECK_INTERVAL', 30))
+
+
+# ----------------------------------------------------------------------
+# 처리 시간/오류/캐시 적중 지표 (api/metrics.py, GET /api/metrics)
+# 프로세스마다 METRICS_DIR 에 지표 파일을 쓰고, 엔드포인트가 모두 더해 Prometheus 형식으로 응답합니다.
+# 여러 컨테이너(web, worker)의 지표를 합치려면 같은 볼륨을 METRICS_DIR 로 지정하세요.
+# ----------------------------------------------------------------------
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+METRICS_DIR = os.environ.get('METRICS_DIR', str(BASE_DIR / 'metrics'))
+METRICS_FLUSH_SECONDS = float(os.environ.get('METRICS_FLUSH_SECONDS', 2))   # 값이 바뀐 뒤 파일에 쓰기까지 최대 지연
+METRICS_BUCKETS = os.environ.get('METRICS_BUCKETS', '')                    # 히스토그램 경계(초, 쉼표 구분), 비우면 기본값
+
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {